@@ -0,0 +1,52 @@
+"""
+Consultas sobre os dados de acidentes para CapivaraFlow
+Armazém colunar residente (carregado uma vez por processo) e filtros/agregações
+que reproduzem os indicadores do relatório para qualquer recorte
+"""
+
+from .armazem import ArmazemAcidentes
+from .atualizador import AtualizadorArmazem, regenerar_relatorios
+from .consulta import (FILTROS, Selecao, calcular_slides, cubo_temporal, filtros_para_json, indice_espacial,
+                       indice_trechos, interpretar_filtros, selecionar)
+from .cruzamentos import CRUZAMENTOS, CuboCruzamentos
+from .cubos import GRANULARIDADES, CuboTemporal
+from .espacial import NIVEIS, PARAMETROS_AREA, IndiceEspacial, interpretar_area
+from .registros import FORMATOS as FORMATOS_EXPORTACAO
+from .registros import LIMITE_PAGINA_MAXIMO, LIMITE_PAGINA_PADRAO, OrdemRegistros, comprimir_gzip, exportar
+from .registros import interpretar_campos, linhas_da_selecao
+from .registros import para_json as registros_para_json
+from .trechos import EXTENSAO_MAXIMA_KM, IndiceTrechos
+
+__all__ = [
+    'ArmazemAcidentes',
+    'AtualizadorArmazem',
+    'CRUZAMENTOS',
+    'CuboCruzamentos',
+    'CuboTemporal',
+    'EXTENSAO_MAXIMA_KM',
+    'FILTROS',
+    'FORMATOS_EXPORTACAO',
+    'GRANULARIDADES',
+    'IndiceEspacial',
+    'IndiceTrechos',
+    'LIMITE_PAGINA_MAXIMO',
+    'LIMITE_PAGINA_PADRAO',
+    'NIVEIS',
+    'OrdemRegistros',
+    'PARAMETROS_AREA',
+    'Selecao',
+    'calcular_slides',
+    'comprimir_gzip',
+    'cubo_temporal',
+    'exportar',
+    'filtros_para_json',
+    'indice_espacial',
+    'indice_trechos',
+    'interpretar_area',
+    'interpretar_campos',
+    'interpretar_filtros',
+    'linhas_da_selecao',
+    'regenerar_relatorios',
+    'registros_para_json',
+    'selecionar',
+]
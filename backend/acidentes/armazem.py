@@ -0,0 +1,286 @@
+"""
+Armazém colunar residente dos acidentes
+Carrega o CSV da PRF uma única vez (via cache colunar dos scripts do módulo)
+e mantém os acidentes em vetores numpy: códigos inteiros por dimensão, datas
+como dias e contadores somados por acidente. As consultas só varrem vetores.
+"""
+
+import glob
+import os
+import sys
+import threading
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from . import cruzamentos, cubos, espacial, indices, registros, trechos
+
+# Reaproveita leitor, esquema e cache colunar dos scripts do relatório
+DIR_RELATORIO = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../modules/relatorio-de-acidentes'))
+if DIR_RELATORIO not in sys.path:
+    sys.path.insert(0, DIR_RELATORIO)
+
+from cache_colunar import CacheColunar  # noqa: E402
+from esquema_estrela import construir_esquema  # noqa: E402
+from leitor_csv import ESQUEMA_PRF, detectar_formato, ler_csv  # noqa: E402
+
+# Exportações da PRF na pasta do relatório (acidentes2025_todas_causas_tipos.csv,
+# acidentes2026_...); não pega o csv_limpo.csv gerado pelo script.py
+CSV_PADRAO = os.path.join(DIR_RELATORIO, 'acidentes*.csv')
+
+# Colunas do fato de acidentes mantidas como códigos + dicionário
+DIMENSOES = ['uf', 'br', 'municipio', 'dia_semana', 'fase_dia', 'condicao_metereologica']
+# Colunas das pontes acidente × causa e acidente × tipo
+PONTES = {'causa_acidente': 'causas', 'tipo_acidente': 'tipos'}
+CONTADORES = ['mortos', 'feridos_graves', 'feridos_leves', 'ilesos']
+
+
+def caminhos_configurados():
+    """CSVs (ou padrões com curingas) definidos em ACIDENTES_CSV, separados por os.pathsep, ou CSV_PADRAO"""
+    valor = os.environ.get('ACIDENTES_CSV')
+    if not valor:
+        return [CSV_PADRAO]
+    return [caminho for caminho in valor.split(os.pathsep) if caminho]
+
+
+def expandir_caminhos(padroes):
+    """Padrões com curingas expandidos (em ordem alfabética); caminhos comuns como vieram"""
+    caminhos = []
+    for padrao in padroes:
+        caminhos.extend(sorted(glob.glob(padrao)) if glob.has_magic(padrao) else [padrao])
+    return list(dict.fromkeys(caminhos))
+
+
+def assinatura_fontes(caminhos):
+    """(caminho, mtime, tamanho) de cada CSV; arquivo ausente entra como None"""
+    assinatura = []
+    for caminho in caminhos:
+        try:
+            info = os.stat(caminho)
+            assinatura.append((caminho, info.st_mtime_ns, info.st_size))
+        except OSError:
+            assinatura.append((caminho, None, None))
+    return tuple(assinatura)
+
+
+def _ler(caminho):
+    """Lê o CSV com as mesmas opções (e a mesma chave de cache) do script-v7"""
+    formato = detectar_formato(caminho)
+    cache = CacheColunar.para_csv(caminho)
+    chave = cache.chave(caminho, {
+        'formato': formato,
+        'esquema': ESQUEMA_PRF,
+        'leitor': 'c',
+        'on_bad_lines': 'skip'
+    })
+    df = cache.carregar(chave)
+    if df is None:
+        df, _ = ler_csv(caminho, formato, esquema=ESQUEMA_PRF)
+        try:
+            cache.salvar(chave, df, origem=os.path.abspath(caminho))
+        except OSError as e:
+            print(f"⚠️  Não foi possível gravar o cache colunar: {e}")
+    return df
+
+
+def _datas(serie):
+    """Converte data_inversa (dd/mm/aaaa ou aaaa-mm-dd) em datetime64[D]"""
+    serie = serie.astype('category')
+    categorias = serie.cat.categories.astype(str)
+    datas = pd.to_datetime(categorias, format='%d/%m/%Y', errors='coerce')
+    iso = pd.to_datetime(categorias, format='%Y-%m-%d', errors='coerce')
+    datas = datas.where(~datas.isna(), iso)
+    valores = datas.values.astype('datetime64[D]')
+    codigos = serie.cat.codes.to_numpy()
+    resultado = np.full(len(codigos), np.datetime64('NaT'), dtype='datetime64[D]')
+    validos = codigos >= 0
+    resultado[validos] = valores[codigos[validos]]
+    return resultado
+
+
+def _horas(serie):
+    """Hora do dia (0-23) a partir de horario (hh:mm[:ss]); desconhecida = 24"""
+    serie = serie.astype('category')
+    categorias = pd.Series(serie.cat.categories.astype(str))
+    horas = pd.to_numeric(categorias.str.strip().str.split(':').str[0], errors='coerce').to_numpy()
+    horas = np.where((horas >= 0) & (horas < 24), horas, 24)
+    codigos = serie.cat.codes.to_numpy()
+    resultado = np.full(len(codigos), 24, dtype=np.intp)
+    validos = codigos >= 0
+    resultado[validos] = horas[codigos[validos]]
+    return resultado
+
+
+class Dimensao:
+    """
+    Coluna codificada: códigos inteiros + valores distintos. Nulos recebem o
+    código len(valores), então np.bincount não precisa filtrar negativos.
+    """
+
+    def __init__(self, serie):
+        codigos, valores = pd.factorize(serie, sort=False)
+        codigos[codigos < 0] = len(valores)
+        self.codigos = codigos.astype(np.intp)
+        self.valores = [v.item() if isinstance(v, np.generic) else v for v in valores]
+        self._por_texto = {}
+        for codigo, valor in enumerate(self.valores):
+            self._por_texto.setdefault(str(valor).strip().casefold(), []).append(codigo)
+
+    def __len__(self):
+        return len(self.valores)
+
+    def valor(self, posicao):
+        """Valor da coluna na posição (None para nulos)"""
+        codigo = self.codigos[posicao]
+        return self.valores[codigo] if codigo < len(self.valores) else None
+
+    def codigos_de(self, valores):
+        """Códigos que correspondem aos valores pedidos (sem diferenciar maiúsculas)"""
+        codigos = []
+        for valor in valores:
+            codigos.extend(self._por_texto.get(str(valor).strip().casefold(), []))
+        return np.asarray(sorted(set(codigos)), dtype=np.int32)
+
+
+class ArmazemAcidentes:
+    """
+    Acidentes em vetores numpy, prontos para filtros e agregações.
+
+    O objeto criado pelo servidor guarda só o snapshot atual: cada carga monta
+    um ArmazemAcidentes novo e completo, e a troca é uma única atribuição.
+    Quem já pegou o snapshot (garantir_carregado) segue com ele até o fim da
+    requisição; o antigo é liberado quando ninguém mais o usa.
+    """
+
+    def __init__(self, caminhos=None):
+        # Caminhos ou padrões com curingas (acidentes_*.csv), expandidos a cada carga
+        self.padroes = list(caminhos) if caminhos else caminhos_configurados()
+        self.caminhos = expandir_caminhos(self.padroes)
+        self.assinatura = None
+        self.carregado_em = None
+        self._atual = None
+        self._lock = threading.Lock()
+
+    @property
+    def carregado(self):
+        return self._atual is not None
+
+    def garantir_carregado(self):
+        """Snapshot atual; carrega na primeira chamada (ou no pré-carregamento do servidor)"""
+        atual = self._atual
+        if atual is None:
+            with self._lock:
+                if self._atual is None:
+                    self._atual = self._montar()
+                atual = self._atual
+        return atual
+
+    def recarregar(self):
+        """
+        Monta um snapshot novo com os CSVs atuais e o troca pelo corrente de uma
+        vez. As requisições continuam no snapshot anterior enquanto isso.
+
+        Raises:
+            Exception: Falha na leitura; o snapshot anterior é mantido
+        """
+        with self._lock:
+            novo = self._montar()
+            self._atual = novo
+        return novo
+
+    def fontes_alteradas(self):
+        """True se algum CSV configurado surgiu, sumiu ou mudou desde a última carga"""
+        atual = self._atual
+        return atual is None or assinatura_fontes(expandir_caminhos(self.padroes)) != atual.assinatura
+
+    def _montar(self):
+        novo = ArmazemAcidentes(self.padroes)
+        novo._carregar()
+        novo._atual = novo
+        return novo
+
+    def _carregar(self):
+        # Assinatura tirada antes da leitura: uma mudança durante a carga dispara outra
+        self.caminhos = expandir_caminhos(self.padroes)
+        if not self.caminhos:
+            raise FileNotFoundError(f"Nenhum CSV encontrado em {os.pathsep.join(self.padroes)}")
+        self.assinatura = assinatura_fontes(self.caminhos)
+        quadros = [_ler(caminho) for caminho in self.caminhos]
+        df = quadros[0] if len(quadros) == 1 else pd.concat(quadros, ignore_index=True)
+        esquema = construir_esquema(df)
+        self.total_registros = esquema.total_registros
+        # Linhas brutas (uma por pessoa) para exportação e listagem de registros
+        self.registros = df
+
+        acidentes = esquema.acidentes
+        self.n = len(acidentes)
+        self.ids = acidentes['id'].to_numpy(dtype=np.int64)
+        self.data = _datas(acidentes['data_inversa']) if 'data_inversa' in acidentes.columns else \
+            np.full(self.n, np.datetime64('NaT'), dtype='datetime64[D]')
+        self.hora = _horas(acidentes['horario']) if 'horario' in acidentes.columns else \
+            np.full(self.n, 24, dtype=np.intp)
+        self.latitude, self.longitude = (
+            acidentes[col].to_numpy(dtype=np.float64, na_value=np.nan) if col in acidentes.columns
+            else np.full(self.n, np.nan)
+            for col in ('latitude', 'longitude')
+        )
+        # km vem como float32 do CSV: arredonda para não carregar 437.299988
+        self.km = np.round(acidentes['km'].to_numpy(dtype=np.float64, na_value=np.nan), 3) \
+            if 'km' in acidentes.columns else np.full(self.n, np.nan)
+        self.dimensoes = {col: Dimensao(acidentes[col]) for col in DIMENSOES if col in acidentes.columns}
+        self.contadores = {
+            col: acidentes[col].to_numpy(dtype=np.int64, na_value=0) if col in acidentes.columns
+            else np.zeros(self.n, dtype=np.int64)
+            for col in CONTADORES
+        }
+        # Óbitos e feridos graves são raros: as somas só visitam esses acidentes
+        self.nao_zero = {col: np.flatnonzero(valores) for col, valores in self.contadores.items()}
+
+        # Pontes: posição do acidente + dimensão da causa/tipo
+        posicoes = pd.Index(self.ids)
+        self.linha_acidente = posicoes.get_indexer(
+            df['id'].to_numpy(dtype=np.int64, na_value=-1) if 'id' in df.columns else np.full(len(df), -1)
+        )
+        self.pontes = {}
+        for col, tabela in PONTES.items():
+            ponte = esquema.tabela(tabela)
+            if col not in ponte.columns:
+                continue
+            acidente = posicoes.get_indexer(ponte['id'].to_numpy(dtype=np.int64, na_value=-1))
+            validos = acidente >= 0
+            self.pontes[col] = {
+                'acidente': acidente[validos].astype(np.intp),
+                'dimensao': Dimensao(ponte[col][validos].reset_index(drop=True))
+            }
+
+        # Índices invertidos em bitmaps (None sem pyroaring: consultas por varredura)
+        self.indices = indices.IndicesBitmap(self) if indices.disponivel() else None
+        # Cubo dia × hora: séries temporais sem varrer os acidentes
+        self.cubo = cubos.CuboTemporal(self)
+        # Grade espacial: retângulos, raios e hotspots sem varrer todos os pontos
+        self.espacial = espacial.IndiceEspacial(self)
+        # Trechos (br, km): contagens por intervalo e trechos críticos
+        self.trechos = trechos.IndiceTrechos(self)
+        # Cruzamentos configurados (causa × fase do dia, br × mês...) materializados
+        self.cruzamentos = cruzamentos.CuboCruzamentos(self)
+        # Ordem (data, id, pesid) dos registros brutos para paginação por cursor
+        self.ordem_registros = registros.OrdemRegistros(
+            df, _datas(df['data_inversa']) if 'data_inversa' in df.columns else
+            np.full(len(df), np.datetime64('NaT'), dtype='datetime64[D]'),
+            self.linha_acidente
+        )
+        self.carregado_em = datetime.now().isoformat(timespec='seconds')
+
+    def resumo(self):
+        """Tamanho do armazém (para logs e health checks)"""
+        return {
+            'arquivos': len(self.caminhos),
+            'carregado_em': self.carregado_em,
+            'registros': int(self.total_registros),
+            'acidentes': int(self.n),
+            'cubo_temporal_dias': int(self.cubo.n_dias),
+            'pontos_georreferenciados': len(self.espacial),
+            'cruzamentos': len(self.cruzamentos),
+            'indices_bitmap': self.indices is not None
+        }
@@ -0,0 +1,141 @@
+"""
+Atualização do armazém em segundo plano
+Uma thread confere periodicamente (só os.stat) os CSVs configurados. Quando um
+CSV surge ou muda, o snapshot novo é montado nessa thread, fora do caminho das
+requisições, e trocado de uma vez pelo atual (ArmazemAcidentes.recarregar).
+Leitores nunca esperam a carga nem veem dados pela metade.
+
+Depois da troca, a mesma thread roda as ações de ao_recarregar, como
+regenerar_relatorios, que atualiza os JSONs do relatório (servidos por
+/api/acidentes/summary e pelo módulo relatorio-acidentes) a partir do CSV novo.
+"""
+
+import os
+import subprocess
+import sys
+import threading
+import traceback
+
+from .armazem import DIR_RELATORIO, assinatura_fontes, expandir_caminhos
+
+# Segundos entre verificações dos CSVs (0 desliga a atualização automática)
+INTERVALO_PADRAO = float(os.environ.get('ACIDENTES_RECARGA_INTERVALO', '30'))
+
+
+class AtualizadorArmazem:
+    """
+    Thread que recarrega o armazém quando os CSVs mudam. Um CSV só é lido
+    depois de ficar igual em duas verificações seguidas, para não pegar um
+    arquivo ainda sendo copiado.
+    """
+
+    def __init__(self, armazem, intervalo=INTERVALO_PADRAO):
+        self.armazem = armazem
+        self.intervalo = intervalo
+        self.recargas = 0
+        self.ultimo_erro = None
+        self._pendente = None
+        self._falhou = None
+        self._pid = None
+        # Chamadas com o snapshot novo, em ordem, depois de cada troca
+        self.ao_recarregar = []
+        self._parar = threading.Event()
+        self._thread = None
+
+    @property
+    def ativo(self):
+        """Thread viva; num processo filho (worker), a do processo que a iniciou"""
+        if self._thread is None:
+            return False
+        return self._thread.is_alive() or self._pid != os.getpid()
+
+    def iniciar(self):
+        """Inicia a thread (uma por servidor; no Gunicorn, no mestre)"""
+        if self.intervalo <= 0 or self.ativo:
+            return self
+        self._pid = os.getpid()
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._executar, name='atualizador-armazem', daemon=True)
+        self._thread.start()
+        return self
+
+    def parar(self, timeout=None):
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _executar(self):
+        while not self._parar.wait(self.intervalo):
+            self.verificar()
+
+    def verificar(self):
+        """
+        Uma verificação: recarrega se os CSVs mudaram e estão estáveis.
+
+        Returns:
+            bool: True se um snapshot novo foi trocado
+        """
+        if not self.armazem.fontes_alteradas():
+            self._pendente = None
+            return False
+
+        assinatura = assinatura_fontes(expandir_caminhos(self.armazem.padroes))
+        if assinatura == self._falhou:
+            return False
+        if assinatura != self._pendente:
+            # Primeira vez que vemos esta versão: espera a próxima verificação
+            self._pendente = assinatura
+            return False
+
+        try:
+            novo = self.armazem.recarregar()
+        except Exception as e:
+            # Mantém o snapshot anterior; tenta de novo quando o CSV mudar outra vez
+            self._falhou = assinatura
+            self.ultimo_erro = f'{type(e).__name__}: {e}'
+            print(f"⚠️  Falha ao recarregar o armazém de acidentes: {self.ultimo_erro}")
+            traceback.print_exc()
+            return False
+        finally:
+            self._pendente = None
+
+        self.recargas += 1
+        self.ultimo_erro = None
+        print(f"🔄 Armazém de acidentes recarregado: {novo.resumo()}")
+        for acao in self.ao_recarregar:
+            try:
+                acao(novo)
+            except Exception as e:
+                # O snapshot já foi trocado; só a ação fica para a próxima recarga
+                self.ultimo_erro = f'{getattr(acao, "__name__", acao)}: {type(e).__name__}: {e}'
+                print(f"⚠️  Falha após recarregar o armazém: {self.ultimo_erro}")
+                traceback.print_exc()
+        return True
+
+    def estado(self):
+        """Situação da atualização (para o health check)"""
+        return {
+            'ativo': self.ativo,
+            'pid': self._pid,
+            'intervalo_segundos': self.intervalo,
+            'recargas': self.recargas,
+            'ultimo_erro': self.ultimo_erro
+        }
+
+
+def regenerar_relatorios(snapshot):
+    """
+    Roda o pipeline do relatório com o CSV mais recente do snapshot. Só as
+    etapas desatualizadas rodam; os JSONs são gravados de forma atômica e os
+    caches que os servem percebem a troca pelo mtime.
+
+    Raises:
+        RuntimeError: O pipeline terminou com erro
+    """
+    csv = max(snapshot.caminhos, key=os.path.getmtime)
+    retorno = subprocess.run(
+        [sys.executable, 'pipeline.py', '--csv', os.path.abspath(csv)],
+        cwd=DIR_RELATORIO
+    ).returncode
+    if retorno != 0:
+        raise RuntimeError(f'pipeline.py terminou com código {retorno} (logs em .estado_pipeline/)')
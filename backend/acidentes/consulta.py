@@ -0,0 +1,340 @@
+"""
+Consultas filtradas sobre o armazém de acidentes
+Converte os parâmetros da requisição em uma seleção de acidentes (AND/OR de
+bitmaps quando há índices; máscara booleana por varredura caso contrário) e
+calcula os mesmos indicadores/top-N do relatório (script-v7.py).
+"""
+
+from datetime import datetime
+
+import numpy as np
+
+from . import cubos, espacial, indices, trechos
+from .trechos import nome_estrada
+
+# Filtros aceitos: intervalo de datas, dimensões do fato e pontes (causa/tipo)
+FILTROS_DATA = ('data_inicio', 'data_fim')
+FILTROS_DIMENSAO = ('uf', 'br', 'municipio', 'dia_semana', 'fase_dia', 'condicao_metereologica')
+FILTROS_PONTE = ('tipo_acidente', 'causa_acidente')
+FILTROS = FILTROS_DATA + FILTROS_DIMENSAO + FILTROS_PONTE
+
+# Valores sem vírgula interna: aceitam também "br=277,376"
+FILTROS_LISTA = ('uf', 'br')
+
+FORMATOS_DATA = ('%Y-%m-%d', '%d/%m/%Y')
+
+
+def _interpretar_data(chave, texto):
+    for formato in FORMATOS_DATA:
+        try:
+            return np.datetime64(datetime.strptime(texto.strip(), formato).date(), 'D')
+        except ValueError:
+            continue
+    raise ValueError(f"Data inválida em '{chave}': {texto} (use AAAA-MM-DD ou DD/MM/AAAA)")
+
+
+def interpretar_filtros(args, extras=()):
+    """
+    Lê os filtros da query string.
+
+    Args:
+        args (MultiDict): request.args (valores repetidos = OU)
+        extras (tuple): Outros parâmetros aceitos pela rota (ignorados aqui)
+
+    Returns:
+        dict: {'data_inicio': datetime64, ..., 'br': ['277', ...], ...}
+
+    Raises:
+        ValueError: Parâmetro desconhecido ou data inválida
+    """
+    desconhecidos = [chave for chave in args if chave not in FILTROS and chave not in extras]
+    if desconhecidos:
+        raise ValueError(f"Filtro(s) desconhecido(s): {', '.join(desconhecidos)}. " +
+                         f"Aceitos: {', '.join(FILTROS)}")
+
+    filtros = {}
+    for chave in FILTROS_DATA:
+        if args.get(chave):
+            filtros[chave] = _interpretar_data(chave, args.get(chave))
+
+    for chave in FILTROS_DIMENSAO + FILTROS_PONTE:
+        valores = [v for v in args.getlist(chave) if v.strip()]
+        if chave in FILTROS_LISTA:
+            valores = [parte for v in valores for parte in v.split(',') if parte.strip()]
+        if chave == 'br':
+            # "BR-277" e "277" são o mesmo filtro
+            valores = [v.strip().upper().removeprefix('BR-') for v in valores]
+        if valores:
+            filtros[chave] = valores
+
+    if 'data_inicio' in filtros and 'data_fim' in filtros and filtros['data_inicio'] > filtros['data_fim']:
+        raise ValueError("'data_inicio' posterior a 'data_fim'")
+    return filtros
+
+
+def filtros_para_json(filtros):
+    """Filtros em tipos serializáveis (eco na resposta)"""
+    return {chave: str(valor) if chave in FILTROS_DATA else valor for chave, valor in filtros.items()}
+
+
+def _tabela_codigos(dimensao, valores):
+    """Vetor booleano por código; a última posição (nulos) fica sempre False"""
+    tabela = np.zeros(len(dimensao) + 1, dtype=bool)
+    tabela[dimensao.codigos_de(valores)] = True
+    return tabela
+
+
+def mascara(armazem, filtros):
+    """
+    Máscara booleana dos acidentes que atendem a todos os filtros, por
+    varredura dos vetores (usada quando não há índices em bitmap).
+
+    Returns:
+        np.ndarray[bool] com armazem.n posições
+    """
+    selecao = np.ones(armazem.n, dtype=bool)
+
+    if 'data_inicio' in filtros:
+        selecao &= armazem.data >= filtros['data_inicio']
+    if 'data_fim' in filtros:
+        selecao &= armazem.data <= filtros['data_fim']
+
+    for chave in FILTROS_DIMENSAO:
+        if chave not in filtros:
+            continue
+        dimensao = armazem.dimensoes.get(chave)
+        if dimensao is None:
+            return np.zeros(armazem.n, dtype=bool)
+        selecao &= _tabela_codigos(dimensao, filtros[chave])[dimensao.codigos]
+
+    for chave in FILTROS_PONTE:
+        if chave not in filtros:
+            continue
+        ponte = armazem.pontes.get(chave)
+        if ponte is None:
+            return np.zeros(armazem.n, dtype=bool)
+        linhas = _tabela_codigos(ponte['dimensao'], filtros[chave])[ponte['dimensao'].codigos]
+        com_valor = np.zeros(armazem.n, dtype=bool)
+        com_valor[ponte['acidente'][linhas]] = True
+        selecao &= com_valor
+
+    return selecao
+
+
+class Selecao:
+    """
+    Acidentes que atendem aos filtros. Com índices, a seleção é um BitMap e
+    contagens/somas vêm de cardinalidades; sem eles, uma máscara booleana.
+    """
+
+    def __init__(self, armazem, filtros):
+        self.armazem = armazem
+        self.indices = armazem.indices
+        self.bitmap = None
+        self._mascara = None
+
+        if self.indices is not None:
+            self.bitmap = self.indices.selecionar(armazem, filtros, FILTROS_DIMENSAO, FILTROS_PONTE)
+            self.tudo = self.bitmap is None
+            self.total = armazem.n if self.tudo else len(self.bitmap)
+            self.posicoes = None if self.tudo else indices.posicoes(self.bitmap)
+        else:
+            self._mascara = mascara(armazem, filtros)
+            self.total = int(np.count_nonzero(self._mascara))
+            self.tudo = self.total == armazem.n
+            self.posicoes = None if self.tudo else np.flatnonzero(self._mascara)
+
+    @property
+    def mascara(self):
+        """Máscara booleana por acidente (construída sob demanda)"""
+        if self._mascara is None:
+            self._mascara = np.ones(self.armazem.n, dtype=bool)
+            if not self.tudo:
+                self._mascara[:] = False
+                self._mascara[self.posicoes] = True
+        return self._mascara
+
+    def de(self, vetor):
+        """Valores do vetor (por acidente) restritos à seleção"""
+        return vetor if self.tudo else vetor[self.posicoes]
+
+    def nao_zero(self, contador):
+        """Posições selecionadas em que o contador é diferente de zero"""
+        if self.tudo:
+            return self.armazem.nao_zero[contador]
+        if self.bitmap is not None:
+            return indices.posicoes(self.bitmap & self.indices.positivos[contador])
+        posicoes = self.armazem.nao_zero[contador]
+        return posicoes[self._mascara[posicoes]]
+
+    def soma(self, contador):
+        """Soma do contador nos acidentes selecionados"""
+        if self.indices is not None:
+            return self.indices.soma(contador, self.bitmap)
+        return int(self.armazem.contadores[contador][self.nao_zero(contador)].sum())
+
+    def contagens_dimensao(self, coluna):
+        """Acidentes selecionados por código da dimensão"""
+        dimensao = self.armazem.dimensoes[coluna]
+        if self.indices is not None:
+            return self.indices.cardinalidades(self.indices.dimensoes[coluna], self.bitmap)
+        return np.bincount(self.de(dimensao.codigos), minlength=len(dimensao) + 1)[:-1]
+
+    def contagens_ponte(self, coluna):
+        """Acidentes selecionados por código da causa/tipo"""
+        ponte = self.armazem.pontes[coluna]
+        if self.indices is not None:
+            return self.indices.cardinalidades(self.indices.pontes[coluna], self.bitmap)
+        codigos = ponte['dimensao'].codigos
+        if not self.tudo:
+            codigos = codigos[self.mascara[ponte['acidente']]]
+        return np.bincount(codigos, minlength=len(ponte['dimensao']) + 1)[:-1]
+
+
+def selecionar(armazem, filtros):
+    """Seleção dos acidentes que atendem aos filtros interpretados"""
+    return Selecao(armazem, filtros)
+
+
+def cubo_temporal(armazem, filtros):
+    """
+    Cubo dia × hora para os filtros. Datas só recortam o cubo residente;
+    com outros filtros, o cubo é montado a partir dos acidentes selecionados.
+    """
+    outros = {chave: valor for chave, valor in filtros.items() if chave not in FILTROS_DATA}
+    if not outros:
+        return armazem.cubo
+    return cubos.CuboTemporal(armazem, selecionar(armazem, outros).posicoes)
+
+
+def indice_espacial(armazem, filtros):
+    """Grade residente sem filtros; com filtros, grade dos acidentes selecionados"""
+    if not filtros:
+        return armazem.espacial
+    return espacial.IndiceEspacial(armazem, selecionar(armazem, filtros).posicoes)
+
+
+def indice_trechos(armazem, filtros):
+    """
+    Índice (br, km) para os filtros. O filtro de BR é aplicado pelo próprio
+    índice; os demais montam um índice dos acidentes selecionados.
+    """
+    outros = {chave: valor for chave, valor in filtros.items() if chave != 'br'}
+    if not outros:
+        return armazem.trechos
+    return trechos.IndiceTrechos(armazem, selecionar(armazem, outros).posicoes)
+
+
+# ==================== INDICADORES (MESMAS FORMAS DO RELATÓRIO) ====================
+
+def _contagem(dimensao, contagens):
+    """Equivalente a value_counts(): [(valor, quantidade)] em ordem decrescente"""
+    ordem = np.argsort(-contagens, kind='stable')
+    return [(dimensao.valores[i], int(contagens[i])) for i in ordem if contagens[i] > 0]
+
+
+def _agrupamento(selecao, dimensao, contadores):
+    """Equivalente a groupby(): [(valor, acidentes, {contador: soma})] por acidentes desc."""
+    k = len(dimensao) + 1
+    acidentes = np.bincount(selecao.de(dimensao.codigos), minlength=k)[:-1]
+    somas = {}
+    for col in contadores:
+        posicoes = selecao.nao_zero(col)
+        somas[col] = np.bincount(
+            dimensao.codigos[posicoes],
+            weights=selecao.armazem.contadores[col][posicoes],
+            minlength=k
+        )[:-1]
+
+    # Como no relatório: ordena pelo valor e depois por acidentes (decrescente)
+    presentes = list(np.flatnonzero(acidentes))
+    presentes.sort(key=lambda i: dimensao.valores[i])
+    presentes.sort(key=lambda i: -acidentes[i])
+    return [(dimensao.valores[i], int(acidentes[i]), {col: s[i] for col, s in somas.items()}) for i in presentes]
+
+
+def _percentuais(itens):
+    total = sum(qtd for _, qtd in itens)
+    return {
+        valor: {"quantidade": qtd, "percentual": int(round((qtd / total) * 100, 0))}
+        for valor, qtd in itens
+    }
+
+
+def calcular_kpis(selecao):
+    """Indicadores principais (slide 2)"""
+    total_acidentes = selecao.total
+    soma = {col: selecao.soma(col) for col in selecao.armazem.contadores}
+
+    kpis = {
+        "total_acidentes": total_acidentes,
+        "total_obitos": soma['mortos'],
+        "feridos_graves": soma['feridos_graves'],
+        "feridos_leves": soma['feridos_leves'],
+        "ilesos": soma['ilesos'],
+    }
+    kpis["taxa_severidade"] = round((kpis["total_obitos"] / total_acidentes) * 100, 1) if total_acidentes else 0
+    kpis["total_vitimas"] = kpis["feridos_graves"] + kpis["feridos_leves"] + kpis["ilesos"]
+    kpis["taxa_mortalidade"] = (
+        round((kpis["total_obitos"] / kpis["total_vitimas"]) * 100, 1) if kpis["total_vitimas"] else 0
+    )
+    return kpis
+
+
+def _top_ponte(selecao, coluna, n):
+    ponte = selecao.armazem.pontes.get(coluna)
+    if ponte is None:
+        return {}
+    return _percentuais(_contagem(ponte['dimensao'], selecao.contagens_ponte(coluna))[:n])
+
+
+def _top_dimensao(selecao, coluna, n=None):
+    dimensao = selecao.armazem.dimensoes.get(coluna)
+    if dimensao is None:
+        return {}
+    return _percentuais(_contagem(dimensao, selecao.contagens_dimensao(coluna))[:n])
+
+
+def calcular_estradas(selecao, n=5):
+    """Estradas críticas (slide 5)"""
+    dimensao = selecao.armazem.dimensoes.get('br')
+    if dimensao is None:
+        return {}
+    resultado = {}
+    for estrada, acidentes, somas in _agrupamento(selecao, dimensao, ('mortos', 'feridos_graves'))[:n]:
+        nome = nome_estrada(estrada)
+        resultado[nome] = {
+            "acidentes": acidentes,
+            "obitos": int(somas['mortos']),
+            "feridos": int(somas['feridos_graves'])
+        }
+    return resultado
+
+
+def calcular_municipios(selecao, n=5):
+    """Municípios mais afetados (slide 8)"""
+    dimensao = selecao.armazem.dimensoes.get('municipio')
+    if dimensao is None:
+        return {}
+    resultado = {}
+    for municipio, acidentes, somas in _agrupamento(selecao, dimensao, ('mortos',))[:n]:
+        resultado[municipio] = {
+            "acidentes": acidentes,
+            "percentual": round((acidentes / selecao.total) * 100, 1),
+            "obitos": int(somas['mortos'])
+        }
+    return resultado
+
+
+def calcular_slides(selecao):
+    """Slides 2 a 8 do relatório, restritos aos acidentes selecionados"""
+    return {
+        "slide_2": {"nome": "Indicadores Principais", "kpis": calcular_kpis(selecao)},
+        "slide_3": {"nome": "Tipos de Acidentes", "dados": _top_ponte(selecao, 'tipo_acidente', 5)},
+        "slide_4": {"nome": "Causas Principais", "dados": _top_ponte(selecao, 'causa_acidente', 5)},
+        "slide_5": {"nome": "Estradas Críticas", "dados": calcular_estradas(selecao)},
+        "slide_6": {"nome": "Condições Meteorológicas",
+                    "dados": _top_dimensao(selecao, 'condicao_metereologica', 4)},
+        "slide_7": {"nome": "Distribuição por Fase do Dia", "dados": _top_dimensao(selecao, 'fase_dia')},
+        "slide_8": {"nome": "Municípios Mais Afetados", "dados": calcular_municipios(selecao)},
+    }
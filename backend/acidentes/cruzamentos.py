@@ -0,0 +1,189 @@
+"""
+Cruzamentos bidimensionais materializados (tabelas de contingência)
+Na carga do armazém, cada par configurado (ex.: causa × fase do dia) vira uma
+matriz densa de inteiros pequenos com os dicionários de linhas e colunas.
+A API só fatia essas matrizes: nenhum groupby por requisição.
+"""
+
+import numpy as np
+
+from .trechos import nome_estrada
+
+MEDIDAS = ('acidentes', 'mortos')
+
+# Rótulos exibidos como no resto da API (277 -> "BR-277"); a busca usa o valor bruto
+FORMATOS_ROTULO = {'br': nome_estrada}
+
+# Pares materializados (linhas, colunas); a ordem inversa é servida transposta
+CRUZAMENTOS = [
+    ('causa_acidente', 'fase_dia'),
+    ('causa_acidente', 'condicao_metereologica'),
+    ('causa_acidente', 'tipo_acidente'),
+    ('tipo_acidente', 'fase_dia'),
+    ('tipo_acidente', 'condicao_metereologica'),
+    ('br', 'mes'),
+    ('uf', 'mes'),
+    ('municipio', 'mes'),
+    ('dia_semana', 'fase_dia'),
+]
+
+
+class Eixo:
+    """
+    Valores de uma dimensão e seus códigos. Nas dimensões do fato há um
+    código por acidente (acidente=None); nas pontes, um por par (acidente,
+    causa/tipo). O código len(valores) marca valor nulo.
+    """
+
+    def __init__(self, valores, codigos, acidente=None):
+        self.valores = valores
+        self.codigos = codigos
+        self.acidente = acidente
+
+    def __len__(self):
+        return len(self.valores)
+
+
+def eixos(armazem):
+    """Eixos disponíveis no armazém: dimensões, pontes e mês da data"""
+    resultado = {col: Eixo(dimensao.valores, dimensao.codigos) for col, dimensao in armazem.dimensoes.items()}
+    for col, ponte in armazem.pontes.items():
+        resultado[col] = Eixo(ponte['dimensao'].valores, ponte['dimensao'].codigos, ponte['acidente'])
+
+    validas = ~np.isnat(armazem.data)
+    meses, codigos = np.unique(armazem.data[validas].astype('datetime64[M]'), return_inverse=True)
+    codigos_mes = np.full(armazem.n, len(meses), dtype=np.intp)
+    codigos_mes[validas] = codigos
+    resultado['mes'] = Eixo([str(mes) for mes in meses], codigos_mes)
+    return resultado
+
+
+def _juntar(n, linhas, colunas):
+    """
+    Pares (acidente, código da linha, código da coluna). Com uma dimensão do
+    fato basta indexar pelo acidente; entre duas pontes é uma junção.
+    """
+    if linhas.acidente is None and colunas.acidente is None:
+        return np.arange(n), linhas.codigos, colunas.codigos
+    if colunas.acidente is None:
+        return linhas.acidente, linhas.codigos, colunas.codigos[linhas.acidente]
+    if linhas.acidente is None:
+        return colunas.acidente, linhas.codigos[colunas.acidente], colunas.codigos
+
+    # Junção ponte × ponte: cada linha se repete para cada par do mesmo acidente
+    ordem = np.argsort(colunas.acidente, kind='stable')
+    acidente_colunas = colunas.acidente[ordem]
+    inicio = np.searchsorted(acidente_colunas, linhas.acidente, side='left')
+    repeticoes = np.searchsorted(acidente_colunas, linhas.acidente, side='right') - inicio
+    origem = np.repeat(np.arange(len(linhas.acidente)), repeticoes)
+    deslocamento = np.arange(len(origem)) - np.repeat(np.cumsum(repeticoes) - repeticoes, repeticoes)
+    destino = ordem[np.repeat(inicio, repeticoes) + deslocamento]
+    return linhas.acidente[origem], linhas.codigos[origem], colunas.codigos[destino]
+
+
+def _compactar(matriz):
+    """Menor inteiro sem sinal que comporta a matriz"""
+    return matriz.astype(np.min_scalar_type(int(matriz.max()) if matriz.size else 0))
+
+
+class Cruzamento:
+    """Matriz densa linhas × colunas de cada medida, com os dicionários"""
+
+    def __init__(self, armazem, nome_linhas, linhas, nome_colunas, colunas):
+        self.nome_linhas, self.nome_colunas = nome_linhas, nome_colunas
+        self.linhas, self.colunas = linhas.valores, colunas.valores
+        self.formatos = tuple(FORMATOS_ROTULO.get(nome, lambda valor: valor) for nome in (nome_linhas, nome_colunas))
+
+        acidente, codigo_linha, codigo_coluna = _juntar(armazem.n, linhas, colunas)
+        forma = (len(linhas) + 1, len(colunas) + 1)
+        celula = codigo_linha * forma[1] + codigo_coluna
+        self.celulas = {}
+        for medida in MEDIDAS:
+            pesos = None if medida == 'acidentes' else armazem.contadores[medida][acidente]
+            contagem = np.bincount(celula, weights=pesos, minlength=forma[0] * forma[1])
+            # Última linha/coluna são os nulos: ficam fora da tabela
+            self.celulas[medida] = _compactar(contagem.astype(np.int64).reshape(forma)[:-1, :-1])
+
+    def tamanho_bytes(self):
+        return sum(matriz.nbytes for matriz in self.celulas.values())
+
+    def fatiar(self, medida='acidentes', linhas=None, colunas=None, top_linhas=None, top_colunas=None,
+               transpor=False):
+        """
+        Recorte da matriz: valores pedidos (sem diferenciar maiúsculas) ou os
+        top-N pelo total marginal; linhas e colunas em ordem decrescente.
+
+        Returns:
+            dict: {'linhas', 'colunas', 'valores', 'total_linhas', 'total_colunas'}
+        """
+        if medida not in self.celulas:
+            raise ValueError(f"Medida inválida: {medida}. Aceitas: {', '.join(MEDIDAS)}")
+        matriz = self.celulas[medida].astype(np.int64)
+        rotulos_linhas, rotulos_colunas = self.linhas, self.colunas
+        formato_linhas, formato_colunas = self.formatos
+        if transpor:
+            matriz = matriz.T
+            rotulos_linhas, rotulos_colunas = rotulos_colunas, rotulos_linhas
+            formato_linhas, formato_colunas = formato_colunas, formato_linhas
+
+        escolhidas_linhas = _escolher(rotulos_linhas, matriz.sum(axis=1), linhas, top_linhas)
+        escolhidas_colunas = _escolher(rotulos_colunas, matriz.sum(axis=0), colunas, top_colunas)
+        recorte = matriz[np.ix_(escolhidas_linhas, escolhidas_colunas)]
+        return {
+            'linhas': [formato_linhas(rotulos_linhas[i]) for i in escolhidas_linhas],
+            'colunas': [formato_colunas(rotulos_colunas[j]) for j in escolhidas_colunas],
+            'valores': recorte.tolist(),
+            'total_linhas': recorte.sum(axis=1).tolist(),
+            'total_colunas': recorte.sum(axis=0).tolist()
+        }
+
+
+def _escolher(rotulos, totais, pedidos=None, top=None):
+    """Índices dos rótulos pedidos (ou de todos com total > 0), por total desc."""
+    if pedidos:
+        por_texto = {}
+        for indice, rotulo in enumerate(rotulos):
+            por_texto.setdefault(str(rotulo).strip().casefold(), []).append(indice)
+        indices = sorted({i for valor in pedidos for i in por_texto.get(str(valor).strip().casefold(), [])})
+    else:
+        indices = list(np.flatnonzero(totais))
+    indices.sort(key=lambda i: str(rotulos[i]))
+    indices.sort(key=lambda i: -totais[i])
+    return np.asarray(indices[:top], dtype=np.intp)
+
+
+class CuboCruzamentos:
+    """Todos os cruzamentos configurados, materializados na carga do armazém"""
+
+    def __init__(self, armazem, pares=None):
+        disponiveis = eixos(armazem)
+        self.cruzamentos = {}
+        for nome_linhas, nome_colunas in pares or CRUZAMENTOS:
+            if nome_linhas in disponiveis and nome_colunas in disponiveis:
+                self.cruzamentos[(nome_linhas, nome_colunas)] = Cruzamento(
+                    armazem, nome_linhas, disponiveis[nome_linhas], nome_colunas, disponiveis[nome_colunas]
+                )
+
+    def __len__(self):
+        return len(self.cruzamentos)
+
+    def obter(self, linhas, colunas):
+        """(cruzamento, transpor) para o par pedido em qualquer ordem, ou (None, False)"""
+        if (linhas, colunas) in self.cruzamentos:
+            return self.cruzamentos[(linhas, colunas)], False
+        if (colunas, linhas) in self.cruzamentos:
+            return self.cruzamentos[(colunas, linhas)], True
+        return None, False
+
+    def catalogo(self):
+        """Pares disponíveis com as dimensões e o tamanho de cada matriz"""
+        return [
+            {
+                'linhas': nome_linhas,
+                'colunas': nome_colunas,
+                'forma': list(cruzamento.celulas['acidentes'].shape),
+                'tipo': {medida: str(matriz.dtype) for medida, matriz in cruzamento.celulas.items()},
+                'bytes': cruzamento.tamanho_bytes()
+            }
+            for (nome_linhas, nome_colunas), cruzamento in self.cruzamentos.items()
+        ]
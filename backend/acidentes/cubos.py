@@ -0,0 +1,113 @@
+"""
+Cubos temporais pré-agregados dos acidentes
+Acidentes, mortos e feridos graves por dia × hora do dia, montados uma vez a
+cada carga do armazém. Séries por dia/semana/mês e a matriz hora × dia da
+semana saem de somas sobre as células do cubo (algumas centenas por ano),
+sem varrer os acidentes.
+"""
+
+import numpy as np
+
+MEDIDAS = ('acidentes', 'mortos', 'feridos_graves')
+GRANULARIDADES = ('dia', 'semana', 'mes', 'hora_semana')
+
+# Colunas 0-23 do cubo são as horas; a coluna 24 guarda horário desconhecido
+HORAS = 24
+DIAS_SEMANA = ['segunda-feira', 'terça-feira', 'quarta-feira', 'quinta-feira',
+               'sexta-feira', 'sábado', 'domingo']
+
+
+def _dia_semana(dias):
+    """Dia da semana (segunda = 0) de dias contados desde 1970-01-01 (quinta)"""
+    return (dias + 3) % 7
+
+
+class CuboTemporal:
+    """
+    Células [dia, hora] com a soma de cada medida. Acidentes sem data ficam
+    fora do cubo (como ficam fora dos filtros de data).
+    """
+
+    def __init__(self, armazem, posicoes=None):
+        data, hora = armazem.data, armazem.hora
+        valores = {'mortos': armazem.contadores['mortos'], 'feridos_graves': armazem.contadores['feridos_graves']}
+        if posicoes is not None:
+            data, hora = data[posicoes], hora[posicoes]
+            valores = {medida: vetor[posicoes] for medida, vetor in valores.items()}
+
+        validas = ~np.isnat(data)
+        dias = data[validas].astype(np.int64)
+        self.primeiro = int(dias.min()) if len(dias) else 0
+        self.n_dias = int(dias.max()) - self.primeiro + 1 if len(dias) else 0
+
+        celula = (dias - self.primeiro) * (HORAS + 1) + hora[validas]
+        tamanho = self.n_dias * (HORAS + 1)
+        self.celulas = {'acidentes': np.bincount(celula, minlength=tamanho)}
+        for medida, vetor in valores.items():
+            self.celulas[medida] = np.bincount(celula, weights=vetor[validas], minlength=tamanho).astype(np.int64)
+        self.celulas = {medida: c.reshape(self.n_dias, HORAS + 1) for medida, c in self.celulas.items()}
+
+    def _linhas(self, inicio=None, fim=None):
+        """Fatia de dias do cubo dentro do intervalo (datas inclusivas)"""
+        a = 0 if inicio is None else int(inicio.astype(np.int64)) - self.primeiro
+        b = self.n_dias if fim is None else int(fim.astype(np.int64)) - self.primeiro + 1
+        return slice(min(max(a, 0), self.n_dias), min(max(b, 0), self.n_dias))
+
+    def serie(self, granularidade, inicio=None, fim=None):
+        """
+        Série contínua (períodos sem acidentes incluídos) por dia, semana
+        (rotulada pela segunda-feira) ou mês.
+
+        Returns:
+            list: [{'periodo': 'AAAA-MM-DD' | 'AAAA-MM', 'acidentes': n, ...}]
+        """
+        linhas = self._linhas(inicio, fim)
+        dias = np.arange(linhas.start, linhas.stop, dtype=np.int64) + self.primeiro
+        if not len(dias):
+            return []
+
+        if granularidade == 'dia':
+            chaves = dias.astype('datetime64[D]')
+        elif granularidade == 'semana':
+            chaves = (dias - _dia_semana(dias)).astype('datetime64[D]')
+        elif granularidade == 'mes':
+            chaves = dias.astype('datetime64[D]').astype('datetime64[M]')
+        else:
+            raise ValueError(f"Granularidade de série inválida: {granularidade}")
+
+        # Chaves crescentes: cada período é um bloco contíguo de dias
+        inicios = np.flatnonzero(np.r_[True, chaves[1:] != chaves[:-1]])
+        somas = {
+            medida: np.add.reduceat(celulas[linhas].sum(axis=1), inicios)
+            for medida, celulas in self.celulas.items()
+        }
+        return [
+            {'periodo': str(chaves[i]), **{medida: int(somas[medida][j]) for medida in MEDIDAS}}
+            for j, i in enumerate(inicios)
+        ]
+
+    def hora_semana(self, inicio=None, fim=None):
+        """
+        Matrizes dia da semana × hora do dia (7 × 24) de cada medida.
+
+        Returns:
+            dict: {'dias_semana': [...], 'horas': [0..23], 'acidentes': [[...]], ...,
+                   'horario_desconhecido': {medida: total}}
+        """
+        linhas = self._linhas(inicio, fim)
+        semana = _dia_semana(np.arange(linhas.start, linhas.stop, dtype=np.int64) + self.primeiro)
+        resultado = {'dias_semana': DIAS_SEMANA, 'horas': list(range(HORAS))}
+        desconhecido = {}
+        for medida in MEDIDAS:
+            matriz = np.zeros((7, HORAS + 1), dtype=np.int64)
+            np.add.at(matriz, semana, self.celulas[medida][linhas])
+            resultado[medida] = matriz[:, :HORAS].tolist()
+            desconhecido[medida] = int(matriz[:, HORAS].sum())
+        resultado['horario_desconhecido'] = desconhecido
+        return resultado
+
+    def consultar(self, granularidade, inicio=None, fim=None):
+        """Série ou matriz hora × dia da semana, conforme a granularidade"""
+        if granularidade == 'hora_semana':
+            return self.hora_semana(inicio, fim)
+        return self.serie(granularidade, inicio, fim)
@@ -0,0 +1,239 @@
+"""
+Índice espacial em grade sobre latitude/longitude dos acidentes
+Os acidentes ficam ordenados pela célula de uma grade regular de 0,01° (~1 km)
+com o início de cada célula em um vetor de deslocamentos. Consultas por
+retângulo ou raio só visitam as células que intersectam a área, e os hotspots
+vêm de contagens por célula pré-agregadas em níveis de zoom.
+"""
+
+import numpy as np
+
+# Tamanho da célula da grade base, em graus
+GRAU_CELULA = 0.01
+# Células (em graus) de cada nível de hotspots: múltiplos da célula base
+NIVEIS = {'0.01': 1, '0.05': 5, '0.1': 10, '0.5': 50, '1': 100}
+NIVEL_PADRAO = '0.1'
+
+_COLUNAS_GRADE = int(round(360 / GRAU_CELULA))
+_LINHAS_GRADE = int(round(180 / GRAU_CELULA))
+RAIO_MAXIMO_KM = 500
+RAIO_TERRA_KM = 6371.0088
+KM_POR_GRAU = 111.32
+
+
+def _celulas(latitude, longitude):
+    """Linha e coluna da célula base de cada ponto"""
+    linha = np.floor((latitude + 90) / GRAU_CELULA).astype(np.int64)
+    coluna = np.floor((longitude + 180) / GRAU_CELULA).astype(np.int64)
+    return linha, coluna
+
+
+def distancia_km(latitude, longitude, lat0, lon0):
+    """Distância haversine (km) de cada ponto até (lat0, lon0)"""
+    lat, lon, lat0, lon0 = map(np.radians, (latitude, longitude, lat0, lon0))
+    a = np.sin((lat - lat0) / 2) ** 2 + np.cos(lat) * np.cos(lat0) * np.sin((lon - lon0) / 2) ** 2
+    return 2 * RAIO_TERRA_KM * np.arcsin(np.sqrt(a))
+
+
+def _agrupar(chaves, pesos):
+    """Chaves distintas (ordenadas) e somas de cada peso por chave"""
+    unicas, grupo = np.unique(chaves, return_inverse=True)
+    return unicas, {medida: np.bincount(grupo, weights=peso, minlength=len(unicas)).astype(np.int64)
+                    for medida, peso in pesos.items()}
+
+
+class IndiceEspacial:
+    """
+    Grade de acidentes com coordenadas válidas. posicoes restringe o índice
+    a um subconjunto dos acidentes (consultas com filtros).
+    """
+
+    def __init__(self, armazem, posicoes=None):
+        self.armazem = armazem
+        latitude, longitude = armazem.latitude, armazem.longitude
+        if posicoes is None:
+            posicoes = np.arange(armazem.n, dtype=np.intp)
+        else:
+            latitude, longitude = latitude[posicoes], longitude[posicoes]
+
+        # Coordenadas nulas, zeradas ou fora da faixa ficam fora do índice
+        validas = (np.isfinite(latitude) & np.isfinite(longitude) &
+                   (np.abs(latitude) <= 90) & (np.abs(longitude) < 180) &
+                   ((latitude != 0) | (longitude != 0)))
+        linha, coluna = _celulas(latitude[validas], longitude[validas])
+        chave = linha * _COLUNAS_GRADE + coluna
+
+        ordem = np.argsort(chave, kind='stable')
+        self.posicoes = posicoes[validas][ordem]
+        self.latitude = latitude[validas][ordem]
+        self.longitude = longitude[validas][ordem]
+        chave = chave[ordem]
+
+        # Formato CSR: células não vazias e o início de cada uma em self.posicoes
+        self.chaves, self.inicios = np.unique(chave, return_index=True)
+        self.inicios = np.append(self.inicios, len(chave))
+
+        # Hotspots pré-agregados por nível
+        mortos = armazem.contadores['mortos'][self.posicoes]
+        linha, coluna = np.divmod(chave, _COLUNAS_GRADE)
+        self.niveis = {}
+        for nome, fator in NIVEIS.items():
+            chaves_nivel, somas = _agrupar(
+                (linha // fator) * _COLUNAS_GRADE + coluna // fator,
+                {'acidentes': np.ones(len(chave)), 'mortos': mortos}
+            )
+            self.niveis[nome] = {'fator': fator, 'chaves': chaves_nivel, **somas}
+
+    def __len__(self):
+        return len(self.posicoes)
+
+    # ==================== CONSULTAS ====================
+
+    def no_retangulo(self, lat_min, lon_min, lat_max, lon_max):
+        """Índices (em self.posicoes) dos pontos dentro do retângulo"""
+        linha_min, coluna_min = _celulas(np.float64(lat_min), np.float64(lon_min))
+        linha_max, coluna_max = _celulas(np.float64(lat_max), np.float64(lon_max))
+        # Limitadas à grade: área grande não aloca linhas inexistentes e a
+        # coluna não transborda para a linha seguinte
+        linha_min, linha_max = np.clip((linha_min, linha_max), 0, _LINHAS_GRADE - 1)
+        coluna_min, coluna_max = np.clip((coluna_min, coluna_max), 0, _COLUNAS_GRADE - 1)
+        if linha_min > linha_max or coluna_min > coluna_max:
+            return np.zeros(0, dtype=np.intp)
+
+        # Uma faixa contígua de chaves por linha da grade
+        linhas = np.arange(linha_min, linha_max + 1, dtype=np.int64) * _COLUNAS_GRADE
+        primeira = np.searchsorted(self.chaves, linhas + coluna_min)
+        ultima = np.searchsorted(self.chaves, linhas + coluna_max, side='right')
+        faixas = [(self.inicios[a], self.inicios[b]) for a, b in zip(primeira, ultima) if b > a]
+        if not faixas:
+            return np.zeros(0, dtype=np.intp)
+        candidatos = np.concatenate([np.arange(a, b) for a, b in faixas])
+
+        # Células da borda podem ter pontos fora do retângulo
+        lat, lon = self.latitude[candidatos], self.longitude[candidatos]
+        dentro = (lat >= lat_min) & (lat <= lat_max) & (lon >= lon_min) & (lon <= lon_max)
+        return candidatos[dentro]
+
+    def no_raio(self, lat0, lon0, raio_km):
+        """Índices dos pontos a até raio_km de (lat0, lon0)"""
+        dlat = raio_km / KM_POR_GRAU
+        dlon = raio_km / (KM_POR_GRAU * max(np.cos(np.radians(lat0)), 1e-6))
+        candidatos = self.no_retangulo(lat0 - dlat, lon0 - dlon, lat0 + dlat, lon0 + dlon)
+        distancias = distancia_km(self.latitude[candidatos], self.longitude[candidatos], lat0, lon0)
+        return candidatos[distancias <= raio_km]
+
+    def hotspots(self, nivel=NIVEL_PADRAO, retangulo=None, limite=None):
+        """
+        Células do nível com mais acidentes (desempate por mortos).
+
+        Returns:
+            list: [{'lat_min', 'lon_min', 'lat_max', 'lon_max', 'acidentes', 'mortos'}]
+        """
+        celulas = self.niveis[nivel]
+        tamanho = celulas['fator'] * GRAU_CELULA
+        linha, coluna = np.divmod(celulas['chaves'], _COLUNAS_GRADE)
+        lat_min = linha * tamanho - 90
+        lon_min = coluna * tamanho - 180
+
+        selecionadas = np.arange(len(linha))
+        if retangulo is not None:
+            r_lat_min, r_lon_min, r_lat_max, r_lon_max = retangulo
+            selecionadas = np.flatnonzero(
+                (lat_min + tamanho > r_lat_min) & (lat_min <= r_lat_max) &
+                (lon_min + tamanho > r_lon_min) & (lon_min <= r_lon_max)
+            )
+        ordem = np.lexsort((-celulas['mortos'][selecionadas], -celulas['acidentes'][selecionadas]))
+        selecionadas = selecionadas[ordem][:limite]
+        return [
+            {
+                'lat_min': round(float(lat_min[i]), 6),
+                'lon_min': round(float(lon_min[i]), 6),
+                'lat_max': round(float(lat_min[i] + tamanho), 6),
+                'lon_max': round(float(lon_min[i] + tamanho), 6),
+                'acidentes': int(celulas['acidentes'][i]),
+                'mortos': int(celulas['mortos'][i])
+            }
+            for i in selecionadas
+        ]
+
+    def pontos(self, indices, limite=None):
+        """
+        Resumo e acidentes (ordenados por mortos e feridos graves) de uma área.
+
+        Returns:
+            dict: {'total', 'mortos', 'feridos_graves', 'acidentes': [...]}
+        """
+        armazem = self.armazem
+        posicoes = self.posicoes[indices]
+        mortos = armazem.contadores['mortos'][posicoes]
+        graves = armazem.contadores['feridos_graves'][posicoes]
+        ordem = np.lexsort((graves, mortos))[::-1][:limite]
+        municipio = armazem.dimensoes.get('municipio')
+        return {
+            'total': int(len(posicoes)),
+            'mortos': int(mortos.sum()),
+            'feridos_graves': int(graves.sum()),
+            'acidentes': [
+                {
+                    'id': int(armazem.ids[posicoes[i]]),
+                    'latitude': round(float(self.latitude[indices[i]]), 6),
+                    'longitude': round(float(self.longitude[indices[i]]), 6),
+                    'data': str(armazem.data[posicoes[i]]) if not np.isnat(armazem.data[posicoes[i]]) else None,
+                    'municipio': municipio.valor(posicoes[i]) if municipio is not None else None,
+                    'mortos': int(mortos[i]),
+                    'feridos_graves': int(graves[i])
+                }
+                for i in ordem
+            ]
+        }
+
+
+# ==================== PARÂMETROS DA REQUISIÇÃO ====================
+
+PARAMETROS_AREA = ('bbox', 'lat', 'lon', 'raio_km')
+
+
+def _validar_coordenadas(chave, latitudes, longitudes):
+    if any(abs(lat) > 90 for lat in latitudes) or any(abs(lon) > 180 for lon in longitudes):
+        raise ValueError(f"'{chave}' fora da faixa: latitude em [-90, 90] e longitude em [-180, 180]")
+
+
+def _numeros(chave, texto, quantidade):
+    if quantidade == 1:
+        texto = texto.replace(',', '.')  # aceita decimal com vírgula, como no CSV
+    try:
+        valores = [float(parte.replace(' ', '')) for parte in texto.split(',')]
+    except ValueError:
+        valores = []
+    if len(valores) != quantidade or not all(np.isfinite(valores)):
+        raise ValueError(f"Parâmetro '{chave}' inválido: {texto}")
+    return valores
+
+
+def interpretar_area(args):
+    """
+    Área da consulta: bbox=lon_min,lat_min,lon_max,lat_max (ordem GeoJSON) ou
+    lat, lon e raio_km. Sem nenhum deles, None (todos os pontos).
+
+    Raises:
+        ValueError: Parâmetros incompletos ou inválidos
+    """
+    if args.get('bbox'):
+        lon_min, lat_min, lon_max, lat_max = _numeros('bbox', args['bbox'], 4)
+        if lat_min > lat_max or lon_min > lon_max:
+            raise ValueError("'bbox' deve ser lon_min,lat_min,lon_max,lat_max")
+        _validar_coordenadas('bbox', (lat_min, lat_max), (lon_min, lon_max))
+        return {'retangulo': (lat_min, lon_min, lat_max, lon_max)}
+
+    informados = [chave for chave in ('lat', 'lon', 'raio_km') if args.get(chave)]
+    if not informados:
+        return None
+    if len(informados) < 3:
+        raise ValueError("Consulta por raio exige 'lat', 'lon' e 'raio_km'")
+    lat0, = _numeros('lat', args['lat'], 1)
+    lon0, = _numeros('lon', args['lon'], 1)
+    raio_km, = _numeros('raio_km', args['raio_km'], 1)
+    _validar_coordenadas('lat/lon', (lat0,), (lon0,))
+    if not 0 < raio_km <= RAIO_MAXIMO_KM:
+        raise ValueError(f"'raio_km' deve estar entre 0 e {RAIO_MAXIMO_KM}")
+    return {'centro': (lat0, lon0), 'raio_km': raio_km}
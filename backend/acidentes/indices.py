@@ -0,0 +1,163 @@
+"""
+Índices invertidos em bitmaps comprimidos (Roaring) sobre os acidentes
+Um bitmap de posições de acidentes por valor distinto de cada dimensão, por
+causa/tipo, por dia/mês e por nível de cada contador (ex.: mortos == 2).
+Filtros viram AND/OR de bitmaps; contagens e somas dos KPIs saem da
+cardinalidade das interseções, sem tocar nos vetores dos acidentes.
+"""
+
+from array import array
+
+import numpy as np
+
+try:
+    from pyroaring import BitMap
+except ImportError:  # pyroaring é opcional: sem ele as consultas varrem os vetores
+    BitMap = None
+
+
+def disponivel():
+    """Indica se a biblioteca de bitmaps está instalada"""
+    return BitMap is not None
+
+
+def bitmap(posicoes):
+    """BitMap a partir de posições (via buffer uint32: sem iterar em Python)"""
+    buffer = array('I')
+    buffer.frombytes(np.ascontiguousarray(posicoes, dtype=np.uint32).tobytes())
+    return BitMap(buffer)
+
+
+def posicoes(bm):
+    """Posições (ordenadas) de um BitMap como vetor numpy"""
+    return np.frombuffer(bm.to_array(), dtype=np.uint32).astype(np.intp)
+
+
+def _uniao(bitmaps):
+    bitmaps = list(bitmaps)
+    return BitMap.union(*bitmaps) if bitmaps else BitMap()
+
+
+def _por_chave(chaves, posicoes_linhas=None):
+    """
+    Um BitMap de posições de acidentes por chave (ordenação estável: as
+    posições de cada grupo saem crescentes).
+
+    Returns:
+        dict: {chave: BitMap}
+    """
+    ordem = np.argsort(chaves, kind='stable')
+    chaves_ordenadas = chaves[ordem]
+    alvos = ordem if posicoes_linhas is None else posicoes_linhas[ordem]
+    inicios = np.flatnonzero(np.r_[True, chaves_ordenadas[1:] != chaves_ordenadas[:-1]]) if len(chaves) else []
+    fins = list(inicios[1:]) + [len(chaves)]
+    return {
+        chaves_ordenadas[inicio].item(): bitmap(alvos[inicio:fim])
+        for inicio, fim in zip(inicios, fins)
+    }
+
+
+class IndicesBitmap:
+    """Índices invertidos do ArmazemAcidentes, construídos na carga"""
+
+    def __init__(self, armazem):
+        self.n = armazem.n
+
+        # Dimensões do fato: BitMap por código (o código de nulos fica de fora)
+        self.dimensoes = {}
+        for col, dimensao in armazem.dimensoes.items():
+            por_codigo = _por_chave(dimensao.codigos)
+            self.dimensoes[col] = [por_codigo.get(codigo, BitMap()) for codigo in range(len(dimensao))]
+
+        # Pontes: BitMap dos acidentes que têm a causa/tipo
+        self.pontes = {}
+        for col, ponte in armazem.pontes.items():
+            por_codigo = _por_chave(ponte['dimensao'].codigos, ponte['acidente'])
+            self.pontes[col] = [por_codigo.get(codigo, BitMap()) for codigo in range(len(ponte['dimensao']))]
+
+        # Baldes de datas: por dia e por mês (datas nulas ficam fora de ambos)
+        validas = ~np.isnat(armazem.data)
+        linhas = np.flatnonzero(validas)
+        dias = armazem.data[validas].astype(np.int64)
+        meses = armazem.data[validas].astype('datetime64[M]').astype(np.int64)
+        self.dias = _por_chave(dias, linhas)
+        self.meses = _por_chave(meses, linhas)
+
+        # Contadores: BitMap por valor não nulo (soma = Σ valor × |seleção ∩ bitmap|)
+        self.contadores = {
+            col: {valor: bm for valor, bm in _por_chave(valores).items() if valor}
+            for col, valores in armazem.contadores.items()
+        }
+        self.positivos = {
+            col: _uniao(niveis.values()) for col, niveis in self.contadores.items()
+        }
+
+    # ==================== SELEÇÃO ====================
+
+    def intervalo_datas(self, inicio=None, fim=None):
+        """União dos meses inteiros no intervalo mais os dias das pontas"""
+        primeiro = int(inicio.astype(np.int64)) if inicio is not None else None
+        ultimo = int(fim.astype(np.int64)) if fim is not None else None
+
+        partes = []
+        for mes, bm in self.meses.items():
+            inicio_mes = int(np.datetime64(mes, 'M').astype('datetime64[D]').astype(np.int64))
+            fim_mes = int((np.datetime64(mes + 1, 'M').astype('datetime64[D]') - 1).astype(np.int64))
+            if (primeiro is not None and fim_mes < primeiro) or (ultimo is not None and inicio_mes > ultimo):
+                continue
+            if (primeiro is None or inicio_mes >= primeiro) and (ultimo is None or fim_mes <= ultimo):
+                partes.append(bm)
+            else:
+                partes.extend(
+                    bm_dia for dia, bm_dia in self.dias.items()
+                    if inicio_mes <= dia <= fim_mes and
+                    (primeiro is None or dia >= primeiro) and (ultimo is None or dia <= ultimo)
+                )
+        return _uniao(partes)
+
+    def selecionar(self, armazem, filtros, filtros_dimensao, filtros_ponte):
+        """
+        AND entre filtros, OR entre os valores de cada filtro.
+
+        Returns:
+            BitMap dos acidentes selecionados, ou None se não houver filtros
+        """
+        termos = []
+        if 'data_inicio' in filtros or 'data_fim' in filtros:
+            termos.append(self.intervalo_datas(filtros.get('data_inicio'), filtros.get('data_fim')))
+
+        for chave in filtros_dimensao:
+            if chave in filtros:
+                dimensao = armazem.dimensoes.get(chave)
+                if dimensao is None:
+                    return BitMap()
+                termos.append(_uniao(self.dimensoes[chave][c] for c in dimensao.codigos_de(filtros[chave])))
+
+        for chave in filtros_ponte:
+            if chave in filtros:
+                ponte = armazem.pontes.get(chave)
+                if ponte is None:
+                    return BitMap()
+                termos.append(_uniao(self.pontes[chave][c] for c in ponte['dimensao'].codigos_de(filtros[chave])))
+
+        if not termos:
+            return None
+        # Interseção começando pelo menor bitmap
+        termos.sort(key=len)
+        selecao = termos[0]
+        for termo in termos[1:]:
+            selecao = selecao & termo
+        return selecao
+
+    # ==================== CONTAGENS SEM TOCAR NAS LINHAS ====================
+
+    def cardinalidades(self, bitmaps, selecao):
+        """|seleção ∩ bitmap| para cada bitmap (seleção None = todos)"""
+        if selecao is None:
+            return np.array([len(bm) for bm in bitmaps], dtype=np.int64)
+        return np.array([selecao.intersection_cardinality(bm) for bm in bitmaps], dtype=np.int64)
+
+    def soma(self, contador, selecao):
+        """Soma do contador sobre a seleção, pelos bitmaps de cada nível"""
+        niveis = self.contadores[contador]
+        return int(sum(valor * c for valor, c in zip(niveis, self.cardinalidades(niveis.values(), selecao))))
@@ -0,0 +1,194 @@
+"""
+Registros brutos (uma linha por pessoa envolvida) dos acidentes selecionados
+Exportação em NDJSON/CSV gerada bloco a bloco: cada bloco de linhas é
+serializado (e opcionalmente comprimido) só quando o servidor o pede, então a
+resposta nunca é montada inteira na memória do worker. A listagem paginada usa
+cursor sobre a ordem (data, id, pesid, linha): cada página só percorre a ordem
+a partir do cursor até juntar o limite de registros.
+"""
+
+import base64
+import json
+import zlib
+
+import numpy as np
+import pandas as pd
+
+FORMATOS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv'
+}
+LINHAS_POR_BLOCO = 5000
+
+LIMITE_PAGINA_PADRAO = 100
+LIMITE_PAGINA_MAXIMO = 1000
+# Registros examinados no primeiro bloco de uma página filtrada (dobra a cada bloco)
+_BLOCO_MINIMO = 4096
+# Chaves nulas (data/id/pesid ausentes) vão para o fim da ordem
+_CHAVE_NULA = 2 ** 62
+
+
+def linhas_da_selecao(armazem, selecao):
+    """Posições (em armazem.registros) das linhas dos acidentes selecionados"""
+    if selecao.tudo:
+        return np.arange(len(armazem.registros))
+    acidente = armazem.linha_acidente
+    return np.flatnonzero((acidente >= 0) & selecao.mascara[acidente])
+
+
+def interpretar_campos(args, colunas):
+    """
+    Projeção de colunas: campos=id,data_inversa,br (vírgulas ou repetido).
+
+    Raises:
+        ValueError: Campo inexistente nos registros
+    """
+    campos = [parte.strip() for valor in args.getlist('campos') for parte in valor.split(',') if parte.strip()]
+    if not campos:
+        return list(colunas)
+    desconhecidos = [campo for campo in campos if campo not in colunas]
+    if desconhecidos:
+        raise ValueError(f"Campo(s) desconhecido(s): {', '.join(desconhecidos)}")
+    return list(dict.fromkeys(campos))
+
+
+def _preparar(bloco):
+    """float32 do leitor serializaria 437.299988: volta ao valor do CSV (437.3)"""
+    for coluna in bloco.columns:
+        if bloco[coluna].dtype == np.float32:
+            bloco[coluna] = pd.to_numeric(bloco[coluna].astype(str), errors='coerce')
+    return bloco
+
+
+def serializar(bloco, formato, cabecalho=False):
+    """Bytes de um bloco de registros em NDJSON ou CSV"""
+    bloco = _preparar(bloco)
+    if formato == 'csv':
+        return bloco.to_csv(index=False, header=cabecalho).encode('utf-8')
+    return bloco.to_json(orient='records', lines=True, force_ascii=False).encode('utf-8')
+
+
+def exportar(registros, linhas, campos, formato, linhas_por_bloco=LINHAS_POR_BLOCO):
+    """Gerador de blocos de bytes: um bloco de linhas serializado por vez"""
+    if formato == 'csv':
+        yield serializar(registros.iloc[:0][campos], formato, cabecalho=True)
+    for inicio in range(0, len(linhas), linhas_por_bloco):
+        yield serializar(registros.iloc[linhas[inicio:inicio + linhas_por_bloco]][campos], formato)
+
+
+def comprimir_gzip(blocos, nivel=6):
+    """Comprime um gerador de blocos em gzip, emitindo à medida que consome"""
+    compressor = zlib.compressobj(nivel, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for bloco in blocos:
+        comprimido = compressor.compress(bloco)
+        if comprimido:
+            yield comprimido
+    yield compressor.flush()
+
+
+# ==================== PAGINAÇÃO POR CURSOR ====================
+
+class OrdemRegistros:
+    """
+    Ordem estável dos registros por (data, id, pesid), calculada na carga.
+    O arquivo tem uma linha por pessoa × causa × tipo, então a posição da
+    linha no arquivo desempata e torna a chave única. O cursor é a chave do
+    último registro entregue; a próxima página começa por busca binária
+    nessa chave, sem percorrer as páginas anteriores.
+    """
+
+    def __init__(self, registros, datas, linha_acidente):
+        """
+        datas: data_inversa de cada registro como datetime64[D] (NaT = nula)
+        linha_acidente: posição no armazém do acidente de cada registro (-1 = nenhum)
+        """
+        dia = datas.astype(np.int64)
+        dia[np.isnat(datas)] = _CHAVE_NULA
+        chaves = [dia] + [
+            registros[coluna].to_numpy(dtype=np.int64, na_value=_CHAVE_NULA) if coluna in registros.columns
+            else np.full(len(registros), _CHAVE_NULA, dtype=np.int64)
+            for coluna in ('id', 'pesid')
+        ]
+
+        self.ordem = np.lexsort(chaves[::-1])
+        self.chaves = [chave[self.ordem] for chave in chaves] + [self.ordem.astype(np.int64)]
+        # Acidente de cada registro já na ordem: o filtro é testado sem indireção
+        self.acidente = np.asarray(linha_acidente, dtype=np.intp)[self.ordem]
+
+    def __len__(self):
+        return len(self.ordem)
+
+    def apos(self, chave):
+        """Primeira posição na ordem estritamente depois da chave (dia, id, pesid, linha)"""
+        inicio, fim = 0, len(self.ordem)
+        # Estreita a faixa coluna a coluna: dia, id, pesid e por fim a linha
+        for coluna, valor in zip(self.chaves[:-1], chave[:-1]):
+            inicio, fim = (inicio + np.searchsorted(coluna[inicio:fim], valor, side='left'),
+                           inicio + np.searchsorted(coluna[inicio:fim], valor, side='right'))
+        return int(inicio + np.searchsorted(self.chaves[-1][inicio:fim], chave[-1], side='right'))
+
+    def cursor(self, posicao):
+        """Cursor opaco do registro na posição da ordem"""
+        chave = [int(coluna[posicao]) for coluna in self.chaves]
+        return base64.urlsafe_b64encode(json.dumps(chave).encode('utf-8')).decode('ascii').rstrip('=')
+
+    def pagina(self, cursor=None, limite=LIMITE_PAGINA_PADRAO, mascara=None):
+        """
+        Registros da página seguinte ao cursor.
+
+        Args:
+            cursor (str): Cursor devolvido pela página anterior (None = início)
+            limite (int): Registros por página
+            mascara (np.ndarray): Acidentes permitidos pelos filtros (None = todos)
+
+        Returns:
+            (np.ndarray, str | None): posições em armazem.registros e o próximo cursor
+        """
+        inicio = 0 if cursor is None else self.apos(decodificar_cursor(cursor))
+        if mascara is None:
+            posicoes = np.arange(inicio, min(inicio + limite + 1, len(self.ordem)))
+        else:
+            posicoes = self._filtradas(inicio, limite + 1, mascara)
+
+        # Um registro a mais só para saber se existe próxima página
+        proximo = self.cursor(posicoes[limite - 1]) if len(posicoes) > limite else None
+        return self.ordem[posicoes[:limite]], proximo
+
+    def _filtradas(self, inicio, quantidade, mascara):
+        """
+        Primeiras `quantidade` posições da ordem, a partir de inicio, cujo
+        acidente passa no filtro. Percorre blocos crescentes e para assim que
+        junta o suficiente: o custo depende da página, não do total filtrado.
+        """
+        encontradas = []
+        faltam = quantidade
+        bloco = max(_BLOCO_MINIMO, 4 * quantidade)
+        while faltam > 0 and inicio < len(self.ordem):
+            fim = min(inicio + bloco, len(self.ordem))
+            acidente = self.acidente[inicio:fim]
+            aceitas = inicio + np.flatnonzero((acidente >= 0) & mascara[np.maximum(acidente, 0)])
+            encontradas.append(aceitas[:faltam])
+            faltam -= len(encontradas[-1])
+            inicio, bloco = fim, bloco * 2
+        return np.concatenate(encontradas) if encontradas else np.zeros(0, dtype=np.intp)
+
+
+def decodificar_cursor(cursor):
+    """
+    Chave (dia, id, pesid, linha) de um cursor.
+
+    Raises:
+        ValueError: Cursor malformado
+    """
+    try:
+        chave = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        if isinstance(chave, list) and len(chave) == 4 and all(isinstance(parte, int) for parte in chave):
+            return chave
+    except (ValueError, TypeError):
+        pass
+    raise ValueError(f"Cursor inválido: {cursor}")
+
+
+def para_json(registros, posicoes, campos):
+    """Registros como lista de dicionários serializáveis (nulos = None)"""
+    return json.loads(_preparar(registros.iloc[posicoes][campos]).to_json(orient='records', force_ascii=False))
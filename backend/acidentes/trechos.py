@@ -0,0 +1,142 @@
+"""
+Índice de trechos de rodovia (br, km)
+Os acidentes de cada BR ficam ordenados por km, com somas prefixadas de
+acidentes, mortos e feridos graves: a contagem de qualquer intervalo de km é
+uma busca binária, e a janela deslizante que encontra os trechos críticos de
+qualquer extensão percorre todas as rodovias de uma vez, sem laços por BR.
+"""
+
+import numpy as np
+
+MEDIDAS = ('acidentes', 'mortos', 'feridos_graves')
+# Chave composta br × km em metros (inteira: limites das janelas exatos);
+# o espaço reservado a cada BR é maior que qualquer km
+_ESPACO_BR = 10 ** 9
+# Maior extensão de trecho aceita: acima da rodovia mais longa do país e bem
+# abaixo do espaço de uma BR na chave (janelas não invadem a BR seguinte)
+EXTENSAO_MAXIMA_KM = 5000
+
+
+def nome_estrada(valor):
+    """BR-277 para valores numéricos; texto como veio nos demais casos"""
+    return f"BR-{int(valor)}" if isinstance(valor, (int, float, np.number)) else str(valor)
+
+
+class IndiceTrechos:
+    """
+    Acidentes com BR e km conhecidos, ordenados por (BR, km). posicoes
+    restringe o índice a um subconjunto dos acidentes (consultas com filtros).
+    """
+
+    def __init__(self, armazem, posicoes=None):
+        self.dimensao = armazem.dimensoes.get('br')
+        km = armazem.km
+        br = self.dimensao.codigos if self.dimensao is not None else np.full(armazem.n, 0, dtype=np.intp)
+        valores = {medida: armazem.contadores[medida] for medida in ('mortos', 'feridos_graves')}
+        if posicoes is not None:
+            km, br = km[posicoes], br[posicoes]
+            valores = {medida: vetor[posicoes] for medida, vetor in valores.items()}
+
+        n_brs = len(self.dimensao) if self.dimensao is not None else 0
+        validos = np.isfinite(km) & (br < n_brs)
+        ordem = np.lexsort((km[validos], br[validos]))
+        self.br = br[validos][ordem]
+        self.km = km[validos][ordem]
+        self.chave = self.br.astype(np.int64) * _ESPACO_BR + np.round(self.km * 1000).astype(np.int64)
+
+        # Prefixos com zero à frente: soma de [i, j) = prefixo[j] - prefixo[i]
+        self.prefixos = {'acidentes': np.arange(len(self.km) + 1, dtype=np.int64)}
+        for medida, vetor in valores.items():
+            self.prefixos[medida] = np.concatenate(([0], np.cumsum(vetor[validos][ordem])))
+
+        # Faixa [inicio, fim) de cada BR nos vetores ordenados
+        self.inicios = np.searchsorted(self.br, np.arange(n_brs + 1))
+
+    def __len__(self):
+        return len(self.km)
+
+    def _somas(self, inicio, fim):
+        return {medida: prefixo[fim] - prefixo[inicio] for medida, prefixo in self.prefixos.items()}
+
+    def codigos(self, brs=None):
+        """Códigos das BRs pedidas (todas se None)"""
+        if self.dimensao is None:
+            return np.zeros(0, dtype=np.intp)
+        if brs is None:
+            return np.arange(len(self.dimensao))
+        return self.dimensao.codigos_de(brs)
+
+    def contar(self, brs, km_inicio=None, km_fim=None):
+        """
+        Acidentes, mortos e feridos graves entre km_inicio e km_fim (inclusivos)
+        de cada BR pedida, por busca binária nos prefixos.
+
+        Returns:
+            list: [{'br', 'km_inicio', 'km_fim', 'acidentes', 'mortos', 'feridos_graves'}]
+        """
+        resultado = []
+        for codigo in self.codigos(brs):
+            a, b = self.inicios[codigo], self.inicios[codigo + 1]
+            i = a if km_inicio is None else a + np.searchsorted(self.km[a:b], km_inicio, side='left')
+            j = b if km_fim is None else a + np.searchsorted(self.km[a:b], km_fim, side='right')
+            somas = self._somas(i, max(i, j))
+            resultado.append({
+                'br': nome_estrada(self.dimensao.valores[codigo]),
+                'km_inicio': km_inicio,
+                'km_fim': km_fim,
+                **{medida: int(somas[medida]) for medida in MEDIDAS}
+            })
+        return resultado
+
+    def criticos(self, extensao_km, n=10, ordenar_por='acidentes', brs=None):
+        """
+        Top-N trechos [km_inicio, km_fim) de extensao_km sem sobreposição,
+        pela medida escolhida (desempate pelas demais). Cada janela começa no
+        km de um acidente: uma janela ótima sempre pode ser deslizada até
+        encostar em um.
+
+        Returns:
+            list: [{'br', 'km_inicio', 'km_fim', 'acidentes', 'mortos', 'feridos_graves'}]
+        """
+        if ordenar_por not in MEDIDAS:
+            raise ValueError(f"Medida inválida: {ordenar_por}. Aceitas: {', '.join(MEDIDAS)}")
+        if not 0 < extensao_km <= EXTENSAO_MAXIMA_KM:
+            raise ValueError(f"extensao_km deve estar entre 0 e {EXTENSAO_MAXIMA_KM}: {extensao_km}")
+
+        if self.dimensao is None or not len(self.km):
+            return []
+
+        # Janelas de todas as BRs de uma vez sobre a chave composta br × km
+        # (uma por km distinto: acidentes no mesmo km abrem a mesma janela)
+        inicios = np.flatnonzero(np.r_[True, self.chave[1:] != self.chave[:-1]])
+        if brs is not None:
+            selecionadas = np.zeros(len(self.dimensao) + 1, dtype=bool)
+            selecionadas[self.codigos(brs)] = True
+            inicios = inicios[selecionadas[self.br[inicios]]]
+        # Fim exclusivo: o acidente no km_fim abre a janela seguinte, não esta
+        fins = np.searchsorted(self.chave, self.chave[inicios] + round(extensao_km * 1000), side='left')
+        somas = self._somas(inicios, fins)
+
+        desempate = [medida for medida in MEDIDAS if medida != ordenar_por]
+        ordem = np.lexsort((inicios,) + tuple(-somas[m] for m in reversed(desempate)) + (-somas[ordenar_por],))
+
+        # Guloso: a melhor janela de cada região, descartando as sobrepostas
+        escolhidos = []
+        for indice in ordem:
+            if len(escolhidos) >= n or somas[ordenar_por][indice] == 0:
+                break
+            inicio = inicios[indice]
+            br, km = self.br[inicio], self.km[inicio]
+            if any(br == outro_br and abs(km - outro_km) < extensao_km for outro_br, outro_km, _ in escolhidos):
+                continue
+            escolhidos.append((br, km, indice))
+
+        return [
+            {
+                'br': nome_estrada(self.dimensao.valores[br]),
+                'km_inicio': round(float(km), 3),
+                'km_fim': round(float(km + extensao_km), 3),
+                **{medida: int(somas[medida][indice]) for medida in MEDIDAS}
+            }
+            for br, km, indice in escolhidos
+        ]
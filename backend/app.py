@@ -3,19 +3,37 @@ CapivaraFlow Backend - Flask Application
 SaaS Dashboard com Sistema de Módulos Modular
 """
 
-from flask import Flask, jsonify, send_from_directory, request
+from flask import Flask, Response, jsonify, send_from_directory, request
 from flask_cors import CORS
-import json
+import math
 import os
+import time
 from datetime import datetime
 
-app = Flask(__name__, static_folder='../public', static_url_path='')
+from acidentes import (EXTENSAO_MAXIMA_KM, FORMATOS_EXPORTACAO, GRANULARIDADES, LIMITE_PAGINA_MAXIMO,
+                       LIMITE_PAGINA_PADRAO, NIVEIS, PARAMETROS_AREA, ArmazemAcidentes, AtualizadorArmazem,
+                       calcular_slides, comprimir_gzip, cubo_temporal, exportar, filtros_para_json, indice_espacial,
+                       indice_trechos, interpretar_area, interpretar_campos, interpretar_filtros, linhas_da_selecao,
+                       regenerar_relatorios, registros_para_json, selecionar)
+from assets import PipelineAssets
+from cache_http import RespostaArquivoJSON, resposta_condicional
+from modules.registry import registry as modules_registry
+
+# Sem a rota estática automática do Flask: public/ é servido por serve_static,
+# que passa pelo pipeline de assets (hash + gzip/brotli)
+app = Flask(__name__, static_folder=None)
 CORS(app)
 
 # ==================== CONFIGURAÇÕES ====================
-DEBUG = True
-PORT = 5000
-MODULES_PATH = os.path.join(os.path.dirname(__file__), 'modules')
+# Valem para o servidor de desenvolvimento (python backend/app.py);
+# em produção use o Gunicorn: gunicorn -c backend/gunicorn.conf.py app:app
+DEBUG = os.environ.get('FLASK_DEBUG', '1') == '1'
+PORT = int(os.environ.get('PORT', 5000))
+PUBLIC_PATH = os.path.join(os.path.dirname(__file__), '../public')
+ACIDENTES_DATA_PATH = os.path.join(
+    os.path.dirname(__file__),
+    '../modules/relatorio-de-acidentes/dados_estruturados.json'
+)
 
 # ==================== DADOS SIMULADOS ====================
 USERS = {
@@ -23,46 +41,31 @@ USERS = {
     'user': 'password'
 }
 
-MODULES_CONFIG = [
-    {
-        'id': 'home',
-        'name': 'Dashboard',
-        'icon': '📊',
-        'description': 'Dashboard principal',
-        'active': True
-    },
-    {
-        'id': 'relatorio-acidentes',
-        'name': 'Relatório de Acidentes',
-        'icon': '📈',
-        'description': 'Análise de acidentes de trânsito 2025',
-        'active': True,
-        'url': '/modules/relatorio-acidentes.html'
-    },
-    {
-        'id': 'produtos',
-        'name': 'Produtos',
-        'icon': '📋',
-        'description': 'Gestão de produtos',
-        'active': True
-    }
-]
-
 # ==================== ROTAS ESTÁTICAS ====================
+# Cópias com hash + variantes gzip/brotli de public/, geradas na inicialização
+assets = PipelineAssets(PUBLIC_PATH).construir()
+
+def _servir_publico(filename):
+    """Serve pelo pipeline de assets, ou direto de public/ se não estiver no manifesto"""
+    resposta = assets.servir(filename)
+    if resposta is None:
+        resposta = send_from_directory(PUBLIC_PATH, filename)
+    return resposta
+
 @app.route('/')
 def index():
     """Serve a página principal (login)"""
-    return send_from_directory(app.static_folder, 'login.html')
+    return _servir_publico('login.html')
 
 @app.route('/dashboard.html')
 def dashboard():
     """Serve o dashboard"""
-    return send_from_directory(app.static_folder, 'dashboard.html')
+    return _servir_publico('dashboard.html')
 
 @app.route('/<path:filename>')
 def serve_static(filename):
     """Serve arquivos estáticos"""
-    return send_from_directory(app.static_folder, filename)
+    return _servir_publico(filename)
 
 # ==================== API DE AUTENTICAÇÃO ====================
 @app.route('/api/auth/login', methods=['POST'])
@@ -99,10 +102,11 @@ def login():
 def get_modules():
     """Lista todos os módulos disponíveis"""
     try:
+        modules = modules_registry.list()
         return jsonify({
             'success': True,
-            'modules': MODULES_CONFIG,
-            'count': len(MODULES_CONFIG),
+            'modules': modules,
+            'count': len(modules),
             'timestamp': datetime.now().isoformat()
         }), 200
     except Exception as e:
@@ -115,7 +119,7 @@ def get_modules():
 def get_module(module_id):
     """Obtém informações de um módulo específico"""
     try:
-        module = next((m for m in MODULES_CONFIG if m['id'] == module_id), None)
+        module = modules_registry.get(module_id)
         
         if module:
             return jsonify({
@@ -135,24 +139,26 @@ def get_module(module_id):
         }), 500
 
 # ==================== API DE DADOS (MÓDULO ACIDENTES) ====================
+def _payload_acidentes_summary(dados, modificado_em):
+    """Envelope da resposta; o timestamp é o da geração do arquivo"""
+    return {
+        'success': True,
+        'data': dados,
+        'timestamp': modificado_em.isoformat()
+    }
+
+# Resposta serializada uma vez e reaproveitada até o arquivo mudar
+acidentes_summary_cache = RespostaArquivoJSON(ACIDENTES_DATA_PATH, _payload_acidentes_summary)
+
 @app.route('/api/acidentes/summary', methods=['GET'])
 def get_acidentes_summary():
     """Retorna sumário dos acidentes"""
     try:
-        # Tenta carregar dados reais do JSON
-        acidentes_data_path = os.path.join(
-            os.path.dirname(__file__),
-            '../modules/relatorio-de-acidentes/dados_estruturados.json'
-        )
+        # Tenta usar os dados reais do JSON (em cache enquanto não mudar)
+        entrada = acidentes_summary_cache.obter()
         
-        if os.path.exists(acidentes_data_path):
-            with open(acidentes_data_path, 'r', encoding='utf-8') as f:
-                dados = json.load(f)
-                return jsonify({
-                    'success': True,
-                    'data': dados,
-                    'timestamp': datetime.now().isoformat()
-                }), 200
+        if entrada is not None:
+            return resposta_condicional(entrada)
         else:
             # Dados simulados se arquivo não existir
             return jsonify({
@@ -171,6 +177,527 @@ def get_acidentes_summary():
             'message': f'Erro ao obter dados de acidentes: {str(e)}'
         }), 500
 
+# Armazém colunar residente para consultas filtradas (CSVs em ACIDENTES_CSV)
+armazem_acidentes = ArmazemAcidentes()
+# Recarrega o armazém em segundo plano quando os CSVs mudam (ACIDENTES_RECARGA_INTERVALO)
+atualizador_acidentes = AtualizadorArmazem(armazem_acidentes)
+# ...e regenera os JSONs do relatório (summary e módulo) com o CSV novo
+atualizador_acidentes.ao_recarregar.append(regenerar_relatorios)
+
+@app.route('/api/acidentes/query', methods=['GET'])
+def query_acidentes():
+    """
+    Indicadores do relatório para um recorte dos acidentes.
+    
+    Filtros (query string; valores repetidos = OU): data_inicio, data_fim,
+    uf, br, municipio, dia_semana, tipo_acidente, causa_acidente, fase_dia,
+    condicao_metereologica. Ex.: ?br=277&fase_dia=Plena Noite&data_fim=2025-03-31
+    """
+    try:
+        filtros = interpretar_filtros(request.args)
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    
+    try:
+        armazem = armazem_acidentes.garantir_carregado()
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Dados de acidentes indisponíveis: {str(e)}'
+        }), 503
+    
+    try:
+        inicio = time.perf_counter()
+        slides = calcular_slides(selecionar(armazem, filtros))
+        return jsonify({
+            'success': True,
+            'filtros': filtros_para_json(filtros),
+            'data': {'slides': slides},
+            'tempo_ms': round((time.perf_counter() - inicio) * 1000, 2),
+            'timestamp': datetime.now().isoformat()
+        }), 200
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Erro ao consultar acidentes: {str(e)}'
+        }), 500
+
+@app.route('/api/acidentes/temporal', methods=['GET'])
+def temporal_acidentes():
+    """
+    Acidentes, mortos e feridos graves ao longo do tempo.
+    
+    granularidade: dia, semana, mes (série) ou hora_semana (matriz dia da
+    semana × hora). Aceita os mesmos filtros de /api/acidentes/query.
+    Ex.: ?granularidade=semana&uf=PR&data_inicio=2025-01-01
+    """
+    granularidade = request.args.get('granularidade', 'mes')
+    if granularidade not in GRANULARIDADES:
+        return jsonify({
+            'success': False,
+            'message': f"Granularidade inválida: {granularidade}. Aceitas: {', '.join(GRANULARIDADES)}"
+        }), 400
+    try:
+        filtros = interpretar_filtros(request.args, extras=('granularidade',))
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    
+    try:
+        armazem = armazem_acidentes.garantir_carregado()
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Dados de acidentes indisponíveis: {str(e)}'
+        }), 503
+    
+    try:
+        inicio = time.perf_counter()
+        cubo = cubo_temporal(armazem, filtros)
+        dados = cubo.consultar(granularidade, filtros.get('data_inicio'), filtros.get('data_fim'))
+        return jsonify({
+            'success': True,
+            'granularidade': granularidade,
+            'filtros': filtros_para_json(filtros),
+            'data': dados,
+            'tempo_ms': round((time.perf_counter() - inicio) * 1000, 2),
+            'timestamp': datetime.now().isoformat()
+        }), 200
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Erro ao consultar série temporal: {str(e)}'
+        }), 500
+
+def _parametros_mapa(extras=()):
+    """Filtros, área e limite das rotas de mapa (ValueError se inválidos)"""
+    filtros = interpretar_filtros(request.args, extras=PARAMETROS_AREA + ('limite',) + extras)
+    area = interpretar_area(request.args)
+    limite = request.args.get('limite')
+    if limite is not None:
+        if not limite.isdigit() or int(limite) == 0:
+            raise ValueError(f"'limite' deve ser um inteiro positivo: {limite}")
+        limite = int(limite)
+    return filtros, area, limite
+
+@app.route('/api/acidentes/mapa/hotspots', methods=['GET'])
+def hotspots_acidentes():
+    """
+    Células da grade espacial com mais acidentes (e mortos).
+    
+    nivel: tamanho da célula em graus (0.01, 0.05, 0.1, 0.5, 1; padrão 0.1).
+    bbox=lon_min,lat_min,lon_max,lat_max restringe o mapa; limite corta o
+    ranking. Aceita os mesmos filtros de /api/acidentes/query.
+    """
+    nivel = request.args.get('nivel', '0.1')
+    if nivel not in NIVEIS:
+        return jsonify({
+            'success': False,
+            'message': f"Nível inválido: {nivel}. Aceitos: {', '.join(NIVEIS)}"
+        }), 400
+    try:
+        filtros, area, limite = _parametros_mapa(extras=('nivel',))
+        if area is not None and 'retangulo' not in area:
+            raise ValueError("Hotspots aceitam apenas 'bbox' como área")
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    
+    try:
+        armazem = armazem_acidentes.garantir_carregado()
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Dados de acidentes indisponíveis: {str(e)}'
+        }), 503
+    
+    try:
+        inicio = time.perf_counter()
+        indice = indice_espacial(armazem, filtros)
+        celulas = indice.hotspots(nivel, area['retangulo'] if area else None, limite)
+        return jsonify({
+            'success': True,
+            'nivel': nivel,
+            'filtros': filtros_para_json(filtros),
+            'data': {'celulas': celulas},
+            'tempo_ms': round((time.perf_counter() - inicio) * 1000, 2),
+            'timestamp': datetime.now().isoformat()
+        }), 200
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Erro ao consultar hotspots: {str(e)}'
+        }), 500
+
+@app.route('/api/acidentes/mapa/pontos', methods=['GET'])
+def pontos_acidentes():
+    """
+    Acidentes em uma área: bbox=lon_min,lat_min,lon_max,lat_max ou
+    lat, lon e raio_km. Os mais graves primeiro; limite padrão 500.
+    Aceita os mesmos filtros de /api/acidentes/query.
+    """
+    try:
+        filtros, area, limite = _parametros_mapa()
+        if area is None:
+            raise ValueError("Informe 'bbox' ou 'lat', 'lon' e 'raio_km'")
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    
+    try:
+        armazem = armazem_acidentes.garantir_carregado()
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Dados de acidentes indisponíveis: {str(e)}'
+        }), 503
+    
+    try:
+        inicio = time.perf_counter()
+        indice = indice_espacial(armazem, filtros)
+        if 'retangulo' in area:
+            encontrados = indice.no_retangulo(*area['retangulo'])
+        else:
+            encontrados = indice.no_raio(*area['centro'], area['raio_km'])
+        return jsonify({
+            'success': True,
+            'filtros': filtros_para_json(filtros),
+            'data': indice.pontos(encontrados, limite or 500),
+            'tempo_ms': round((time.perf_counter() - inicio) * 1000, 2),
+            'timestamp': datetime.now().isoformat()
+        }), 200
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Erro ao consultar pontos: {str(e)}'
+        }), 500
+
+def _numero(chave, padrao=None, inteiro=False, zero=False):
+    """Parâmetro numérico positivo (ou zero) da query string (ValueError se inválido)"""
+    texto = request.args.get(chave)
+    if not texto:
+        return padrao
+    try:
+        valor = int(texto) if inteiro else float(texto.replace(',', '.'))
+    except ValueError:
+        valor = None
+    if valor is None or not math.isfinite(valor) or not (valor > 0 or (zero and valor == 0)):
+        raise ValueError(f"'{chave}' deve ser um número positivo: {texto}")
+    return valor
+
+@app.route('/api/acidentes/trechos/criticos', methods=['GET'])
+def trechos_criticos():
+    """
+    Trechos de rodovia (br, km) mais críticos, sem sobreposição.
+    
+    extensao_km (padrão 5, máximo EXTENSAO_MAXIMA_KM), n (padrão 10),
+    ordenar_por (acidentes, mortos, feridos_graves). Trechos são [km_inicio,
+    km_fim): o acidente exatamente no km_fim fica fora. br restringe as rodovias; aceita os mesmos filtros de
+    /api/acidentes/query. Ex.: ?br=277,376&extensao_km=5&n=10
+    """
+    try:
+        filtros = interpretar_filtros(request.args, extras=('extensao_km', 'n', 'ordenar_por'))
+        extensao_km = _numero('extensao_km', 5.0)
+        if extensao_km > EXTENSAO_MAXIMA_KM:
+            raise ValueError(f"'extensao_km' deve ser no máximo {EXTENSAO_MAXIMA_KM}: {extensao_km}")
+        n = _numero('n', 10, inteiro=True)
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    ordenar_por = request.args.get('ordenar_por', 'acidentes')
+    
+    try:
+        armazem = armazem_acidentes.garantir_carregado()
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Dados de acidentes indisponíveis: {str(e)}'
+        }), 503
+    
+    try:
+        inicio = time.perf_counter()
+        indice = indice_trechos(armazem, filtros)
+        trechos = indice.criticos(extensao_km, n, ordenar_por, filtros.get('br'))
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Erro ao consultar trechos: {str(e)}'
+        }), 500
+    
+    return jsonify({
+        'success': True,
+        'extensao_km': extensao_km,
+        'ordenar_por': ordenar_por,
+        'filtros': filtros_para_json(filtros),
+        'data': {'trechos': trechos},
+        'tempo_ms': round((time.perf_counter() - inicio) * 1000, 2),
+        'timestamp': datetime.now().isoformat()
+    }), 200
+
+@app.route('/api/acidentes/trechos/contagem', methods=['GET'])
+def trechos_contagem():
+    """
+    Acidentes, mortos e feridos graves entre km_inicio e km_fim de cada BR
+    pedida (br obrigatório). Aceita os mesmos filtros de /api/acidentes/query.
+    Ex.: ?br=277&km_inicio=100&km_fim=120
+    """
+    try:
+        filtros = interpretar_filtros(request.args, extras=('km_inicio', 'km_fim'))
+        if 'br' not in filtros:
+            raise ValueError("Informe ao menos uma 'br'")
+        km_inicio = _numero('km_inicio', zero=True)
+        km_fim = _numero('km_fim', zero=True)
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    
+    try:
+        armazem = armazem_acidentes.garantir_carregado()
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Dados de acidentes indisponíveis: {str(e)}'
+        }), 503
+    
+    try:
+        inicio = time.perf_counter()
+        contagens = indice_trechos(armazem, filtros).contar(filtros['br'], km_inicio, km_fim)
+        return jsonify({
+            'success': True,
+            'filtros': filtros_para_json(filtros),
+            'data': {'trechos': contagens},
+            'tempo_ms': round((time.perf_counter() - inicio) * 1000, 2),
+            'timestamp': datetime.now().isoformat()
+        }), 200
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Erro ao consultar trechos: {str(e)}'
+        }), 500
+
+@app.route('/api/acidentes/cruzamentos', methods=['GET'])
+def list_cruzamentos():
+    """Cruzamentos bidimensionais materializados disponíveis"""
+    try:
+        armazem = armazem_acidentes.garantir_carregado()
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Dados de acidentes indisponíveis: {str(e)}'
+        }), 503
+    
+    return jsonify({
+        'success': True,
+        'data': armazem.cruzamentos.catalogo(),
+        'timestamp': datetime.now().isoformat()
+    }), 200
+
+@app.route('/api/acidentes/cruzamentos/<linhas>/<colunas>', methods=['GET'])
+def get_cruzamento(linhas, colunas):
+    """
+    Recorte de um cruzamento materializado (ex.: causa_acidente/fase_dia).
+    
+    medida: acidentes (padrão) ou mortos. linha/coluna (repetíveis) escolhem
+    valores; top_linhas/top_colunas ficam com os maiores totais. O cruzamento
+    cobre todos os acidentes: filtros de /query não se aplicam aqui.
+    """
+    try:
+        filtros = interpretar_filtros(request.args, extras=('medida', 'linha', 'coluna', 'top_linhas', 'top_colunas'))
+        if filtros:
+            raise ValueError(f"Cruzamentos não aceitam filtros: {', '.join(filtros)}")
+        top_linhas = _numero('top_linhas', inteiro=True)
+        top_colunas = _numero('top_colunas', inteiro=True)
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    
+    try:
+        armazem = armazem_acidentes.garantir_carregado()
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Dados de acidentes indisponíveis: {str(e)}'
+        }), 503
+    
+    cruzamento, transpor = armazem.cruzamentos.obter(linhas, colunas)
+    if cruzamento is None:
+        return jsonify({
+            'success': False,
+            'message': f'Cruzamento {linhas} × {colunas} não materializado'
+        }), 404
+    
+    # "BR-277" e "277" são o mesmo valor, como nos filtros de /query
+    def _valores(chave, dimensao):
+        valores = request.args.getlist(chave)
+        return [v.strip().upper().removeprefix('BR-') for v in valores] if dimensao == 'br' else valores
+    
+    try:
+        inicio = time.perf_counter()
+        dados = cruzamento.fatiar(
+            request.args.get('medida', 'acidentes'),
+            _valores('linha', linhas), _valores('coluna', colunas),
+            top_linhas, top_colunas, transpor
+        )
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    
+    return jsonify({
+        'success': True,
+        'linhas': linhas,
+        'colunas': colunas,
+        'data': dados,
+        'tempo_ms': round((time.perf_counter() - inicio) * 1000, 2),
+        'timestamp': datetime.now().isoformat()
+    }), 200
+
+@app.route('/api/acidentes/exportar', methods=['GET'])
+def exportar_acidentes():
+    """
+    Registros brutos dos acidentes filtrados, em streaming.
+    
+    formato: ndjson (padrão) ou csv; gzip=1 comprime durante o envio;
+    campos=id,data_inversa,... projeta colunas. Aceita os mesmos filtros
+    de /api/acidentes/query. Os blocos são gerados conforme o cliente lê.
+    """
+    formato = request.args.get('formato', 'ndjson')
+    if formato not in FORMATOS_EXPORTACAO:
+        return jsonify({
+            'success': False,
+            'message': f"Formato inválido: {formato}. Aceitos: {', '.join(FORMATOS_EXPORTACAO)}"
+        }), 400
+    compactar = request.args.get('gzip', '0').lower() in ('1', 'true', 'sim')
+    
+    try:
+        armazem = armazem_acidentes.garantir_carregado()
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Dados de acidentes indisponíveis: {str(e)}'
+        }), 503
+    
+    try:
+        filtros = interpretar_filtros(request.args, extras=('formato', 'gzip', 'campos'))
+        campos = interpretar_campos(request.args, armazem.registros.columns)
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    
+    linhas = linhas_da_selecao(armazem, selecionar(armazem, filtros))
+    blocos = exportar(armazem.registros, linhas, campos, formato)
+    nome = f'acidentes.{formato}'
+    mimetype = FORMATOS_EXPORTACAO[formato]
+    if compactar:
+        blocos = comprimir_gzip(blocos)
+        nome += '.gz'
+        mimetype = 'application/gzip'
+    
+    resposta = Response(blocos, mimetype=mimetype)
+    resposta.headers['Content-Disposition'] = f'attachment; filename="{nome}"'
+    resposta.headers['X-Total-Registros'] = str(len(linhas))
+    return resposta
+
+@app.route('/api/acidentes/registros', methods=['GET'])
+def list_registros():
+    """
+    Registros brutos paginados por cursor, na ordem (data, id, pesid).
+    
+    limite: registros por página (padrão 100, máximo 1000); cursor: valor de
+    'proximo_cursor' da página anterior; campos=id,data_inversa,... projeta
+    colunas. Aceita os mesmos filtros de /api/acidentes/query.
+    """
+    try:
+        limite = min(_numero('limite', LIMITE_PAGINA_PADRAO, inteiro=True), LIMITE_PAGINA_MAXIMO)
+        filtros = interpretar_filtros(request.args, extras=('cursor', 'limite', 'campos'))
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    
+    try:
+        armazem = armazem_acidentes.garantir_carregado()
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Dados de acidentes indisponíveis: {str(e)}'
+        }), 503
+    
+    try:
+        campos = interpretar_campos(request.args, armazem.registros.columns)
+        inicio = time.perf_counter()
+        selecao = selecionar(armazem, filtros) if filtros else None
+        mascara = None if selecao is None or selecao.tudo else selecao.mascara
+        posicoes, proximo = armazem.ordem_registros.pagina(request.args.get('cursor'), limite, mascara)
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    
+    try:
+        return jsonify({
+            'success': True,
+            'filtros': filtros_para_json(filtros),
+            'data': registros_para_json(armazem.registros, posicoes, campos),
+            'limite': limite,
+            'proximo_cursor': proximo,
+            'tempo_ms': round((time.perf_counter() - inicio) * 1000, 2),
+            'timestamp': datetime.now().isoformat()
+        }), 200
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Erro ao listar registros: {str(e)}'
+        }), 500
+
+# ==================== PRÉ-CARREGAMENTO ====================
+def carregar_dados():
+    """
+    Carrega os dados servidos pela API antes de atender requisições.
+    
+    No Gunicorn é chamado no processo mestre (hook when_ready), antes do
+    fork, para que os workers compartilhem os dados por copy-on-write.
+    
+    Returns:
+        dict: Resumo do que foi carregado
+    """
+    entrada = acidentes_summary_cache.obter()
+    resumo = {
+        'assets': len(assets.manifesto),
+        'acidentes_summary_bytes': len(entrada['corpo']) if entrada else 0
+    }
+    try:
+        resumo['armazem_acidentes'] = armazem_acidentes.garantir_carregado().resumo()
+    except Exception as e:
+        # Sem o CSV o servidor sobe; /api/acidentes/query responde 503
+        resumo['armazem_acidentes'] = f'indisponível ({e})'
+    return resumo
+
 # ==================== API DE HEALTH CHECK ====================
 @app.route('/api/health', methods=['GET'])
 def health_check():
@@ -179,6 +706,11 @@ def health_check():
         'status': 'online',
         'service': 'CapivaraFlow Backend',
         'version': '1.0.0',
+        'acidentes': {
+            'carregado_em': armazem_acidentes.garantir_carregado().carregado_em
+            if armazem_acidentes.carregado else None,
+            'atualizacao': atualizador_acidentes.estado()
+        },
         'timestamp': datetime.now().isoformat()
     }), 200
 
@@ -210,10 +742,14 @@ if __name__ == '__main__':
     ║     Acesse: http://localhost:{PORT}                    ║
     ╚═══════════════════════════════════════════════════════╝
     """)
+
+    # Com o reloader, só o processo filho (o que atende) vigia os CSVs
+    if not DEBUG or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        atualizador_acidentes.iniciar()
     
     app.run(
         host='0.0.0.0',
         port=PORT,
         debug=DEBUG,
-        use_reloader=True
+        use_reloader=DEBUG
     )
@@ -0,0 +1,207 @@
+"""
+Pipeline de Assets Estáticos para CapivaraFlow
+Gera cópias com hash de conteúdo no nome e variantes gzip/brotli dos arquivos
+de public/. As páginas HTML passam a referenciar os nomes com hash dos
+sub-recursos (CSS, JS, imagens, fontes, JSON), que podem ser cacheados pelo
+navegador como imutáveis. As páginas em si continuam nas URLs de sempre
+(/dashboard.html), revalidadas por ETag: links, favoritos e redirecionamentos
+entre páginas não mudam a cada deploy.
+
+Uso em build (opcional; o app também constrói na inicialização):
+    python backend/assets.py
+"""
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import posixpath
+import re
+import tempfile
+
+from flask import request, send_file
+
+try:
+    import brotli
+except ImportError:  # brotli é opcional: sem ele, apenas gzip
+    brotli = None
+
+DIR_BUILD_PADRAO = os.path.join(os.path.dirname(__file__), '.assets')
+
+CACHE_IMUTAVEL = 'public, max-age=31536000, immutable'
+CACHE_REVALIDAR = 'no-cache'
+
+# Imagens PNG/JPG já são comprimidas; gzip/brotli só em formatos de texto
+EXTENSOES_COMPRIMIVEIS = {'.html', '.css', '.js', '.json', '.svg', '.txt', '.ico', '.xml', '.map'}
+# A variante só é guardada se tiver no máximo 90% do tamanho original
+GANHO_MINIMO = 0.9
+# Ordem de preferência quando o cliente aceita mais de uma
+CODIFICACOES = [('br', '.br'), ('gzip', '.gz')]
+
+
+def _comprimir(conteudo, codificacao):
+    if codificacao == 'br':
+        return brotli.compress(conteudo, quality=11)
+    # mtime=0 deixa a saída determinística (mesmo conteúdo -> mesmos bytes)
+    return gzip.compress(conteudo, compresslevel=9, mtime=0)
+
+
+def _eh_pagina(rel):
+    """Documentos HTML: navegados pelo usuário, não referenciados como sub-recurso"""
+    return posixpath.splitext(rel)[1].lower() in ('.html', '.htm')
+
+
+def _gravar_atomico(caminho, conteudo):
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    fd, caminho_tmp = tempfile.mkstemp(dir=os.path.dirname(caminho), prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(conteudo)
+        os.replace(caminho_tmp, caminho)
+    except Exception:
+        os.unlink(caminho_tmp)
+        raise
+
+
+class PipelineAssets:
+    """Manifesto nome lógico -> arquivo com hash, com variantes comprimidas"""
+
+    def __init__(self, dir_origem, dir_build=DIR_BUILD_PADRAO):
+        self.dir_origem = os.path.abspath(dir_origem)
+        self.dir_build = os.path.abspath(dir_build)
+        self.manifesto = {}
+        self.por_hash = {}
+
+    def construir(self):
+        """
+        Gera (ou reaproveita) as cópias com hash e as variantes comprimidas.
+        Os arquivos de build são nomeados pelo conteúdo, então uma nova
+        execução só grava o que mudou.
+        """
+        arquivos = []
+        for raiz, pastas, nomes in os.walk(self.dir_origem):
+            pastas[:] = sorted(p for p in pastas if not p.startswith('.'))
+            for nome in sorted(nomes):
+                if not nome.startswith('.'):
+                    caminho = os.path.join(raiz, nome)
+                    arquivos.append(os.path.relpath(caminho, self.dir_origem).replace(os.sep, '/'))
+
+        # Sub-recursos primeiro: as páginas precisam dos nomes com hash deles.
+        # Só eles são reescritos; referências a outras páginas ficam como estão
+        paginas = [rel for rel in arquivos if _eh_pagina(rel)]
+        recursos = {rel: self._gravar(rel, self._ler(rel)) for rel in arquivos if rel not in paginas}
+        manifesto = dict(recursos)
+        for rel in paginas:
+            manifesto[rel] = self._gravar(rel, self._reescrever(rel, self._ler(rel), recursos))
+
+        self.manifesto = manifesto
+        # Páginas não têm URL com hash: só são servidas pelo nome lógico
+        self.por_hash = {entrada['arquivo']: entrada for entrada in recursos.values()}
+        _gravar_atomico(
+            os.path.join(self.dir_build, 'manifest.json'),
+            json.dumps(manifesto, indent=2, ensure_ascii=False).encode('utf-8')
+        )
+        self._remover_antigos()
+        return self
+
+    def _remover_antigos(self):
+        """Apaga do build os arquivos (e variantes) que o manifesto novo não usa"""
+        em_uso = {'manifest.json'}
+        for entrada in self.manifesto.values():
+            em_uso.add(entrada['arquivo'])
+            em_uso.update(entrada['variantes'].values())
+        for raiz, pastas, nomes in os.walk(self.dir_build, topdown=False):
+            for nome in nomes:
+                caminho = os.path.join(raiz, nome)
+                rel = os.path.relpath(caminho, self.dir_build).replace(os.sep, '/')
+                if rel not in em_uso:
+                    os.unlink(caminho)
+            if raiz != self.dir_build and not os.listdir(raiz):
+                os.rmdir(raiz)
+
+    def _ler(self, rel):
+        with open(os.path.join(self.dir_origem, rel), 'rb') as f:
+            return f.read()
+
+    def _gravar(self, rel, conteudo):
+        digest = hashlib.blake2b(conteudo, digest_size=6).hexdigest()
+        raiz, extensao = posixpath.splitext(rel)
+        nome = f'{raiz}.{digest}{extensao}'
+        destino = os.path.join(self.dir_build, nome)
+        if not os.path.exists(destino):
+            _gravar_atomico(destino, conteudo)
+
+        variantes = {}
+        if extensao.lower() in EXTENSOES_COMPRIMIVEIS:
+            for codificacao, sufixo in CODIFICACOES:
+                if codificacao == 'br' and brotli is None:
+                    continue
+                if not os.path.exists(destino + sufixo):
+                    comprimido = _comprimir(conteudo, codificacao)
+                    if len(comprimido) > len(conteudo) * GANHO_MINIMO:
+                        continue
+                    _gravar_atomico(destino + sufixo, comprimido)
+                variantes[codificacao] = nome + sufixo
+
+        return {
+            'arquivo': nome,
+            'etag': digest,
+            'mimetype': mimetypes.guess_type(rel)[0] or 'application/octet-stream',
+            'variantes': variantes
+        }
+
+    def _reescrever(self, rel_pagina, conteudo, manifesto):
+        """Troca, na página, as referências aos sub-recursos pelos nomes com hash"""
+        texto = conteudo.decode('utf-8')
+        dir_pagina = posixpath.dirname(rel_pagina)
+
+        for rel, entrada in manifesto.items():
+            # Referência absoluta ("/phrases.json") e relativa à página ("capivara.png")
+            relativo = posixpath.relpath(rel, dir_pagina) if dir_pagina else rel
+            hash_relativo = posixpath.relpath(entrada['arquivo'], dir_pagina) if dir_pagina else entrada['arquivo']
+            fim = r'(?=["\')?#])'
+            texto = re.sub(r'(["\'(])/' + re.escape(rel) + fim, r'\1/' + entrada['arquivo'], texto)
+            texto = re.sub(r'(["\'(])(\./)?' + re.escape(relativo) + fim,
+                           lambda m: m.group(1) + (m.group(2) or '') + hash_relativo, texto)
+
+        return texto.encode('utf-8')
+
+    def servir(self, nome):
+        """
+        Resposta para o caminho pedido, ou None se não for um asset conhecido.
+        Nomes com hash são imutáveis; nomes lógicos (inclusive todas as
+        páginas) são revalidados por ETag.
+        """
+        entrada = self.por_hash.get(nome)
+        imutavel = entrada is not None
+        if entrada is None:
+            entrada = self.manifesto.get(nome)
+        if entrada is None:
+            return None
+
+        arquivo, codificacao = entrada['arquivo'], None
+        for candidata, _ in CODIFICACOES:
+            if candidata in entrada['variantes'] and request.accept_encodings[candidata]:
+                arquivo, codificacao = entrada['variantes'][candidata], candidata
+                break
+
+        resposta = send_file(
+            os.path.join(self.dir_build, arquivo),
+            mimetype=entrada['mimetype'],
+            etag=f"{entrada['etag']}-{codificacao or 'identity'}",
+            conditional=True
+        )
+        if codificacao:
+            resposta.headers['Content-Encoding'] = codificacao
+        if entrada['variantes']:
+            resposta.vary.add('Accept-Encoding')
+        resposta.headers['Cache-Control'] = CACHE_IMUTAVEL if imutavel else CACHE_REVALIDAR
+        return resposta
+
+
+if __name__ == '__main__':
+    pipeline = PipelineAssets(os.path.join(os.path.dirname(__file__), '../public')).construir()
+    for rel, entrada in pipeline.manifesto.items():
+        variantes = ', '.join(entrada['variantes']) or '-'
+        print(f"✓ {rel} -> {entrada['arquivo']} ({variantes})")
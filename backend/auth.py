@@ -2,14 +2,98 @@
 Módulo de Autenticação e Segurança para CapivaraFlow
 """
 
+import hashlib
 import jwt
 import os
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from functools import wraps
 from flask import request, jsonify
 
 SECRET_KEY = os.environ.get('SECRET_KEY', 'capivara-secret-key-2026')
 
+# Quantidade máxima de tokens verificados mantidos em memória
+TOKEN_CACHE_SIZE = int(os.environ.get('TOKEN_CACHE_SIZE', '1024'))
+
+class TokenCache:
+    """
+    Cache LRU dos payloads de tokens já verificados.
+    
+    A chave é um digest do token com a SECRET_KEY atual (trocar a chave
+    invalida tudo) e cada entrada vale só até o 'exp' do próprio token.
+    Tokens revogados ficam registrados até expirarem.
+    """
+    
+    def __init__(self, max_size=TOKEN_CACHE_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._revoked = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def key(token):
+        """Chave do token no cache; calculada uma vez por validação e repassada"""
+        secret = hashlib.sha256(SECRET_KEY.encode('utf-8')).digest()
+        return hashlib.blake2b(token.encode('utf-8'), key=secret, digest_size=16).digest()
+    
+    def get(self, key):
+        """Payload do token (pela chave) se estiver no cache e ainda não expirou"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= time.time():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(entry[0])
+    
+    def put(self, key, payload):
+        """Guarda um payload recém-verificado (tokens sem 'exp' não são guardados)"""
+        exp = payload.get('exp')
+        if not isinstance(exp, (int, float)) or self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (dict(payload), exp)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def revoke(self, key, exp=None):
+        """Remove o token do cache e passa a recusá-lo até 'exp'"""
+        agora = time.time()
+        with self._lock:
+            self._entries.pop(key, None)
+            self._revoked = {k: v for k, v in self._revoked.items() if v > agora}
+            self._revoked[key] = exp if exp is not None else agora + 86400
+    
+    def is_revoked(self, key):
+        with self._lock:
+            exp = self._revoked.get(key)
+        return exp is not None and exp > time.time()
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self):
+        """Tamanho e contadores de acertos/faltas"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 4) if total else 0.0
+            }
+
+token_cache = TokenCache()
+
 def generate_token(username, role='user', expires_in=86400):
     """
     Gera um JWT token para o usuário após login bem-sucedido.
@@ -35,21 +119,42 @@ def verify_token(token):
     """
     Verifica e decodifica um JWT token.
     
+    Tokens já verificados vêm do cache (sem refazer a assinatura HMAC)
+    até o próprio 'exp'; tokens revogados são recusados.
+    
     Args:
         token (str): Token JWT a ser verificado
     
     Returns:
         dict: Payload do token se válido
-        None: Se token for inválido ou expirado
+        None: Se token for inválido, expirado ou revogado
     """
+    key = token_cache.key(token)
+    if token_cache.is_revoked(key):
+        return None
+    payload = token_cache.get(key)
+    if payload is not None:
+        return payload
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=['HS256'])
+        token_cache.put(key, payload)
         return payload
     except jwt.ExpiredSignatureError:
         return None  # Token expirado
     except jwt.InvalidTokenError:
         return None  # Token inválido
 
+def revoke_token(token):
+    """
+    Revoga um token (ex.: logout). Ele deixa de ser aceito mesmo que a
+    assinatura e o 'exp' ainda sejam válidos.
+    """
+    try:
+        exp = jwt.decode(token, SECRET_KEY, algorithms=['HS256'], options={'verify_exp': False}).get('exp')
+    except jwt.InvalidTokenError:
+        return  # Token inválido já é recusado
+    token_cache.revoke(token_cache.key(token), exp)
+
 def token_required(f):
     """
     Decorator para proteger rotas que precisam de autenticação.
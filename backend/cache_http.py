@@ -0,0 +1,98 @@
+"""
+Cache de respostas HTTP para CapivaraFlow
+Mantém em memória respostas JSON já serializadas, recarregadas só quando o
+arquivo de origem muda, com ETag forte e Last-Modified para GETs condicionais
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timezone
+
+from flask import Response, request
+
+
+class RespostaArquivoJSON:
+    """
+    Resposta JSON derivada de um arquivo em disco.
+
+    O arquivo é lido, envelopado e serializado uma única vez; as requisições
+    seguintes só fazem um os.stat() para conferir mtime/tamanho.
+    """
+
+    def __init__(self, caminho, montar_payload):
+        """
+        Args:
+            caminho (str): Arquivo JSON de origem
+            montar_payload (callable): Recebe (dados, modificado_em) e retorna
+                                       o dict que será enviado ao cliente
+        """
+        self.caminho = caminho
+        self.montar_payload = montar_payload
+        self._lock = threading.Lock()
+        self._assinatura = None
+        self._entrada = None
+
+    def _assinatura_atual(self):
+        try:
+            info = os.stat(self.caminho)
+        except FileNotFoundError:
+            return None
+        return (info.st_mtime_ns, info.st_size)
+
+    def obter(self):
+        """
+        Retorna a entrada atual ou None se o arquivo não existir.
+
+        Returns:
+            dict: {'corpo': bytes, 'etag': str, 'modificado_em': datetime}
+        """
+        assinatura = self._assinatura_atual()
+        if assinatura is None:
+            return None
+
+        entrada = self._entrada
+        if assinatura == self._assinatura and entrada is not None:
+            return entrada
+
+        with self._lock:
+            # Outra thread pode ter recarregado enquanto esperávamos o lock
+            if assinatura == self._assinatura and self._entrada is not None:
+                return self._entrada
+
+            try:
+                with open(self.caminho, 'r', encoding='utf-8') as f:
+                    dados = json.load(f)
+            except (OSError, ValueError):
+                # Arquivo sendo regravado: mantém a última versão válida
+                if self._entrada is not None:
+                    return self._entrada
+                raise
+
+            modificado_em = datetime.fromtimestamp(assinatura[0] / 1e9, tz=timezone.utc).replace(microsecond=0)
+            corpo = json.dumps(
+                self.montar_payload(dados, modificado_em),
+                ensure_ascii=False,
+                separators=(',', ':')
+            ).encode('utf-8')
+
+            self._entrada = {
+                'corpo': corpo,
+                'etag': hashlib.blake2b(corpo, digest_size=16).hexdigest(),
+                'modificado_em': modificado_em
+            }
+            self._assinatura = assinatura
+            return self._entrada
+
+
+def resposta_condicional(entrada, cache_control='no-cache'):
+    """
+    Monta a resposta com ETag forte e Last-Modified; devolve 304 quando o
+    cliente já tem a versão atual (If-None-Match / If-Modified-Since).
+    """
+    resposta = Response(entrada['corpo'], mimetype='application/json')
+    resposta.set_etag(entrada['etag'])
+    resposta.last_modified = entrada['modificado_em']
+    resposta.headers['Cache-Control'] = cache_control
+    return resposta.make_conditional(request)
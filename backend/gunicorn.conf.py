@@ -0,0 +1,81 @@
+"""
+Configuração do Gunicorn para CapivaraFlow (modo produção)
+
+    gunicorn -c backend/gunicorn.conf.py app:app
+
+O app é importado uma única vez no processo mestre (preload_app) e os dados
+são carregados antes do fork: os workers compartilham essa memória por
+copy-on-write. Quando os CSVs mudam, o mestre monta o snapshot novo e recicla
+os workers (como um SIGHUP): os novos nascem já com ele e os antigos terminam
+as requisições em andamento. Assim a memória dos dados é uma cópia só, seja
+qual for o WEB_CONCURRENCY (durante a recarga, o mestre tem duas). O servidor de desenvolvimento (python backend/app.py, com
+debug e reloader) continua disponível apenas para uso local.
+
+Variáveis de ambiente:
+    PORT                 Porta HTTP (padrão: 5000)
+    WEB_CONCURRENCY      Número de workers (padrão: 2 × núcleos + 1); cada um
+                         custa seu próprio processo Python, os dados não se
+                         multiplicam
+    GUNICORN_THREADS     Threads por worker (padrão: 4)
+    GUNICORN_TIMEOUT     Timeout de requisição em segundos (padrão: 30)
+    ACIDENTES_CSV        CSVs ou padrões com curingas, separados por ":"
+                         (padrão: modules/relatorio-de-acidentes/acidentes*.csv)
+    ACIDENTES_RECARGA_INTERVALO
+                         Segundos entre verificações dos CSVs de acidentes
+                         (padrão: 30; 0 desliga a recarga automática)
+"""
+
+import gc
+import multiprocessing
+import os
+import signal
+
+# Os módulos do backend usam imports locais (from cache_http import ...)
+chdir = os.path.dirname(os.path.abspath(__file__))
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get('GUNICORN_THREADS', '4'))
+worker_class = 'gthread'
+preload_app = True
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '30'))
+# SIGTERM: para de aceitar conexões e espera as requisições em andamento
+graceful_timeout = 30
+keepalive = 5
+
+accesslog = '-'
+errorlog = '-'
+
+
+def when_ready(server):
+    """Roda no mestre, depois do preload do app e antes de criar os workers"""
+    from app import carregar_dados
+
+    resumo = carregar_dados()
+    server.log.info("Dados pré-carregados no mestre: %s", resumo)
+
+    # Tira os objetos já carregados do alcance do GC: as coletas nos workers
+    # não tocam essas páginas, que continuam compartilhadas após o fork
+    gc.collect()
+    gc.freeze()
+
+    # O atualizador roda só no mestre; os workers recebem o snapshot novo
+    # sendo recriados, antes de o relatório ser regenerado
+    from app import atualizador_acidentes
+
+    atualizador_acidentes.ao_recarregar.insert(0, _reciclar_workers)
+    atualizador_acidentes.iniciar()
+
+
+def _reciclar_workers(snapshot):
+    """Depois da troca no mestre: congela o snapshot novo e recria os workers"""
+    # O anterior referencia a si mesmo; sai do congelamento para ser coletado
+    gc.unfreeze()
+    gc.collect()
+    gc.freeze()
+    os.kill(os.getpid(), signal.SIGHUP)
+
+
+def worker_exit(server, worker):
+    server.log.info("Worker %s encerrado", worker.pid)
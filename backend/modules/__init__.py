@@ -3,16 +3,162 @@ Sistema de Módulos para CapivaraFlow
 Cada módulo é um submódulo plugável do sistema principal
 """
 
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+# Limite (em bytes estimados) do cache compartilhado por todos os módulos
+MODULE_CACHE_MAX_BYTES = int(os.environ.get('MODULE_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+
+def _estimate_size(value):
+    """
+    Tamanho aproximado do valor em memória (soma de sys.getsizeof dos
+    objetos alcançáveis por dicts/listas/tuplas/conjuntos). Nunca é zero.
+    """
+    total = 0
+    seen = set()
+    pending = [value]
+    while pending:
+        obj = pending.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            pending.extend(obj.keys())
+            pending.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            pending.extend(obj)
+    return max(total, 1)
+
+class ModuleCache:
+    """
+    Cache LRU compartilhado pelos módulos, limitado pelo tamanho total.
+
+    Cada entrada guarda a assinatura da fonte (versão + mtime/tamanho do
+    arquivo) do momento em que foi calculada: se a assinatura mudar, ou o
+    TTL vencer, a entrada é descartada na próxima leitura.
+    """
+
+    def __init__(self, max_bytes=MODULE_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries = OrderedDict()  # (module_id, chave) -> (valor, assinatura, expira_em, bytes)
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def _module_stats(self, module_id):
+        return self._stats.setdefault(module_id, {'hits': 0, 'misses': 0, 'evictions': 0})
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry[3]
+
+    def get(self, module_id, key, signature):
+        """
+        Returns:
+            tuple: (True, valor) se houver entrada válida; (False, None) caso contrário
+        """
+        with self._lock:
+            stats = self._module_stats(module_id)
+            entry = self._entries.get((module_id, key))
+            if entry is None or entry[1] != signature or (entry[2] is not None and entry[2] <= time.monotonic()):
+                self._remove((module_id, key))
+                stats['misses'] += 1
+                return False, None
+            self._entries.move_to_end((module_id, key))
+            stats['hits'] += 1
+            return True, entry[0]
+
+    def put(self, module_id, key, signature, value, ttl=None, size=None):
+        """
+        Guarda o valor e descarta os menos usados até caber no limite.
+        size: bytes da entrada, se já conhecidos (senão são estimados)
+        """
+        size = max(int(size), 1) if size else _estimate_size(value)
+        if size > self.max_bytes:
+            return
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._remove((module_id, key))
+            self._entries[(module_id, key)] = (value, signature, expires_at, size)
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._module_stats(oldest[0])['evictions'] += 1
+
+    def invalidate(self, module_id=None):
+        """Descarta as entradas de um módulo (ou todas)"""
+        with self._lock:
+            for key in [k for k in self._entries if module_id is None or k[0] == module_id]:
+                self._remove(key)
+
+    def stats(self, module_id=None):
+        """Acertos, faltas, descartes, entradas e bytes (de um módulo ou de todos)"""
+        with self._lock:
+            ids = [module_id] if module_id is not None else sorted(set(self._stats) | {k[0] for k in self._entries})
+            result = {}
+            for mid in ids:
+                entries = [entry for key, entry in self._entries.items() if key[0] == mid]
+                result[mid] = dict(self._module_stats(mid), entries=len(entries), bytes=sum(e[3] for e in entries))
+            if module_id is not None:
+                return result[module_id]
+            return {'max_bytes': self.max_bytes, 'total_bytes': self.total_bytes, 'modules': result}
+
+module_cache = ModuleCache()
+
+def _cached_method(name, method):
+    """Memoiza um método sem argumentos do módulo no cache compartilhado"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if args or kwargs:
+            return method(self, *args, **kwargs)
+        signature = self.cache_signature()
+        found, value = module_cache.get(self.id, name, signature)
+        if found:
+            return value
+        value = method(self)
+        if self.is_cacheable(value):
+            module_cache.put(self.id, name, signature, value, self.cache_ttl, self.cache_size(value))
+        return value
+
+    wrapper._cached = True
+    return wrapper
+
 class Module:
-    """Classe base para todos os módulos"""
-    
+    """
+    Classe base para todos os módulos.
+
+    get_data() e get_summary() das subclasses são memoizados automaticamente
+    (os valores em cache são compartilhados: não devem ser modificados).
+    """
+
+    # Métodos memoizados em toda subclasse
+    CACHED_METHODS = ('get_data', 'get_summary')
+    # Segundos até a entrada expirar (None = só por mudança na fonte/versão)
+    cache_ttl = None
+    # Trocar a versão invalida o que estiver em cache
+    version = '1'
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name in Module.CACHED_METHODS:
+            method = cls.__dict__.get(name)
+            if method is not None and not getattr(method, '_cached', False):
+                setattr(cls, name, _cached_method(name, method))
+
     def __init__(self, module_id, name, icon, description):
         self.id = module_id
         self.name = name
         self.icon = icon
         self.description = description
         self.is_active = True
-    
+
     def get_info(self):
         """Retorna informações do módulo"""
         return {
@@ -22,11 +168,44 @@ class Module:
             'description': self.description,
             'active': self.is_active
         }
-    
+
     def get_data(self):
         """Retorna dados específicos do módulo - deve ser implementado"""
         raise NotImplementedError("Subclasses devem implementar get_data()")
-    
+
     def process_data(self, data):
         """Processa dados do módulo - pode ser sobrescrito"""
         return data
+
+    # ==================== CACHE ====================
+    def cache_signature(self):
+        """
+        Identifica a versão da fonte dos dados: versão do módulo + mtime e
+        tamanho de self.data_path (se houver). Pode ser sobrescrito.
+        """
+        path = getattr(self, 'data_path', None)
+        try:
+            stat = os.stat(path) if path else None
+        except OSError:
+            stat = None
+        return (self.version, path, stat.st_mtime_ns if stat else None, stat.st_size if stat else None)
+
+    def cache_size(self, value):
+        """
+        Bytes contabilizados para a entrada, estimados a partir do próprio
+        valor: um resumo pequeno não é cobrado como o arquivo inteiro de onde
+        saiu. Pode ser sobrescrito.
+        """
+        return _estimate_size(value)
+
+    def is_cacheable(self, value):
+        """Resultados de erro ({'error': ...}) não entram no cache"""
+        return not (isinstance(value, dict) and 'error' in value)
+
+    def invalidate_cache(self):
+        """Descarta os dados do módulo em cache"""
+        module_cache.invalidate(self.id)
+
+    def cache_stats(self):
+        """Acertos, faltas e ocupação do cache deste módulo"""
+        return module_cache.stats(self.id)
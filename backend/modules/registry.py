@@ -0,0 +1,169 @@
+"""
+Registro de módulos do CapivaraFlow
+A lista de módulos vem de modules.json e é lida sem importar nenhum módulo:
+a inicialização custa o mesmo com 3 ou 50 módulos. O código de um módulo (e
+suas dependências pesadas) só é importado no primeiro get_instance(), e a
+instância é única por processo. Alterações no modules.json são recarregadas
+sem reiniciar o servidor.
+
+Cada entrada do modules.json tem id, name, icon, description, active e,
+opcionalmente, url e entrypoint ("arquivo:Classe" dentro de backend/modules/).
+Sem entrypoint, vale a convenção id "meu-modulo" -> meu_modulo.py, com a
+classe indicada em MODULE_CLASS ou a subclasse de Module definida no arquivo.
+"""
+
+import importlib
+import json
+import os
+import threading
+import time
+
+from . import Module
+
+MODULES_DIR = os.path.dirname(os.path.abspath(__file__))
+CONFIG_PATH = os.path.join(MODULES_DIR, 'modules.json')
+# Intervalo mínimo (segundos) entre verificações do modules.json no disco
+RELOAD_INTERVAL = float(os.environ.get('MODULES_RELOAD_INTERVAL', '1.0'))
+
+# Campos internos do registro que não vão para a API
+_PRIVATE_FIELDS = ('entrypoint',)
+
+class ModuleRegistry:
+    """Índice id -> módulo, com instâncias criadas sob demanda"""
+
+    def __init__(self, config_path=CONFIG_PATH, reload_interval=RELOAD_INTERVAL):
+        self.config_path = config_path
+        self.reload_interval = reload_interval
+        self._entries = []        # entradas na ordem do arquivo
+        self._index = {}          # id -> entrada
+        self._entrypoints = {}    # id -> (arquivo, classe | None) ou None
+        self._instances = {}      # id -> instância (singleton)
+        self._signature = None
+        self._checked_at = None
+        self._lock = threading.RLock()
+
+    # ==================== CONFIGURAÇÃO ====================
+    def _config_signature(self):
+        try:
+            stat = os.stat(self.config_path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _refresh(self):
+        """Relê o modules.json se ele mudou (no máximo uma verificação por intervalo)"""
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.reload_interval:
+            return
+        with self._lock:
+            self._checked_at = now
+            signature = self._config_signature()
+            if signature == self._signature:
+                return
+            try:
+                with open(self.config_path, 'r', encoding='utf-8') as f:
+                    entries = self._validate(json.load(f))
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                # Arquivo sendo editado ou inválido: mantém a última configuração boa
+                print(f"⚠️  modules.json não carregado ({e}); mantendo a configuração anterior")
+                return
+            self._load(entries)
+            self._signature = signature
+
+    @staticmethod
+    def _validate(entries):
+        """Lista de objetos, cada um com 'id' texto não vazio e único"""
+        if not isinstance(entries, list):
+            raise TypeError('modules.json deve ser uma lista de módulos')
+        ids = set()
+        for position, entry in enumerate(entries):
+            if not isinstance(entry, dict):
+                raise TypeError(f'entrada {position} não é um objeto')
+            module_id = entry.get('id')
+            if not isinstance(module_id, str) or not module_id:
+                raise KeyError(f"entrada {position} sem 'id'")
+            if module_id in ids:
+                raise ValueError(f"id repetido: {module_id}")
+            ids.add(module_id)
+            if not isinstance(entry.get('entrypoint') or '', str):
+                raise TypeError(f"'entrypoint' de {module_id} deve ser texto")
+        return entries
+
+    def _load(self, entries):
+        """Reconstrói o índice; instâncias cujo código mudou são descartadas"""
+        index = {entry['id']: entry for entry in entries}
+        entrypoints = {module_id: self._resolve_entrypoint(entry) for module_id, entry in index.items()}
+        for module_id in list(self._instances):
+            if entrypoints.get(module_id) != self._entrypoints.get(module_id):
+                del self._instances[module_id]
+        self._entries = list(index.values())
+        self._index = index
+        self._entrypoints = entrypoints
+
+    def _resolve_entrypoint(self, entry):
+        """(arquivo, classe) do módulo sem importá-lo; None se não houver código"""
+        if entry.get('entrypoint'):
+            filename, _, class_name = entry['entrypoint'].partition(':')
+            return filename, class_name or None
+        filename = entry['id'].replace('-', '_')
+        if os.path.exists(os.path.join(MODULES_DIR, filename + '.py')):
+            return filename, None
+        return None
+
+    # ==================== CONSULTA ====================
+    def list(self):
+        """Entradas de todos os módulos, na ordem do modules.json"""
+        self._refresh()
+        return [self._public(entry) for entry in self._entries]
+
+    def get(self, module_id):
+        """Entrada do módulo (busca no índice) ou None"""
+        self._refresh()
+        entry = self._index.get(module_id)
+        return self._public(entry) if entry is not None else None
+
+    def get_instance(self, module_id):
+        """
+        Instância única do módulo; o import acontece aqui, no primeiro uso.
+
+        Returns:
+            Module | None: None se o módulo não existir ou não tiver código
+        """
+        self._refresh()
+        instance = self._instances.get(module_id)
+        if instance is not None:
+            return instance
+        with self._lock:
+            if module_id not in self._instances:
+                entrypoint = self._entrypoints.get(module_id)
+                if entrypoint is None:
+                    return None
+                self._instances[module_id] = self._load_class(*entrypoint)()
+            return self._instances[module_id]
+
+    def loaded(self):
+        """Ids dos módulos já instanciados neste processo"""
+        return sorted(self._instances)
+
+    def _load_class(self, filename, class_name=None):
+        module = importlib.import_module(f'.{filename}', __package__)
+        if class_name:
+            return getattr(module, class_name)
+        if hasattr(module, 'MODULE_CLASS'):
+            return module.MODULE_CLASS
+        classes = [obj for obj in vars(module).values()
+                   if isinstance(obj, type) and issubclass(obj, Module) and obj is not Module
+                   and obj.__module__ == module.__name__]
+        if len(classes) != 1:
+            raise ImportError(f"{filename}.py deve definir MODULE_CLASS ou uma única subclasse de Module")
+        return classes[0]
+
+    @staticmethod
+    def _public(entry):
+        return {key: value for key, value in entry.items() if key not in _PRIVATE_FIELDS}
+
+registry = ModuleRegistry()
+
+def get_module_instance(module_id):
+    """Atalho para registry.get_instance()"""
+    return registry.get_instance(module_id)
@@ -17,10 +17,20 @@ class RelatorioAcidentesModule(Module):
             icon='📈',
             description='Análise detalhada de acidentes de trânsito 2025'
         )
-        self.data_path = None
-        self._load_data_path()
+        self._data_path = None
     
-    def _load_data_path(self):
+    @property
+    def data_path(self):
+        """
+        Caminho do arquivo de dados, procurado a cada acesso enquanto não
+        existir: se o JSON for gerado depois do primeiro uso, a instância
+        (única por processo) passa a servi-lo sem reiniciar o servidor.
+        """
+        if self._data_path is None or not os.path.exists(self._data_path):
+            self._data_path = self._find_data_path()
+        return self._data_path
+    
+    def _find_data_path(self):
         """Encontra o caminho do arquivo de dados"""
         # Procura pelos dados estruturados
         possible_paths = [
@@ -36,14 +46,15 @@ class RelatorioAcidentesModule(Module):
         
         for path in possible_paths:
             if os.path.exists(path):
-                self.data_path = path
-                return
+                return path
+        return None
     
     def get_data(self):
         """Retorna os dados de acidentes"""
-        if self.data_path and os.path.exists(self.data_path):
+        data_path = self.data_path
+        if data_path:
             try:
-                with open(self.data_path, 'r', encoding='utf-8') as f:
+                with open(data_path, 'r', encoding='utf-8') as f:
                     data = json.load(f)
                     return self.process_data(data)
             except Exception as e:
@@ -53,7 +64,11 @@ class RelatorioAcidentesModule(Module):
             return self._get_mock_data()
     
     def get_summary(self):
-        """Retorna um sumário dos dados de acidentes"""
+        """
+        Retorna um sumário dos dados de acidentes.
+        get_data() e o próprio sumário vêm do cache do Module: o JSON só é
+        lido de novo quando o arquivo muda.
+        """
         try:
             data = self.get_data()
             if isinstance(data, list):
@@ -105,12 +120,6 @@ class RelatorioAcidentesModule(Module):
 
 # Factory para criar instâncias de módulos
 def create_module(module_id):
-    """Cria uma instância do módulo solicitado"""
-    modules = {
-        'relatorio-acidentes': RelatorioAcidentesModule,
-    }
-    
-    module_class = modules.get(module_id)
-    if module_class:
-        return module_class()
-    return None
+    """Instância do módulo solicitado (única por processo, via registro)"""
+    from .registry import get_module_instance
+    return get_module_instance(module_id)
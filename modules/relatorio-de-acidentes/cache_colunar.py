@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+================================================================================
+💾 CACHE COLUNAR EM DISCO PARA CSVs DE ACIDENTES
+================================================================================
+Guarda o DataFrame já interpretado em arquivos .npy (uma coluna por arquivo),
+indexado pelo hash do conteúdo do CSV e pelas opções de leitura. Em um acerto
+de cache as colunas são abertas com memory-map e o parsing do CSV é pulado.
+Autor: Estratégica Engenharia
+================================================================================
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Incrementar sempre que o formato gravado em disco mudar
+VERSAO_CACHE = 2
+
+DIR_CACHE_PADRAO = '.cache_colunar'
+TAMANHO_BLOCO_HASH = 1024 * 1024
+
+
+def hash_arquivo(caminho):
+    """Calcula o hash do conteúdo do arquivo lendo em blocos"""
+    h = hashlib.blake2b(digest_size=16)
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(TAMANHO_BLOCO_HASH), b''):
+            h.update(bloco)
+    return h.hexdigest()
+
+
+class CacheColunar:
+    """Cache persistente de DataFrames em formato colunar (.npy + meta.json)"""
+
+    def __init__(self, dir_cache):
+        self.dir_cache = Path(dir_cache)
+
+    @classmethod
+    def para_csv(cls, caminho_csv):
+        """Cria o cache padrão ao lado do CSV de origem"""
+        return cls(Path(caminho_csv).resolve().parent / DIR_CACHE_PADRAO)
+
+    def chave(self, caminho_csv, opcoes):
+        """Gera a chave a partir do conteúdo do CSV e das opções de leitura"""
+        assinatura = json.dumps(
+            {'conteudo': hash_arquivo(caminho_csv), 'opcoes': opcoes, 'versao': VERSAO_CACHE},
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.blake2b(assinatura.encode('utf-8'), digest_size=16).hexdigest()
+
+    def carregar(self, chave):
+        """Retorna o DataFrame em cache ou None se não houver entrada válida"""
+        pasta = self.dir_cache / chave
+        caminho_meta = pasta / 'meta.json'
+        if not caminho_meta.exists():
+            return None
+
+        try:
+            with open(caminho_meta, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+
+            # mmap_mode='c': páginas lidas do disco sob demanda e graváveis (a
+            # escrita fica só na memória do processo), sem copiar na carga
+            colunas = {}
+            for i, col in enumerate(meta['colunas']):
+                valores = np.load(pasta / f'{i}.npy', mmap_mode='c')
+                if col['tipo'] == 'categoria':
+                    categorias = pd.Index(col['categorias'], dtype=col.get('dtype_categorias'))
+                    colunas[col['nome']] = pd.Series(pd.Categorical.from_codes(valores, categories=categorias))
+                elif col['tipo'] == 'nulo':
+                    # Valores e máscara mapeados entram direto no array mascarado (sem cópia)
+                    mascara = np.load(pasta / f'{i}.mask.npy', mmap_mode='c')
+                    tipo = pd.api.types.pandas_dtype(col['dtype']).construct_array_type()
+                    colunas[col['nome']] = pd.Series(tipo(valores, mascara, copy=False), copy=False)
+                elif col['tipo'] == 'codificada':
+                    categorias = pd.Index(col['categorias'], dtype=object)
+                    valores = pd.Categorical.from_codes(valores, categories=categorias)
+                    colunas[col['nome']] = pd.Series(valores).astype(col['dtype'])
+                else:
+                    colunas[col['nome']] = pd.Series(valores, copy=False)
+
+            # copy=False: sem ele o pandas copia os arrays mapeados para a memória
+            return pd.DataFrame(colunas, copy=False)
+        except Exception as e:
+            print(f"⚠️  Cache colunar inválido, ignorando: {e}")
+            return None
+
+    def salvar(self, chave, df, origem=None):
+        """Grava o DataFrame no cache de forma atômica"""
+        self.dir_cache.mkdir(parents=True, exist_ok=True)
+        pasta_tmp = Path(tempfile.mkdtemp(dir=self.dir_cache, prefix='.tmp-'))
+
+        try:
+            colunas = []
+            for i, nome in enumerate(df.columns):
+                serie = df[nome]
+                meta_col = {'nome': nome, 'dtype': str(serie.dtype), 'tipo': 'numpy'}
+
+                if isinstance(serie.dtype, pd.CategoricalDtype):
+                    # Categorias já são códigos + dicionário: grava como estão
+                    np.save(pasta_tmp / f'{i}.npy', serie.cat.codes.to_numpy())
+                    meta_col['tipo'] = 'categoria'
+                    meta_col['categorias'] = np.asarray(serie.cat.categories, dtype=object).tolist()
+                    meta_col['dtype_categorias'] = str(serie.cat.categories.dtype)
+                elif pd.api.types.is_extension_array_dtype(serie.dtype) and pd.api.types.is_numeric_dtype(serie.dtype):
+                    # Inteiros nulos (Int32, Int16, ...): valores + máscara
+                    np.save(pasta_tmp / f'{i}.npy', serie.to_numpy(dtype=serie.dtype.numpy_dtype, na_value=0))
+                    np.save(pasta_tmp / f'{i}.mask.npy', serie.isna().to_numpy())
+                    meta_col['tipo'] = 'nulo'
+                elif isinstance(serie.dtype, np.dtype) and serie.dtype.kind in 'biuf':
+                    np.save(pasta_tmp / f'{i}.npy', serie.to_numpy())
+                else:
+                    # Texto e demais tipos viram códigos inteiros + dicionário
+                    codigos, categorias = pd.factorize(serie, use_na_sentinel=True)
+                    np.save(pasta_tmp / f'{i}.npy', codigos.astype(np.int32))
+                    meta_col['tipo'] = 'codificada'
+                    meta_col['categorias'] = np.asarray(categorias, dtype=object).tolist()
+
+                colunas.append(meta_col)
+
+            meta = {'versao': VERSAO_CACHE, 'origem': str(origem) if origem else None, 'colunas': colunas}
+            with open(pasta_tmp / 'meta.json', 'w', encoding='utf-8') as f:
+                json.dump(meta, f, ensure_ascii=False)
+
+            destino = self.dir_cache / chave
+            if destino.exists():
+                shutil.rmtree(destino)
+            os.replace(pasta_tmp, destino)
+        except Exception:
+            shutil.rmtree(pasta_tmp, ignore_errors=True)
+            raise
+
+        if origem:
+            self._remover_obsoletas(chave, str(origem))
+
+    def _remover_obsoletas(self, chave_atual, origem):
+        """Remove entradas antigas geradas a partir do mesmo arquivo de origem"""
+        for pasta in self.dir_cache.iterdir():
+            if not pasta.is_dir() or pasta.name == chave_atual or pasta.name.startswith('.'):
+                continue
+            try:
+                with open(pasta / 'meta.json', 'r', encoding='utf-8') as f:
+                    if json.load(f).get('origem') == origem:
+                        shutil.rmtree(pasta, ignore_errors=True)
+            except (OSError, ValueError):
+                continue
@@ -0,0 +1,290 @@
+        // Estado global dos filtros
+        const filtros = {
+            dataInicio: '2025-01-01',
+            dataFim: '2025-12-31',
+            estrada: 'Todas'
+        };
+
+        // Função para preencher os KPIs
+        function preencherKPIs() {
+            const kpis = dashboardData.kpis;
+            
+            const kpiCards = [
+                {
+                    label: 'Total de Acidentes',
+                    valor: kpis.total_acidentes,
+                    icone: '🚨',
+                    classe: 'danger',
+                    mudanca: '12.5%'
+                },
+                {
+                    label: 'Óbitos',
+                    valor: kpis.total_obitos,
+                    icone: '⚡',
+                    classe: 'danger',
+                    mudanca: '8.5%'
+                },
+                {
+                    label: 'Feridos Graves',
+                    valor: kpis.feridos_graves,
+                    icone: '🏥',
+                    classe: 'warning',
+                    mudanca: '5.2%'
+                },
+                {
+                    label: 'Taxa de Severidade',
+                    valor: kpis.taxa_severidade + '%',
+                    icone: '📈',
+                    classe: 'success',
+                    mudanca: 'Estável'
+                }
+            ];
+
+            const container = document.getElementById('kpiContainer');
+            container.innerHTML = kpiCards.map(card => `
+                <div class="kpi-card ${card.classe}">
+                    <div class="kpi-header">
+                        <div>
+                            <div class="kpi-label">${card.label}</div>
+                            <div class="kpi-value">${card.valor}</div>
+                            <div class="kpi-change ${card.classe === 'success' ? '' : 'negative'}">
+                                ${card.mudanca}
+                            </div>
+                        </div>
+                        <div class="kpi-icon">${card.icone}</div>
+                    </div>
+                </div>
+            `).join('');
+
+            // Atualizar header
+            document.getElementById('totalAcidentesHeader').textContent = kpis.total_acidentes;
+            document.getElementById('totalObitosHeader').textContent = kpis.total_obitos;
+        }
+
+        // Função para preencher tipos de acidentes
+        function preencherTiposAcidentes() {
+            const tipos = dashboardData.tipos_acidentes;
+            const maxValor = Math.max(...tipos.map(t => t.quantidade));
+
+            const container = document.getElementById('tiposAcidentesChart');
+            container.innerHTML = tipos.map(tipo => {
+                const percentual = (tipo.quantidade / maxValor) * 100;
+                return `
+                    <div class="bar-item">
+                        <div class="bar-label">${tipo.nome}</div>
+                        <div class="bar-wrapper">
+                            <div class="bar" style="width: ${percentual}%">
+                                <span class="bar-value">${tipo.quantidade}</span>
+                            </div>
+                        </div>
+                    </div>
+                `;
+            }).join('');
+        }
+
+        // Função para preencher causas principais
+        function preencherCausasPrincipais() {
+            const causas = dashboardData.causas_principais;
+            const maxValor = Math.max(...causas.map(c => c.quantidade));
+
+            const container = document.getElementById('causasPrincipaisChart');
+            container.innerHTML = causas.map(causa => {
+                const percentual = (causa.quantidade / maxValor) * 100;
+                const classe = percentual > 80 ? 'green' : '';
+                return `
+                    <div class="bar-item">
+                        <div class="bar-label">${causa.nome}</div>
+                        <div class="bar-wrapper">
+                            <div class="bar ${classe}" style="width: ${percentual}%">
+                                <span class="bar-value">${causa.quantidade}</span>
+                            </div>
+                        </div>
+                    </div>
+                `;
+            }).join('');
+        }
+
+        // Função para preencher fase do dia
+        function preencherFaseDia() {
+            const fases = dashboardData.fase_dia;
+            const cores = ['#FF2229', '#01B27C', '#0CB097', '#00923D'];
+
+            let circulos = '';
+            let legenda = '';
+            let offset = 0;
+
+            fases.forEach((fase, index) => {
+                const percentual = fase.percentual;
+                const circumferencia = 282.7;
+                const dasharray = (percentual / 100) * circumferencia;
+
+                circulos += `<circle cx="50" cy="50" r="45" fill="none" stroke="${cores[index]}" stroke-width="15" stroke-dasharray="${dasharray} ${circumferencia}" stroke-dashoffset="-${offset}"></circle>`;
+                offset += dasharray;
+
+                legenda += `
+                    <div class="legend-item">
+                        <div class="legend-color" style="background: ${cores[index]};"></div>
+                        <span>${fase.nome}</span>
+                        <span class="legend-value">${fase.quantidade}</span>
+                    </div>
+                `;
+            });
+
+            const container = document.getElementById('faseDiaChart');
+            container.innerHTML = `
+                <svg class="donut-svg" viewBox="0 0 100 100">
+                    ${circulos}
+                    <text x="50" y="55" text-anchor="middle" font-size="16" font-weight="bold" fill="#0F1419">${fases[0].percentual}%</text>
+                </svg>
+                <div class="donut-legend">
+                    ${legenda}
+                </div>
+            `;
+        }
+
+        // Função para preencher condições meteorológicas
+        function preencherCondicoesMet() {
+            const condicoes = dashboardData.condicoes_meteorologicas;
+            const maxValor = Math.max(...condicoes.map(c => c.quantidade));
+
+            const container = document.getElementById('condicoesMetChart');
+            container.innerHTML = condicoes.map(condicao => {
+                const percentual = (condicao.quantidade / maxValor) * 100;
+                const classe = percentual > 70 ? 'green' : '';
+                return `
+                    <div class="bar-item">
+                        <div class="bar-label">${condicao.nome}</div>
+                        <div class="bar-wrapper">
+                            <div class="bar ${classe}" style="width: ${percentual}%">
+                                <span class="bar-value">${condicao.quantidade}</span>
+                            </div>
+                        </div>
+                    </div>
+                `;
+            }).join('');
+        }
+
+        // Função para preencher tabela de estradas
+        function preencherEstradas() {
+            const estradas = dashboardData.estradas_criticas;
+            const tbody = document.getElementById('estradas-tbody');
+
+            tbody.innerHTML = estradas.map(estrada => {
+                let status = 'NORMAL';
+                let statusClass = 'status-success';
+                
+                if (estrada.acidentes > 800) {
+                    status = 'CRÍTICO';
+                    statusClass = 'status-critical';
+                } else if (estrada.acidentes > 400) {
+                    status = 'ALERTA';
+                    statusClass = 'status-warning';
+                }
+
+                return `
+                    <tr>
+                        <td><strong>${estrada.nome}</strong></td>
+                        <td>${estrada.acidentes}</td>
+                        <td>${estrada.obitos}</td>
+                        <td>${estrada.feridos}</td>
+                        <td><span class="status-badge ${statusClass}">${status}</span></td>
+                    </tr>
+                `;
+            }).join('');
+
+            // Preencher select de estradas
+            const selectEstradas = document.getElementById('estradaSelect');
+            const options = estradas.map(e => `<option>${e.nome}</option>`).join('');
+            selectEstradas.innerHTML = '<option>Todas</option>' + options;
+        }
+
+        // Função para preencher tabela de municípios
+        function preencherMunicipios() {
+            const municipios = dashboardData.municipios;
+            const tbody = document.getElementById('municipios-tbody');
+
+            tbody.innerHTML = municipios.map((municipio, index) => {
+                let tendencia = 'NORMAL';
+                let tendenciaClass = 'status-success';
+                
+                if (municipio.acidentes > 150) {
+                    tendencia = 'ALERTA';
+                    tendenciaClass = 'status-warning';
+                }
+
+                return `
+                    <tr>
+                        <td><strong>${index + 1}º</strong></td>
+                        <td>${municipio.nome}</td>
+                        <td>${municipio.acidentes}</td>
+                        <td>${municipio.percentual}%</td>
+                        <td>${municipio.obitos}</td>
+                        <td><span class="status-badge ${tendenciaClass}">${tendencia}</span></td>
+                    </tr>
+                `;
+            }).join('');
+        }
+
+        // Inicializar dashboard
+        function inicializarDashboard() {
+            preencherKPIs();
+            preencherTiposAcidentes();
+            preencherCausasPrincipais();
+            preencherFaseDia();
+            preencherCondicoesMet();
+            preencherEstradas();
+            preencherMunicipios();
+            console.log('✓ Dashboard inicializado com sucesso');
+        }
+
+        function aplicarFiltros() {
+            const dataInicio = document.getElementById('dataInicio').value;
+            const dataFim = document.getElementById('dataFim').value;
+            const estrada = document.getElementById('estradaSelect').value;
+
+            if (!dataInicio || !dataFim) {
+                alert('⚠️ Por favor, preencha ambas as datas.');
+                return;
+            }
+
+            if (new Date(dataInicio) > new Date(dataFim)) {
+                alert('⚠️ Data inicial não pode ser maior que data final.');
+                return;
+            }
+
+            filtros.dataInicio = dataInicio;
+            filtros.dataFim = dataFim;
+            filtros.estrada = estrada;
+
+            alert(`✓ Filtros aplicados com sucesso!\n\nPeríodo: ${dataInicio} a ${dataFim}\nEstrada: ${estrada}`);
+        }
+
+        function showSection(section) {
+            document.querySelectorAll('.sidebar-menu a').forEach(a => a.classList.remove('active'));
+            event.target.closest('a').classList.add('active');
+            console.log('Navegando para:', section);
+        }
+
+        function exportarDados() {
+            const csv = `Dashboard Estratégico - Acidentes de Trânsito 2025
+Período: ${filtros.dataInicio} a ${filtros.dataFim}
+Estrada: ${filtros.estrada}
+Exportado em: ${new Date().toLocaleString('pt-BR')}
+
+Total de Acidentes: ${dashboardData.kpis.total_acidentes}
+Óbitos: ${dashboardData.kpis.total_obitos}
+Feridos Graves: ${dashboardData.kpis.feridos_graves}
+Taxa de Severidade: ${dashboardData.kpis.taxa_severidade}%
+`;
+
+            const blob = new Blob([csv], { type: 'text/csv;charset=utf-8;' });
+            const link = document.createElement('a');
+            link.href = URL.createObjectURL(blob);
+            link.download = `dashboard_acidentes_${new Date().toISOString().split('T')[0]}.csv`;
+            link.click();
+
+            alert('✓ Arquivo exportado com sucesso!');
+        }
+
+        // Inicializar ao carregar
+        document.addEventListener('DOMContentLoaded', inicializarDashboard);
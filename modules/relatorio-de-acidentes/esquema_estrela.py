@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+================================================================================
+⭐ ESQUEMA ESTRELA: ACIDENTES / PESSOAS / VEÍCULOS / CAUSAS / TIPOS
+================================================================================
+O CSV da PRF tem uma linha por acidente × pessoa × veículo × causa × tipo (o
+mesmo id se repete para cada causa). Este módulo separa os dados em tabelas
+compactas com chaves inteiras, para que cada entidade seja contada uma vez:
+
+    acidentes  (fato)   1 linha por id, com os contadores das pessoas somados
+    pessoas    (dim)    1 linha por pesid
+    veiculos   (dim)    1 linha por id_veiculo
+    causas     (ponte)  1 linha por (id, causa_acidente)
+    tipos      (ponte)  1 linha por (id, tipo_acidente)
+
+Autor: Estratégica Engenharia
+================================================================================
+"""
+
+import pandas as pd
+
+COLUNAS_ACIDENTE = [
+    'data_inversa', 'dia_semana', 'horario', 'uf', 'br', 'km', 'municipio',
+    'classificacao_acidente', 'fase_dia', 'sentido_via', 'condicao_metereologica',
+    'tipo_pista', 'tracado_via', 'uso_solo', 'latitude', 'longitude',
+    'regional', 'delegacia', 'uop'
+]
+COLUNAS_PESSOA = [
+    'id', 'id_veiculo', 'tipo_envolvido', 'estado_fisico', 'idade', 'sexo',
+    'ilesos', 'feridos_leves', 'feridos_graves', 'mortos'
+]
+COLUNAS_VEICULO = ['id', 'tipo_veiculo', 'marca', 'ano_fabricacao_veiculo']
+COLUNAS_CAUSA = ['id', 'causa_principal', 'causa_acidente']
+COLUNAS_TIPO = ['id', 'ordem_tipo_acidente', 'tipo_acidente']
+
+# Contadores por pessoa, somados no fato de acidentes
+CONTADORES_PESSOA = ['ilesos', 'feridos_leves', 'feridos_graves', 'mortos']
+
+
+class EsquemaAcidentes:
+    """Tabelas fato/dimensão/ponte construídas a partir do CSV bruto"""
+
+    TABELAS = ['acidentes', 'pessoas', 'veiculos', 'causas', 'tipos']
+
+    def __init__(self, acidentes, pessoas, veiculos, causas, tipos, total_registros):
+        self.acidentes = acidentes
+        self.pessoas = pessoas
+        self.veiculos = veiculos
+        self.causas = causas
+        self.tipos = tipos
+        self.total_registros = total_registros
+
+    def tabela(self, nome):
+        """Retorna a tabela pelo nome"""
+        return getattr(self, nome)
+
+    def resumo(self):
+        """Quantidade de linhas por tabela"""
+        return {nome: len(self.tabela(nome)) for nome in self.TABELAS}
+
+
+def _selecionar(df, colunas):
+    return df[[col for col in colunas if col in df.columns]]
+
+
+def _chave_inteira(serie):
+    # Mesmo tipo do ESQUEMA_PRF do leitor (ids da PRF cabem em 32 bits)
+    return pd.to_numeric(serie, errors='coerce').astype('Int32')
+
+
+def _compactar(df):
+    """Converte colunas de texto em categorias (códigos inteiros + dicionário)"""
+    for col in df.columns:
+        if not pd.api.types.is_numeric_dtype(df[col]) and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+    return df
+
+
+def construir_esquema(df):
+    """
+    Normaliza o DataFrame bruto em um EsquemaAcidentes.
+
+    Args:
+        df (DataFrame): Linhas no layout original da PRF
+
+    Returns:
+        EsquemaAcidentes
+    """
+    if 'id' not in df.columns:
+        raise ValueError("Coluna 'id' não encontrada: impossível identificar os acidentes")
+
+    total_registros = len(df)
+    df = df.assign(id=_chave_inteira(df['id'])).dropna(subset=['id'])
+    for chave in ('pesid', 'id_veiculo'):
+        if chave in df.columns:
+            df[chave] = _chave_inteira(df[chave])
+
+    # Pessoas: uma linha por pesid
+    if 'pesid' in df.columns:
+        pessoas = df.dropna(subset=['pesid']).drop_duplicates('pesid')
+        pessoas = _selecionar(pessoas, ['pesid'] + COLUNAS_PESSOA).reset_index(drop=True)
+    else:
+        pessoas = pd.DataFrame(columns=['pesid', 'id'])
+
+    # Veículos: uma linha por id_veiculo
+    if 'id_veiculo' in df.columns:
+        veiculos = df.dropna(subset=['id_veiculo']).drop_duplicates('id_veiculo')
+        veiculos = _selecionar(veiculos, ['id_veiculo'] + COLUNAS_VEICULO).reset_index(drop=True)
+    else:
+        veiculos = pd.DataFrame(columns=['id_veiculo', 'id'])
+
+    # Pontes acidente × causa e acidente × tipo
+    causas = pd.DataFrame(columns=COLUNAS_CAUSA)
+    if 'causa_acidente' in df.columns:
+        causas = _selecionar(
+            df.dropna(subset=['causa_acidente']).drop_duplicates(['id', 'causa_acidente']),
+            COLUNAS_CAUSA
+        ).reset_index(drop=True)
+
+    tipos = pd.DataFrame(columns=COLUNAS_TIPO)
+    if 'tipo_acidente' in df.columns:
+        tipos = _selecionar(
+            df.dropna(subset=['tipo_acidente']).drop_duplicates(['id', 'tipo_acidente']),
+            COLUNAS_TIPO
+        ).reset_index(drop=True)
+
+    # Fato: uma linha por acidente, com os contadores de pessoas somados
+    acidentes = _selecionar(df.drop_duplicates('id'), ['id'] + COLUNAS_ACIDENTE).reset_index(drop=True)
+    contadores = [col for col in CONTADORES_PESSOA if col in pessoas.columns]
+    if contadores:
+        por_acidente = pessoas.groupby('id')[contadores].sum()
+        acidentes = acidentes.join(por_acidente, on='id')
+        acidentes[contadores] = acidentes[contadores].fillna(0)
+
+    return EsquemaAcidentes(
+        acidentes=_compactar(acidentes),
+        pessoas=_compactar(pessoas),
+        veiculos=_compactar(veiculos),
+        causas=_compactar(causas),
+        tipos=_compactar(tipos),
+        total_registros=total_registros
+    )
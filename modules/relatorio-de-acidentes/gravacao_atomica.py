@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+================================================================================
+🔒 GRAVAÇÃO ATÔMICA DOS ARQUIVOS GERADOS
+================================================================================
+Os arquivos lidos pelo backend (dados_estruturados.json, relatorio_acidentes.json,
+index.html...) são gravados em um temporário na mesma pasta e trocados com
+os.replace: quem lê no meio da geração vê a versão anterior inteira, nunca um
+arquivo pela metade.
+Autor: Estratégica Engenharia
+================================================================================
+"""
+
+import contextlib
+import os
+import tempfile
+
+
+@contextlib.contextmanager
+def gravar_atomico(caminho, modo='w', encoding='utf-8', **kwargs):
+    """
+    Abre um temporário ao lado de `caminho`; ao sair sem erro ele substitui o
+    destino de uma vez. Em caso de erro o destino fica intocado.
+
+    Uso:
+        with gravar_atomico('dados_estruturados.json') as f:
+            json.dump(dados, f)
+    """
+    caminho = os.fspath(caminho)
+    pasta = os.path.dirname(os.path.abspath(caminho))
+    descritor, caminho_tmp = tempfile.mkstemp(prefix=f'.{os.path.basename(caminho)}.', suffix='.tmp', dir=pasta)
+    try:
+        with os.fdopen(descritor, modo, encoding=None if 'b' in modo else encoding, **kwargs) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp cria com 0600: mantém as permissões usuais de um arquivo novo
+        mascara = os.umask(0)
+        os.umask(mascara)
+        os.chmod(caminho_tmp, 0o666 & ~mascara)
+        os.replace(caminho_tmp, caminho)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(caminho_tmp)
+        raise
@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+================================================================================
+➕ INGESTÃO INCREMENTAL DOS CSVs MENSAIS DA PRF
+================================================================================
+Mantém em disco o estado mesclável das agregações dos slides e, a cada nova
+carga, incorpora apenas o que mudou:
+
+  * arquivo com o mesmo hash de conteúdo              -> ignorado
+  * arquivo que só cresceu (prefixo com o mesmo hash) -> lê apenas os bytes novos
+  * arquivo alterado no meio                          -> lê tudo, mas só agrega
+    os acidentes novos/alterados/removidos (impressão digital por id)
+
+Para poder subtrair um acidente alterado, guarda as linhas compactas que cada
+acidente contribuiu para os motores (só as colunas declaradas pelos slides).
+As contribuições ficam em segmentos só de acréscimo: cada carga grava um
+segmento com as linhas que entraram e a lista dos ids que saíram (lápides).
+Assim uma carga custa o tamanho do que mudou, e não o do ano acumulado; os
+segmentos são fundidos num só quando passam de MAXIMO_SEGMENTOS.
+Autor: Estratégica Engenharia
+================================================================================
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from cache_colunar import TAMANHO_BLOCO_HASH, CacheColunar
+from esquema_estrela import EsquemaAcidentes, construir_esquema
+from leitor_csv import ESQUEMA_PRF, detectar_formato, ler_csv
+from motor_agregacao import AgregacaoEsquema
+
+# Incrementar sempre que o formato do estado mudar
+VERSAO_ESTADO = 2
+# Acima disso, salvar() funde os segmentos de contribuições num só
+MAXIMO_SEGMENTOS = 16
+
+DIR_ESTADO_PADRAO = '.estado_incremental'
+ARQUIVO_ESTADO = 'estado.json'
+
+# Colunas de controle guardadas junto das contribuições da tabela de acidentes
+COL_IMPRESSAO = '_impressao'
+COL_LINHAS = '_linhas'
+COL_ARQUIVO = '_arquivo'
+# Só no índice em memória: segmento onde estão as linhas vivas do acidente
+COL_SEGMENTO = '_segmento'
+
+
+def hashes_arquivo(caminho, tamanho_prefixo=None):
+    """
+    Calcula, numa única leitura, o hash do arquivo inteiro e o do prefixo de
+    tamanho_prefixo bytes (mesmo algoritmo de cache_colunar.hash_arquivo).
+
+    Returns:
+        tuple: (hash_total, hash_prefixo ou None)
+    """
+    h = hashlib.blake2b(digest_size=16)
+    hash_prefixo = None
+    lidos = 0
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(TAMANHO_BLOCO_HASH), b''):
+            if tamanho_prefixo is not None and hash_prefixo is None and lidos + len(bloco) >= tamanho_prefixo:
+                corte = tamanho_prefixo - lidos
+                h.update(bloco[:corte])
+                hash_prefixo = h.hexdigest()
+                h.update(bloco[corte:])
+            else:
+                h.update(bloco)
+            lidos += len(bloco)
+    return h.hexdigest(), hash_prefixo
+
+
+def impressoes_por_acidente(df):
+    """
+    Impressão digital de cada acidente: soma (mod 2^64) dos hashes das suas
+    linhas, independente da ordem em que aparecem no arquivo.
+
+    Returns:
+        DataFrame: índice 'id', colunas _impressao (uint64) e _linhas
+    """
+    hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    validos = df['id'].notna().to_numpy()
+    codigos, ids = pd.factorize(df['id'][validos])
+
+    impressoes = np.zeros(len(ids), dtype=np.uint64)
+    np.add.at(impressoes, codigos, hashes[validos])
+    return pd.DataFrame(
+        {COL_IMPRESSAO: impressoes, COL_LINHAS: np.bincount(codigos, minlength=len(ids))},
+        index=pd.Index(ids, name='id')
+    )
+
+
+class IngestaoIncremental:
+    """Estado persistido das agregações, atualizado a cada nova carga de CSV"""
+
+    def __init__(self, declaracoes, dir_estado=DIR_ESTADO_PADRAO):
+        """
+        Args:
+            declaracoes (dict): Declarações dos slides (AgregacaoEsquema)
+            dir_estado (str): Pasta onde o estado é mantido
+        """
+        self.declaracoes = declaracoes
+        self.dir_estado = Path(dir_estado)
+        self.armazem = CacheColunar(self.dir_estado)
+        self.assinatura = hashlib.blake2b(
+            json.dumps(declaracoes, sort_keys=True).encode('utf-8'), digest_size=16
+        ).hexdigest()
+
+        self.agregacao = AgregacaoEsquema(declaracoes)
+        self.arquivos = {}
+        # Segmentos em ordem: {'numero', 'linhas' (acidentes gravados), 'removidos' (ids)}
+        self.segmentos = []
+        # Índice dos acidentes vivos: id, impressão, linhas, arquivo e segmento
+        self.fato = self._fato_vazio()
+        self._pendentes = {}  # numero -> {tabela: DataFrame} ainda não gravados
+        self._carregar()
+
+    # ==================== ESTADO EM DISCO ====================
+
+    def _colunas_tabela(self, tabela):
+        colunas = ['id'] + self.agregacao.motores[tabela].colunas_necessarias()
+        if tabela == 'acidentes':
+            colunas += [COL_IMPRESSAO, COL_LINHAS, COL_ARQUIVO]
+        return list(dict.fromkeys(colunas))
+
+    def _contribuicoes_vazias(self):
+        return {tabela: pd.DataFrame(columns=self._colunas_tabela(tabela)) for tabela in self.agregacao.motores}
+
+    @staticmethod
+    def _fato_vazio():
+        return pd.DataFrame({
+            'id': pd.array([], dtype='Int32'),
+            COL_IMPRESSAO: np.zeros(0, dtype=np.uint64),
+            COL_LINHAS: np.zeros(0, dtype=np.int64),
+            COL_ARQUIVO: np.zeros(0, dtype=np.int32),
+            COL_SEGMENTO: np.zeros(0, dtype=np.int64)
+        })
+
+    @staticmethod
+    def _chave(numero, tabela):
+        return f'contribuicoes-{numero}-{tabela}'
+
+    def _tabela(self, numero, tabela):
+        """Contribuições de uma tabela num segmento (memory-map se já gravado)"""
+        if numero in self._pendentes:
+            return self._pendentes[numero][tabela]
+        df = self.armazem.carregar(self._chave(numero, tabela))
+        if df is None:
+            raise ValueError(f"segmento {numero} da tabela '{tabela}' ausente")
+        return df
+
+    def _carregar(self):
+        caminho = self.dir_estado / ARQUIVO_ESTADO
+        if not caminho.exists():
+            return
+
+        try:
+            with open(caminho, 'r', encoding='utf-8') as f:
+                estado = json.load(f)
+            if estado.get('versao') != VERSAO_ESTADO or estado.get('assinatura') != self.assinatura:
+                print("⚠️  Estado incremental de outra versão ou de outros slides; recomeçando do zero")
+                return
+
+            self.segmentos = estado['segmentos']
+            self.fato = self._montar_fato()
+            self.agregacao = AgregacaoEsquema.de_dict(self.declaracoes, estado['agregacao'])
+            self.arquivos = estado['arquivos']
+        except Exception as e:
+            print(f"⚠️  Estado incremental inválido, recomeçando do zero: {e}")
+            self.agregacao = AgregacaoEsquema(self.declaracoes)
+            self.arquivos = {}
+            self.segmentos = []
+            self.fato = self._fato_vazio()
+
+    def _montar_fato(self):
+        """
+        Índice dos acidentes vivos a partir dos segmentos: uma linha do segmento
+        p está viva se nenhum segmento posterior tiver a lápide do seu id.
+        """
+        ultima_remocao = {}
+        for posicao, segmento in enumerate(self.segmentos):
+            for id_acidente in segmento['removidos']:
+                ultima_remocao[id_acidente] = posicao
+
+        partes = [self._fato_vazio()]
+        colunas = ['id', COL_IMPRESSAO, COL_LINHAS, COL_ARQUIVO]
+        for posicao, segmento in enumerate(self.segmentos):
+            if not segmento['linhas']:
+                continue
+            fato = self._tabela(segmento['numero'], 'acidentes')[colunas]
+            removido_em = fato['id'].map(ultima_remocao).to_numpy(dtype=np.float64, na_value=-1)
+            fato = fato[removido_em <= posicao].assign(**{COL_SEGMENTO: segmento['numero']})
+            partes.append(fato)
+        return self._compactar(pd.concat(partes, ignore_index=True))
+
+    def salvar(self):
+        """
+        Grava os segmentos novos e o estado (o estado.json é trocado por último,
+        atomicamente); depois apaga os segmentos que o estado não usa mais
+        """
+        self.dir_estado.mkdir(parents=True, exist_ok=True)
+        if len(self.segmentos) > MAXIMO_SEGMENTOS:
+            self._fundir_segmentos()
+        for numero, tabelas in self._pendentes.items():
+            for tabela, df in tabelas.items():
+                self.armazem.salvar(self._chave(numero, tabela), df)
+        self._pendentes = {}
+
+        estado = {
+            'versao': VERSAO_ESTADO,
+            'assinatura': self.assinatura,
+            'arquivos': self.arquivos,
+            'segmentos': self.segmentos,
+            'agregacao': self.agregacao.para_dict()
+        }
+        caminho_tmp = self.dir_estado / f'.{ARQUIVO_ESTADO}.tmp'
+        with open(caminho_tmp, 'w', encoding='utf-8') as f:
+            json.dump(estado, f, ensure_ascii=False)
+        os.replace(caminho_tmp, self.dir_estado / ARQUIVO_ESTADO)
+
+        usados = {self._chave(s['numero'], tabela) for s in self.segmentos if s['linhas']
+                  for tabela in self.agregacao.motores}
+        for pasta in self.dir_estado.glob('contribuicoes-*'):
+            if pasta.name not in usados:
+                shutil.rmtree(pasta, ignore_errors=True)
+
+    def _fundir_segmentos(self):
+        """Junta as linhas vivas de todos os segmentos num segmento novo, sem lápides"""
+        numero = self._proximo_segmento()
+        tabelas = self._contribuicoes_vazias()
+        for tabela in tabelas:
+            partes = []
+            for segmento, ids in self.fato.groupby(COL_SEGMENTO)['id']:
+                df = self._tabela(segmento, tabela)
+                partes.append(df[df['id'].isin(ids)])
+            if partes:
+                tabelas[tabela] = self._compactar(pd.concat(partes, ignore_index=True))
+        self._pendentes = {numero: tabelas}
+        self.segmentos = [{'numero': numero, 'linhas': len(self.fato), 'removidos': []}]
+        self.fato = self.fato.assign(**{COL_SEGMENTO: numero})
+
+    def _proximo_segmento(self):
+        return max((s['numero'] for s in self.segmentos), default=-1) + 1
+
+    # ==================== INGESTÃO ====================
+
+    def ingerir(self, caminho_csv):
+        """
+        Incorpora uma nova versão (ou um novo arquivo) ao estado.
+
+        Returns:
+            dict: Resumo da carga ('modo', 'novos', 'alterados', 'removidos')
+        """
+        caminho = Path(caminho_csv).resolve()
+        chave = str(caminho)
+        tamanho = caminho.stat().st_size
+        anterior = self.arquivos.get(chave)
+
+        hash_total, hash_prefixo = hashes_arquivo(
+            caminho, anterior['tamanho'] if anterior and tamanho > anterior['tamanho'] else None
+        )
+        resumo = {'arquivo': caminho.name, 'modo': None, 'novos': 0, 'alterados': 0, 'removidos': 0}
+
+        if anterior and anterior['hash'] == hash_total:
+            resumo['modo'] = 'inalterado'
+            return resumo
+
+        if anterior:
+            codigo = anterior['codigo']
+        else:
+            codigo = max((a['codigo'] for a in self.arquivos.values()), default=-1) + 1
+        formato = detectar_formato(caminho)
+
+        df = None
+        if anterior and hash_prefixo == anterior['hash']:
+            df = self._ler_cauda(caminho, anterior['tamanho'], formato)
+            resumo['modo'] = 'anexado'
+        if df is None:
+            df, _ = ler_csv(caminho, formato, esquema=ESQUEMA_PRF)
+            resumo['modo'] = 'completo'
+            if self.agregacao.colunas is None:
+                self.agregacao.colunas = list(df.columns)
+
+        resumo.update(self._aplicar(df, codigo, completo=resumo['modo'] == 'completo'))
+
+        linhas_sem_id = int(df['id'].isna().sum())
+        if resumo['modo'] == 'anexado':
+            linhas_sem_id += anterior.get('linhas_sem_id', 0)
+        self.arquivos[chave] = {
+            'codigo': codigo,
+            'tamanho': tamanho,
+            'hash': hash_total,
+            'formato': formato,
+            'linhas_sem_id': linhas_sem_id
+        }
+        self.agregacao.total_registros = (
+            int(self.fato[COL_LINHAS].sum()) +
+            sum(a['linhas_sem_id'] for a in self.arquivos.values())
+        )
+        return resumo
+
+    def _ler_cauda(self, caminho, inicio, formato):
+        """Lê só as linhas anexadas após o byte inicio; None se não for seguro"""
+        if not self.agregacao.colunas:
+            return None
+        with open(caminho, 'rb') as f:
+            # O trecho antigo precisa terminar numa quebra de linha
+            f.seek(inicio - 1)
+            if f.read(1) != b'\n':
+                return None
+            df, _ = ler_csv(f, formato, esquema=ESQUEMA_PRF, header=None, names=self.agregacao.colunas)
+
+        # Um acidente que continua na cauda exige as linhas antigas: lê tudo
+        if df['id'].dropna().isin(self.fato['id']).any():
+            return None
+        return df
+
+    def _aplicar(self, df, codigo, completo):
+        """
+        Agrega os acidentes novos/alterados e subtrai os alterados/removidos.
+        As linhas antigas só são lidas dos segmentos que as contêm; o que entra
+        e as lápides do que sai vão para um segmento novo.
+        """
+        impressoes = impressoes_por_acidente(df)
+        fato = self.fato
+        anteriores = pd.Series(fato[COL_IMPRESSAO].to_numpy(), index=pd.Index(fato['id']))
+
+        conhecidos = impressoes.index.isin(anteriores.index)
+        novos = impressoes.index[~conhecidos]
+        comuns = impressoes.index[conhecidos]
+        alterados = comuns[impressoes.loc[comuns, COL_IMPRESSAO].to_numpy() != anteriores.loc[comuns].to_numpy()]
+        removidos = pd.Index([])
+        if completo:
+            # Só acidentes vindos deste mesmo arquivo podem ter sido removidos dele
+            deste_arquivo = fato.loc[fato[COL_ARQUIVO].to_numpy() == codigo, 'id']
+            removidos = pd.Index(deste_arquivo[~deste_arquivo.isin(impressoes.index)].to_numpy())
+
+        saem = alterados.append(removidos)
+        entram = novos.append(alterados)
+        if not len(saem) and not len(entram):
+            return {'novos': 0, 'alterados': 0, 'removidos': 0}
+
+        if len(saem):
+            antigas = {tabela: [] for tabela in self.agregacao.motores}
+            afetados = fato[fato['id'].isin(saem)].groupby(COL_SEGMENTO)['id']
+            for segmento, ids in afetados:
+                for tabela, partes in antigas.items():
+                    df_t = self._tabela(segmento, tabela)
+                    partes.append(df_t[df_t['id'].isin(ids)])
+            antigas = {t: pd.concat(partes, ignore_index=True) for t, partes in antigas.items()}
+            self.agregacao.combinar(self._agregar_contribuicoes(antigas), sinal=-1)
+
+        numero = self._proximo_segmento()
+        novas = self._contribuicoes_vazias()
+        indice = [fato[~fato['id'].isin(saem)] if len(saem) else fato]
+        if len(entram):
+            delta = df[df['id'].isin(entram)]
+            esquema = construir_esquema(delta)
+            parcial = AgregacaoEsquema(self.declaracoes, df.columns)
+            parcial.atualizar(esquema)
+            self.agregacao.combinar(parcial)
+
+            for tabela in novas:
+                colunas = [c for c in self._colunas_tabela(tabela) if c in esquema.tabela(tabela).columns]
+                novas[tabela] = self._compactar(esquema.tabela(tabela)[colunas])
+            fato_novo = novas['acidentes'].join(impressoes, on='id')
+            fato_novo[COL_ARQUIVO] = codigo
+            novas['acidentes'] = self._compactar(fato_novo)
+            self._pendentes[numero] = novas
+            indice.append(fato_novo[['id', COL_IMPRESSAO, COL_LINHAS, COL_ARQUIVO]].assign(**{COL_SEGMENTO: numero}))
+
+        self.fato = self._compactar(pd.concat(indice, ignore_index=True))
+        self.segmentos.append({
+            'numero': numero,
+            'linhas': len(novas['acidentes']),
+            'removidos': [int(i) for i in saem]
+        })
+
+        return {'novos': len(novos), 'alterados': len(alterados), 'removidos': len(removidos)}
+
+    def _agregar_contribuicoes(self, tabelas):
+        """Refaz a agregação parcial a partir das contribuições guardadas"""
+        vazia = pd.DataFrame(columns=['id'])
+        esquema = EsquemaAcidentes(
+            acidentes=tabelas.get('acidentes', vazia),
+            pessoas=tabelas.get('pessoas', vazia),
+            veiculos=tabelas.get('veiculos', vazia),
+            causas=tabelas.get('causas', vazia),
+            tipos=tabelas.get('tipos', vazia),
+            total_registros=0
+        )
+        parcial = AgregacaoEsquema(self.declaracoes)
+        parcial.atualizar(esquema)
+        return parcial
+
+    @staticmethod
+    def _compactar(df):
+        """Mantém chaves inteiras e textos como categorias após concatenações"""
+        df = df.copy()
+        df['id'] = df['id'].astype('Int32')
+        if COL_IMPRESSAO in df.columns:
+            df[COL_IMPRESSAO] = df[COL_IMPRESSAO].astype(np.uint64)
+            df[COL_LINHAS] = df[COL_LINHAS].astype(np.int64)
+            df[COL_ARQUIVO] = df[COL_ARQUIVO].astype(np.int32)
+        if COL_SEGMENTO in df.columns:
+            df[COL_SEGMENTO] = df[COL_SEGMENTO].astype(np.int64)
+        for col in df.columns:
+            if df[col].dtype == object or pd.api.types.is_string_dtype(df[col]):
+                df[col] = df[col].astype('category')
+        return df
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+================================================================================
+📖 LEITOR CSV COMPARTILHADO (ENCODING + DELIMITADOR EM UMA PASSADA)
+================================================================================
+Decide encoding e delimitador a partir de uma amostra limitada do arquivo e faz
+o parsing uma única vez com o engine C do pandas. Bytes inválidos (ex.: "Não"
+gravado em latin-1 dentro de um arquivo UTF-8) são reparados durante a
+decodificação, em vez de virarem "N�o" ou forçarem nova leitura do arquivo.
+Autor: Estratégica Engenharia
+================================================================================
+"""
+
+import codecs
+import csv
+
+import pandas as pd
+
+TAMANHO_AMOSTRA = 64 * 1024
+DELIMITADORES = ';,\t|'
+DELIMITADOR_PADRAO = ';'
+
+# Nome do handler de erros registrado em codecs
+ERRO_REPARO = 'reparo_latin1'
+
+# Layout de 37 colunas dos dados abertos da PRF. Inteiros usam tipos nulos
+# (Int32/Int16) para tolerar linhas incompletas; textos viram categorias.
+ESQUEMA_PRF = {
+    'id': 'Int32',
+    'pesid': 'Int32',
+    'data_inversa': 'category',
+    'dia_semana': 'category',
+    'horario': 'category',
+    'uf': 'category',
+    'br': 'Int16',
+    'km': 'float32',
+    'municipio': 'category',
+    'causa_principal': 'category',
+    'causa_acidente': 'category',
+    'ordem_tipo_acidente': 'Int16',
+    'tipo_acidente': 'category',
+    'classificacao_acidente': 'category',
+    'fase_dia': 'category',
+    'sentido_via': 'category',
+    'condicao_metereologica': 'category',
+    'tipo_pista': 'category',
+    'tracado_via': 'category',
+    'uso_solo': 'category',
+    'id_veiculo': 'Int32',
+    'tipo_veiculo': 'category',
+    'marca': 'category',
+    'ano_fabricacao_veiculo': 'Int16',
+    'tipo_envolvido': 'category',
+    'estado_fisico': 'category',
+    'idade': 'Int16',
+    'sexo': 'category',
+    'ilesos': 'Int16',
+    'feridos_leves': 'Int16',
+    'feridos_graves': 'Int16',
+    'mortos': 'Int16',
+    'latitude': 'float32',
+    'longitude': 'float32',
+    'regional': 'category',
+    'delegacia': 'category',
+    'uop': 'category',
+}
+
+
+def _reparar_bytes(erro):
+    """Decodifica bytes inválidos como cp1252 (ou latin-1, se indefinidos)"""
+    if not isinstance(erro, UnicodeDecodeError):
+        raise erro
+
+    trecho = erro.object[erro.start:erro.end]
+    reparado = []
+    for byte in trecho:
+        try:
+            reparado.append(bytes([byte]).decode('cp1252'))
+        except UnicodeDecodeError:
+            reparado.append(chr(byte))
+    return ''.join(reparado), erro.end
+
+
+codecs.register_error(ERRO_REPARO, _reparar_bytes)
+
+
+def detectar_encoding(amostra):
+    """Escolhe o encoding a partir dos bytes da amostra"""
+    if amostra.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+
+    try:
+        # final=False tolera um caractere multibyte cortado no fim da amostra
+        codecs.getincrementaldecoder('utf-8')().decode(amostra, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+
+    # Arquivo misto: se há texto UTF-8 válido além de ASCII, mantém UTF-8 e
+    # deixa o handler de reparo tratar os bytes latin-1 avulsos
+    if any(ord(c) > 127 for c in amostra.decode('utf-8', errors='ignore')):
+        return 'utf-8'
+    return 'cp1252'
+
+
+def detectar_delimitador(texto):
+    """Escolhe o delimitador a partir do texto decodificado da amostra"""
+    # Descarta a última linha, que pode estar cortada
+    linhas = texto.splitlines()
+    if len(linhas) > 1:
+        linhas = linhas[:-1]
+    if not linhas:
+        return DELIMITADOR_PADRAO
+
+    try:
+        return csv.Sniffer().sniff('\n'.join(linhas), delimiters=DELIMITADORES).delimiter
+    except csv.Error:
+        cabecalho = linhas[0]
+        contagens = {d: cabecalho.count(d) for d in DELIMITADORES}
+        melhor = max(contagens, key=contagens.get)
+        return melhor if contagens[melhor] > 0 else DELIMITADOR_PADRAO
+
+
+def detectar_formato(caminho_csv, tamanho_amostra=TAMANHO_AMOSTRA):
+    """Lê apenas a amostra inicial e retorna {'encoding', 'delimitador'}"""
+    with open(caminho_csv, 'rb') as f:
+        amostra = f.read(tamanho_amostra)
+
+    encoding = detectar_encoding(amostra)
+    texto = amostra.decode(encoding, errors=ERRO_REPARO)
+
+    return {
+        'encoding': encoding,
+        'delimitador': detectar_delimitador(texto)
+    }
+
+
+def aplicar_esquema(df, esquema=ESQUEMA_PRF):
+    """
+    Converte as colunas para os tipos do esquema, tolerando valores inválidos.
+
+    Usado quando o parsing tipado falha (ex.: texto numa coluna numérica) e
+    para frames que não vieram do leitor (ex.: CSVs de versões antigas).
+    """
+    for col, tipo in esquema.items():
+        if col not in df.columns or str(df[col].dtype) == tipo:
+            continue
+        if tipo == 'category':
+            df[col] = df[col].astype('category')
+            continue
+
+        valores = df[col]
+        if not pd.api.types.is_numeric_dtype(valores):
+            # Números com vírgula decimal ("-25,3818")
+            valores = valores.astype('string').str.replace(',', '.', regex=False)
+        valores = pd.to_numeric(valores, errors='coerce')
+        try:
+            df[col] = valores.astype(tipo)
+        except (TypeError, ValueError, OverflowError):
+            df[col] = valores
+    return df
+
+
+def ler_csv(caminho_csv, formato=None, esquema=None, **kwargs):
+    """
+    Faz o parsing do CSV em uma única passada com o engine C.
+
+    Args:
+        caminho_csv (str): Caminho do arquivo
+        formato (dict): Resultado de detectar_formato(); detectado se None
+        esquema (dict): Tipos por coluna (ex.: ESQUEMA_PRF) aplicados no parsing
+        **kwargs: Argumentos extras repassados ao pd.read_csv
+
+    Returns:
+        tuple: (DataFrame, formato)
+    """
+    if formato is None:
+        formato = detectar_formato(caminho_csv)
+
+    opcoes = {
+        'sep': formato['delimitador'],
+        'encoding': formato['encoding'],
+        'encoding_errors': ERRO_REPARO,
+        'on_bad_lines': 'skip',
+        'engine': 'c',
+    }
+    if esquema:
+        opcoes['dtype'] = esquema
+        opcoes['decimal'] = ','
+    opcoes.update(kwargs)
+
+    try:
+        return pd.read_csv(caminho_csv, **opcoes), formato
+    except (TypeError, ValueError) as e:
+        if not esquema or opcoes.get('chunksize'):
+            raise
+        # Algum valor não respeita o esquema: lê sem tipos numéricos e converte
+        print(f"⚠️  Esquema não aplicável no parsing ({e}); convertendo após a leitura")
+        opcoes['dtype'] = {col: tipo for col, tipo in esquema.items() if tipo == 'category'}
+        return aplicar_esquema(pd.read_csv(caminho_csv, **opcoes), esquema), formato
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+================================================================================
+⚙️  MOTOR DE AGREGAÇÃO EM PASSADA ÚNICA PARA OS SLIDES
+================================================================================
+Cada slide declara as somas, contagens e agrupamentos de que precisa. O motor
+junta todas as declarações, fatoriza cada coluna-chave uma única vez por bloco
+e calcula todas as medidas com np.bincount sobre os códigos compartilhados.
+Os acumuladores podem receber vários blocos (modo streaming).
+Autor: Estratégica Engenharia
+================================================================================
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def _nativo(valor):
+    """Converte escalares numpy em tipos nativos do Python"""
+    return valor.item() if isinstance(valor, np.generic) else valor
+
+
+class MotorAgregacao:
+    """Calcula numa única passada todas as agregações declaradas pelos slides"""
+
+    def __init__(self, declaracoes, colunas=None):
+        """
+        Args:
+            declaracoes (dict): {slide: {'somas': [...], 'contagens': [...],
+                                         'grupos': {chave: [colunas somadas]}}}
+            colunas (list): Colunas do arquivo de origem (para o relatório)
+        """
+        self.declaracoes = declaracoes
+        self.colunas = list(colunas) if colunas is not None else None
+        self.total_registros = 0
+
+        self.colunas_soma = []
+        self.medidas = {}
+        for declaracao in declaracoes.values():
+            self.colunas_soma.extend(declaracao.get('somas', []))
+            for chave in declaracao.get('contagens', []):
+                self.medidas.setdefault(chave, [])
+            for chave, somas in declaracao.get('grupos', {}).items():
+                self.medidas.setdefault(chave, [])
+                self.medidas[chave].extend(somas)
+        self.colunas_soma = list(dict.fromkeys(self.colunas_soma))
+        self.medidas = {chave: list(dict.fromkeys(somas)) for chave, somas in self.medidas.items()}
+        self.grupos = {
+            chave for declaracao in declaracoes.values()
+            for chave in declaracao.get('grupos', {})
+        }
+
+        self.somas = {col: 0.0 for col in self.colunas_soma}
+        # Dicionário valor -> índice global, em ordem de primeira ocorrência
+        self.dicionarios = {chave: {} for chave in self.medidas}
+        self.frequencias = {chave: np.zeros(0, dtype=np.int64) for chave in self.medidas}
+        self.acidentes = {chave: np.zeros(0, dtype=np.int64) for chave in self.grupos}
+        self.somas_grupo = {
+            chave: {col: np.zeros(0, dtype=np.float64) for col in self.medidas[chave]}
+            for chave in self.grupos
+        }
+
+    def colunas_necessarias(self):
+        """Colunas do CSV usadas por alguma declaração"""
+        return list(dict.fromkeys(['id'] + self.colunas_soma + list(self.medidas) +
+                                  [col for somas in self.medidas.values() for col in somas]))
+
+    # ==================== ATUALIZAÇÃO ====================
+
+    def atualizar(self, df):
+        """Acrescenta a contribuição de um bloco de linhas"""
+        if self.colunas is None:
+            self.colunas = list(df.columns)
+        self.total_registros += len(df)
+
+        for col in self.colunas_soma:
+            if col in df.columns:
+                self.somas[col] += float(np.nansum(self._valores(df, col)))
+
+        id_valido = df['id'].notna().to_numpy() if 'id' in df.columns else None
+
+        for chave, medidas in self.medidas.items():
+            if chave not in df.columns:
+                continue
+
+            codigos, valores = pd.factorize(df[chave], sort=False)
+            validos = codigos >= 0
+            codigos = codigos[validos]
+            k = len(valores)
+            indices = self._indices_globais(chave, valores)
+
+            self.frequencias[chave][indices] += np.bincount(codigos, minlength=k)
+
+            if chave not in self.grupos:
+                continue
+
+            if id_valido is not None:
+                self.acidentes[chave][indices] += np.bincount(codigos[id_valido[validos]], minlength=k)
+            for col in medidas:
+                if col in df.columns:
+                    pesos = np.nan_to_num(self._valores(df, col)[validos])
+                    self.somas_grupo[chave][col][indices] += np.bincount(codigos, weights=pesos, minlength=k)
+
+    def _valores(self, df, col):
+        return pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+
+    def _indices_globais(self, chave, valores):
+        """Traduz os valores do bloco para índices do dicionário global"""
+        dicionario = self.dicionarios[chave]
+        indices = np.empty(len(valores), dtype=np.int64)
+        for i, valor in enumerate(valores):
+            indices[i] = dicionario.setdefault(valor, len(dicionario))
+
+        tamanho = len(dicionario)
+        if tamanho > len(self.frequencias[chave]):
+            self.frequencias[chave] = self._crescer(self.frequencias[chave], tamanho)
+            if chave in self.grupos:
+                self.acidentes[chave] = self._crescer(self.acidentes[chave], tamanho)
+                for col, somas in self.somas_grupo[chave].items():
+                    self.somas_grupo[chave][col] = self._crescer(somas, tamanho)
+        return indices
+
+    @staticmethod
+    def _crescer(vetor, tamanho):
+        novo = np.zeros(tamanho, dtype=vetor.dtype)
+        novo[:len(vetor)] = vetor
+        return novo
+
+    # ==================== COMBINAÇÃO E PERSISTÊNCIA ====================
+
+    def combinar(self, outro, sinal=1):
+        """
+        Soma (sinal=1) ou subtrai (sinal=-1) os acumuladores de outro motor
+        com as mesmas declarações. Os valores são casados pelo dicionário.
+        """
+        self.total_registros += sinal * outro.total_registros
+        for col in self.colunas_soma:
+            self.somas[col] += sinal * outro.somas.get(col, 0.0)
+
+        for chave in self.medidas:
+            valores = list(outro.dicionarios.get(chave, {}))
+            if not valores:
+                continue
+            indices = self._indices_globais(chave, valores)
+            self.frequencias[chave][indices] += sinal * outro.frequencias[chave][:len(valores)]
+
+            if chave not in self.grupos:
+                continue
+            self.acidentes[chave][indices] += sinal * outro.acidentes[chave][:len(valores)]
+            for col, somas in outro.somas_grupo[chave].items():
+                self.somas_grupo[chave][col][indices] += sinal * somas[:len(valores)]
+
+    def para_dict(self):
+        """Estado dos acumuladores em tipos nativos (serializável em JSON)"""
+        return {
+            'colunas': self.colunas,
+            'total_registros': int(self.total_registros),
+            'somas': {col: float(valor) for col, valor in self.somas.items()},
+            'dicionarios': {chave: [_nativo(v) for v in dicionario] for chave, dicionario in self.dicionarios.items()},
+            'frequencias': {chave: vetor.tolist() for chave, vetor in self.frequencias.items()},
+            'acidentes': {chave: vetor.tolist() for chave, vetor in self.acidentes.items()},
+            'somas_grupo': {
+                chave: {col: vetor.tolist() for col, vetor in somas.items()}
+                for chave, somas in self.somas_grupo.items()
+            }
+        }
+
+    @classmethod
+    def de_dict(cls, declaracoes, dados):
+        """Reconstrói o motor a partir de para_dict()"""
+        motor = cls(declaracoes, dados.get('colunas'))
+        motor.total_registros = dados['total_registros']
+        motor.somas.update(dados['somas'])
+
+        for chave in motor.medidas:
+            valores = dados['dicionarios'].get(chave, [])
+            motor.dicionarios[chave] = {valor: i for i, valor in enumerate(valores)}
+            motor.frequencias[chave] = np.asarray(dados['frequencias'].get(chave, []), dtype=np.int64)
+            if chave in motor.grupos:
+                motor.acidentes[chave] = np.asarray(dados['acidentes'].get(chave, []), dtype=np.int64)
+                for col in motor.somas_grupo[chave]:
+                    motor.somas_grupo[chave][col] = np.asarray(
+                        dados['somas_grupo'].get(chave, {}).get(col, [0.0] * len(valores)),
+                        dtype=np.float64
+                    )
+        return motor
+
+    # ==================== RESULTADOS ====================
+
+    def _indice(self, chave):
+        return pd.Index(list(self.dicionarios[chave]))
+
+    def soma(self, col):
+        """Soma da coluna sobre todos os registros"""
+        return self.somas[col]
+
+    def contagem(self, chave):
+        """Equivalente a df[chave].value_counts()"""
+        contagem = pd.Series(self.frequencias[chave], index=self._indice(chave))
+        # Valores que zeraram após uma subtração não aparecem
+        return contagem[contagem > 0].sort_values(ascending=False)
+
+    def agrupamento(self, chave):
+        """Equivalente a df.groupby(chave) com contagem de 'id' ('acidentes') e somas"""
+        dados = {'acidentes': self.acidentes[chave]}
+        dados.update(self.somas_grupo[chave])
+        grupos = pd.DataFrame(dados, index=self._indice(chave))
+        return grupos[self.frequencias[chave] > 0].sort_index()
+
+
+class AgregacaoEsquema:
+    """Um MotorAgregacao por tabela do esquema estrela (acidentes, causas, ...)"""
+
+    def __init__(self, declaracoes, colunas=None):
+        """
+        Args:
+            declaracoes (dict): Como em MotorAgregacao, com a chave opcional
+                                'tabela' (padrão: 'acidentes')
+            colunas (list): Colunas do arquivo de origem (para o relatório)
+        """
+        por_tabela = {}
+        for slide, declaracao in declaracoes.items():
+            tabela = declaracao.get('tabela', 'acidentes')
+            por_tabela.setdefault(tabela, {})[slide] = declaracao
+
+        self.motores = {tabela: MotorAgregacao(decls) for tabela, decls in por_tabela.items()}
+        self.colunas = list(colunas) if colunas is not None else None
+        self.total_registros = 0
+
+    def colunas_necessarias(self):
+        """Colunas do CSV bruto usadas por alguma declaração ou pelo esquema"""
+        colunas = ['id', 'pesid', 'id_veiculo']
+        for motor in self.motores.values():
+            colunas.extend(motor.colunas_necessarias())
+        return list(dict.fromkeys(colunas))
+
+    def atualizar(self, esquema, colunas=None):
+        """Acrescenta as tabelas de um EsquemaAcidentes (um bloco de linhas)"""
+        if self.colunas is None and colunas is not None:
+            self.colunas = list(colunas)
+        self.total_registros += esquema.total_registros
+        for tabela, motor in self.motores.items():
+            motor.atualizar(esquema.tabela(tabela))
+
+    def combinar(self, outra, sinal=1):
+        """Soma (ou subtrai, com sinal=-1) outra AgregacaoEsquema nesta"""
+        if self.colunas is None:
+            self.colunas = outra.colunas
+        self.total_registros += sinal * outra.total_registros
+        for tabela, motor in self.motores.items():
+            motor.combinar(outra.motores[tabela], sinal)
+
+    def para_dict(self):
+        """Estado serializável de todos os motores"""
+        return {
+            'colunas': self.colunas,
+            'total_registros': int(self.total_registros),
+            'motores': {tabela: motor.para_dict() for tabela, motor in self.motores.items()}
+        }
+
+    @classmethod
+    def de_dict(cls, declaracoes, dados):
+        """Reconstrói a agregação a partir de para_dict()"""
+        agregacao = cls(declaracoes, dados.get('colunas'))
+        agregacao.total_registros = dados['total_registros']
+        for tabela, motor in agregacao.motores.items():
+            if tabela in dados['motores']:
+                agregacao.motores[tabela] = MotorAgregacao.de_dict(motor.declaracoes, dados['motores'][tabela])
+        return agregacao
+
+    def total(self, tabela):
+        """Quantidade de entidades (linhas) agregadas na tabela"""
+        return self.motores[tabela].total_registros
+
+    def motor(self, col):
+        """Motor da tabela cujas declarações usam a coluna"""
+        for motor in self.motores.values():
+            if col in motor.colunas_soma or col in motor.medidas:
+                return motor
+        raise KeyError(f"Nenhum slide declara a coluna '{col}'")
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+================================================================================
+🔁 PIPELINE INCREMENTAL CSV → JSON ESTRUTURADO → DASHBOARD HTML
+================================================================================
+Executa os scripts do relatório como um grafo de etapas, no estilo do make:
+
+  estruturar  script.py          CSV -> dados_estruturados.json, csv_limpo.csv
+  relatorio   script-v7.py       CSV -> relatorio_acidentes.json
+  dashboard   gerar_dashboard.py relatorio_acidentes.json + dashboard_template.html -> index.html
+                                 + CSS/JS com hash referenciados pela página
+
+Cada etapa tem uma impressão digital (hash do conteúdo das entradas, do código
+do script e dos módulos locais que ele importa, e dos parâmetros). Etapas com
+a mesma impressão da última execução e saídas intactas são puladas; etapas
+independentes rodam em paralelo. Se uma etapa regenera uma saída idêntica, as
+seguintes continuam em dia (mexer só no gerar_dashboard.py não relê o CSV).
+
+Uso:
+    python3 pipeline.py                    # roda o que estiver desatualizado
+    python3 pipeline.py dashboard          # só o dashboard (e suas dependências)
+    python3 pipeline.py --csv outro.csv    # outro CSV de entrada
+    python3 pipeline.py --forcar relatorio # refaz a etapa mesmo em dia
+    python3 pipeline.py --status           # mostra o que rodaria, sem rodar
+                                           # (conservador: etapas cuja dependência
+                                           # vai rodar aparecem como pendentes)
+Autor: Estratégica Engenharia
+================================================================================
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from cache_colunar import hash_arquivo
+from gerar_dashboard import assets_da_pagina
+from gravacao_atomica import gravar_atomico
+
+# Incrementar sempre que o cálculo da impressão digital mudar
+VERSAO_PIPELINE = 1
+
+DIR_BASE = Path(__file__).resolve().parent
+DIR_ESTADO_PADRAO = '.estado_pipeline'
+ARQUIVO_ESTADO = 'estado.json'
+CSV_PADRAO = 'acidentes2025_todas_causas_tipos.csv'
+
+
+class Etapa:
+    """
+    Um script do relatório com suas entradas e saídas (caminhos relativos a
+    DIR_BASE). saidas_geradas, se houver, lista depois da execução as saídas
+    cujo nome só se conhece então (ex.: assets com hash no nome).
+    """
+
+    def __init__(self, nome, script, entradas, saidas, argumentos=(), saidas_geradas=None):
+        self.nome = nome
+        self.script = script
+        self.entradas = list(entradas)
+        self.saidas = list(saidas)
+        self.argumentos = list(argumentos)
+        self.saidas_geradas = saidas_geradas
+
+    def comando(self):
+        return [sys.executable, self.script] + self.argumentos
+
+    def todas_saidas(self, base=DIR_BASE):
+        """Saídas fixas e as geradas pela última execução"""
+        if self.saidas_geradas is None:
+            return list(self.saidas)
+        return self.saidas + [s for s in self.saidas_geradas(base) if s not in self.saidas]
+
+
+def etapas_padrao(csv=CSV_PADRAO):
+    """Grafo do relatório de acidentes para o CSV informado"""
+    return [
+        Etapa('estruturar', 'script.py', [csv],
+              ['dados_estruturados.json', 'csv_limpo.csv', 'prompt_llm_otimizado.md'], [csv]),
+        Etapa('relatorio', 'script-v7.py', [csv], ['relatorio_acidentes.json'], [csv]),
+        Etapa('dashboard', 'gerar_dashboard.py', ['relatorio_acidentes.json', 'dashboard_template.html'],
+              ['index.html'], saidas_geradas=lambda base: assets_da_pagina(base / 'index.html')),
+    ]
+
+
+# ==================== IMPRESSÕES DIGITAIS ====================
+
+def modulos_locais(script, base=DIR_BASE):
+    """Script e os módulos da pasta que ele importa (direta ou indiretamente)"""
+    vistos = []
+    pendentes = [script]
+    while pendentes:
+        arquivo = pendentes.pop()
+        if arquivo in vistos:
+            continue
+        vistos.append(arquivo)
+        arvore = ast.parse((base / arquivo).read_text(encoding='utf-8'), filename=arquivo)
+        for no in ast.walk(arvore):
+            if isinstance(no, ast.Import):
+                nomes = [alias.name for alias in no.names]
+            elif isinstance(no, ast.ImportFrom) and no.module and not no.level:
+                nomes = [no.module]
+            else:
+                continue
+            for nome in nomes:
+                candidato = nome.split('.')[0] + '.py'
+                if (base / candidato).exists():
+                    pendentes.append(candidato)
+    return sorted(vistos)
+
+
+class Hashes:
+    """
+    Hash de conteúdo dos arquivos, reaproveitando o da execução anterior
+    quando mtime e tamanho não mudaram (o CSV não é relido à toa).
+    """
+
+    def __init__(self, anteriores=None, base=DIR_BASE):
+        self.base = base
+        self.registro = dict(anteriores or {})  # arquivo -> [mtime_ns, tamanho, hash]
+
+    def de(self, arquivo):
+        """Hash do arquivo ou None se ele não existir"""
+        try:
+            info = os.stat(self.base / arquivo)
+        except OSError:
+            self.registro.pop(arquivo, None)
+            return None
+        anterior = self.registro.get(arquivo)
+        if anterior and anterior[0] == info.st_mtime_ns and anterior[1] == info.st_size:
+            return anterior[2]
+        conteudo = hash_arquivo(self.base / arquivo)
+        self.registro[arquivo] = [info.st_mtime_ns, info.st_size, conteudo]
+        return conteudo
+
+
+def impressao(etapa, hashes, base=DIR_BASE):
+    """Impressão digital da etapa: entradas, código e parâmetros"""
+    partes = {
+        'versao': VERSAO_PIPELINE,
+        'etapa': etapa.nome,
+        'python': list(sys.version_info[:2]),
+        'argumentos': etapa.argumentos,
+        'entradas': {arquivo: hashes.de(arquivo) for arquivo in etapa.entradas},
+        'codigo': {arquivo: hashes.de(arquivo) for arquivo in modulos_locais(etapa.script, base)},
+    }
+    texto = json.dumps(partes, sort_keys=True)
+    return hashlib.blake2b(texto.encode('utf-8'), digest_size=16).hexdigest()
+
+
+# ==================== EXECUÇÃO ====================
+
+class Pipeline:
+    """Ordena as etapas pelas dependências, pula as em dia e roda as demais em paralelo"""
+
+    def __init__(self, etapas, dir_estado=DIR_ESTADO_PADRAO, processos=None, base=DIR_BASE):
+        self.etapas = {etapa.nome: etapa for etapa in etapas}
+        self.base = base
+        self.dir_estado = base / dir_estado
+        self.processos = processos or os.cpu_count() or 1
+
+        # Dependências: quem produz cada entrada da etapa
+        produtor = {saida: etapa.nome for etapa in etapas for saida in etapa.saidas}
+        self.dependencias = {
+            etapa.nome: sorted({produtor[e] for e in etapa.entradas if e in produtor} - {etapa.nome})
+            for etapa in etapas
+        }
+
+        self.estado = self._carregar_estado()
+        self.hashes = Hashes(self.estado.get('hashes'), base)
+
+    def _carregar_estado(self):
+        try:
+            with open(self.dir_estado / ARQUIVO_ESTADO, 'r', encoding='utf-8') as f:
+                estado = json.load(f)
+        except (OSError, ValueError):
+            return {'versao': VERSAO_PIPELINE, 'etapas': {}}
+        if estado.get('versao') != VERSAO_PIPELINE:
+            return {'versao': VERSAO_PIPELINE, 'etapas': {}}
+        return estado
+
+    def _salvar_estado(self):
+        self.dir_estado.mkdir(parents=True, exist_ok=True)
+        self.estado['hashes'] = self.hashes.registro
+        with gravar_atomico(self.dir_estado / ARQUIVO_ESTADO) as f:
+            json.dump(self.estado, f, ensure_ascii=False, indent=2)
+
+    def selecionar(self, alvos=None):
+        """Etapas pedidas e todas de que elas dependem, na ordem do grafo"""
+        if not alvos:
+            return list(self.etapas)
+        desconhecidas = [alvo for alvo in alvos if alvo not in self.etapas]
+        if desconhecidas:
+            raise ValueError(f"Etapa(s) desconhecida(s): {', '.join(desconhecidas)}. "
+                             f"Disponíveis: {', '.join(self.etapas)}")
+        incluidas = set()
+        pendentes = list(alvos)
+        while pendentes:
+            nome = pendentes.pop()
+            if nome not in incluidas:
+                incluidas.add(nome)
+                pendentes.extend(self.dependencias[nome])
+        return [nome for nome in self.etapas if nome in incluidas]
+
+    def em_dia(self, nome):
+        """
+        Returns:
+            (bool, str): se a etapa pode ser pulada, e o motivo
+        """
+        etapa = self.etapas[nome]
+        faltando = [e for e in etapa.entradas if self.hashes.de(e) is None]
+        if faltando:
+            return False, f"entrada ausente: {', '.join(faltando)}"
+        anterior = self.estado['etapas'].get(nome)
+        if anterior is None:
+            return False, 'nunca executada'
+        if anterior.get('impressao') != impressao(etapa, self.hashes, self.base):
+            return False, 'entradas, código ou parâmetros mudaram'
+        # Inclui as saídas geradas registradas na execução (assets do dashboard)
+        registradas = anterior.get('saidas', {})
+        for saida in etapa.saidas + [s for s in registradas if s not in etapa.saidas]:
+            if self.hashes.de(saida) != registradas.get(saida):
+                return False, f'saída ausente ou alterada: {saida}'
+        return True, 'em dia'
+
+    def _rodar(self, nome):
+        """Roda a etapa em um subprocesso; a saída vai para o log da etapa"""
+        etapa = self.etapas[nome]
+        self.dir_estado.mkdir(parents=True, exist_ok=True)
+        inicio = time.perf_counter()
+        with open(self.dir_estado / f'{nome}.log', 'w', encoding='utf-8') as log:
+            retorno = subprocess.run(
+                etapa.comando(), cwd=self.base, stdout=log, stderr=subprocess.STDOUT,
+                env=dict(os.environ, PYTHONIOENCODING='utf-8')
+            ).returncode
+        return retorno, time.perf_counter() - inicio
+
+    def executar(self, alvos=None, forcar=(), somente_status=False):
+        """
+        Executa as etapas desatualizadas (e as forçadas).
+
+        Returns:
+            dict: nome -> 'pulada' | 'executada' | 'falhou' | 'bloqueada' | 'pendente'
+        """
+        nomes = self.selecionar(alvos)
+        self.selecionar(forcar)  # valida os nomes
+        resultado = {}
+        forcar = set(forcar)
+
+        if somente_status:
+            # Sem rodar não dá para saber se a dependência vai gerar a mesma saída:
+            # a etapa seguinte aparece como pendente, mesmo que acabe pulada
+            for nome in nomes:
+                dependencias_mudam = any(resultado.get(dep) == 'pendente' for dep in self.dependencias[nome])
+                atualizada, motivo = self.em_dia(nome)
+                if nome in forcar or dependencias_mudam or not atualizada:
+                    motivo = 'forçada' if nome in forcar else 'dependência pode ser refeita' if dependencias_mudam \
+                        else motivo
+                    resultado[nome] = 'pendente'
+                    print(f"  ⏳ {nome}: {motivo}")
+                else:
+                    resultado[nome] = 'pulada'
+                    print(f"  ✓ {nome}: em dia")
+            return resultado
+
+        impressoes = {}
+        rodando = {}
+        with ThreadPoolExecutor(max_workers=self.processos) as executor:
+            while len(resultado) < len(nomes):
+                # Etapas cujas dependências já terminaram
+                for nome in nomes:
+                    if nome in resultado or nome in rodando:
+                        continue
+                    dependencias = [dep for dep in self.dependencias[nome] if dep in nomes]
+                    if any(resultado.get(dep) in ('falhou', 'bloqueada') for dep in dependencias):
+                        resultado[nome] = 'bloqueada'
+                        print(f"  ⛔ {nome}: dependência falhou")
+                        continue
+                    if not all(dep in resultado for dep in dependencias):
+                        continue
+
+                    # Avaliada só agora: as entradas podem ter acabado de ser geradas
+                    faltando = [e for e in self.etapas[nome].entradas if self.hashes.de(e) is None]
+                    if faltando:
+                        resultado[nome] = 'falhou'
+                        print(f"  ❌ {nome}: entrada ausente: {', '.join(faltando)}")
+                        continue
+                    atualizada, motivo = self.em_dia(nome)
+                    if atualizada and nome not in forcar:
+                        resultado[nome] = 'pulada'
+                        print(f"  ✓ {nome}: em dia")
+                        continue
+                    impressoes[nome] = impressao(self.etapas[nome], self.hashes, self.base)
+                    print(f"  ▶ {nome}: {'forçada' if nome in forcar else motivo}")
+                    rodando[nome] = executor.submit(self._rodar, nome)
+
+                if not rodando:
+                    continue
+                concluidos, _ = wait(rodando.values(), return_when=FIRST_COMPLETED)
+                for nome in [n for n, futuro in rodando.items() if futuro in concluidos]:
+                    retorno, segundos = rodando.pop(nome).result()
+                    etapa = self.etapas[nome]
+                    saidas = etapa.todas_saidas(self.base)
+                    faltando = [s for s in saidas if self.hashes.de(s) is None]
+                    if retorno != 0 or faltando:
+                        resultado[nome] = 'falhou'
+                        self.estado['etapas'].pop(nome, None)
+                        print(f"  ❌ {nome}: falhou em {segundos:.1f}s (log: {self.dir_estado / (nome + '.log')})")
+                    else:
+                        resultado[nome] = 'executada'
+                        self.estado['etapas'][nome] = {
+                            'impressao': impressoes[nome],
+                            'saidas': {saida: self.hashes.de(saida) for saida in saidas},
+                            'executada_em': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                            'segundos': round(segundos, 3)
+                        }
+                        print(f"  ✓ {nome}: executada em {segundos:.1f}s")
+                    self._salvar_estado()
+
+        self._salvar_estado()
+        return resultado
+
+
+def main():
+    """Função principal"""
+    parser = argparse.ArgumentParser(description="Pipeline incremental do relatório de acidentes")
+    parser.add_argument('etapas', nargs='*', help="Etapas a atualizar (padrão: todas)")
+    parser.add_argument('--csv', default=CSV_PADRAO, help="CSV de entrada (relativo a esta pasta)")
+    parser.add_argument('--forcar', action='append', default=[], metavar='ETAPA',
+                        help="Refaz a etapa mesmo em dia (pode repetir)")
+    parser.add_argument('--processos', type=int, default=0,
+                        help="Etapas simultâneas (padrão: núcleos disponíveis)")
+    parser.add_argument('--dir-estado', default=DIR_ESTADO_PADRAO, help="Pasta do estado do pipeline")
+    parser.add_argument('--status', action='store_true', help="Mostra o que rodaria, sem rodar (estimativa conservadora)")
+    args = parser.parse_args()
+
+    print("\n" + "=" * 80)
+    print("🔁 PIPELINE DO RELATÓRIO DE ACIDENTES")
+    print("=" * 80)
+
+    pipeline = Pipeline(etapas_padrao(args.csv), args.dir_estado, args.processos or None)
+    try:
+        resultado = pipeline.executar(args.etapas, args.forcar, somente_status=args.status)
+    except ValueError as e:
+        print(f"\n❌ {e}")
+        sys.exit(2)
+
+    if any(situacao in ('falhou', 'bloqueada') for situacao in resultado.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
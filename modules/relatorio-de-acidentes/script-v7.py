@@ -10,83 +10,196 @@ Data: 13/02/2026
 ================================================================================
 """
 
+import numpy as np
 import pandas as pd
+import argparse
+import contextlib
 import csv
+import io
 import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
 from datetime import datetime
 import sys
 
+from cache_colunar import CacheColunar
+from leitor_csv import ESQUEMA_PRF, detectar_formato, ler_csv
+from motor_agregacao import AgregacaoEsquema
+from esquema_estrela import construir_esquema
+from gravacao_atomica import gravar_atomico
+from ingestao_incremental import DIR_ESTADO_PADRAO, IngestaoIncremental
+
+
 class CSVtoApresentacao:
     """Converte CSV de acidentes em dados estruturados para slides"""
     
-    def __init__(self, caminho_csv):
+    # Agregações declaradas por cada slide, sobre uma tabela do esquema estrela
+    # (cada acidente/causa/tipo conta uma vez). O MotorAgregacao calcula todas
+    # numa única passada; um slide novo só precisa acrescentar sua entrada aqui.
+    AGREGACOES_SLIDES = {
+        'slide_2': {'tabela': 'acidentes', 'somas': ['mortos', 'feridos_graves', 'feridos_leves', 'ilesos']},
+        'slide_3': {'tabela': 'tipos', 'contagens': ['tipo_acidente']},
+        'slide_4': {'tabela': 'causas', 'contagens': ['causa_acidente']},
+        'slide_5': {'tabela': 'acidentes', 'grupos': {'br': ['mortos', 'feridos_graves']}},
+        'slide_6': {'tabela': 'acidentes', 'contagens': ['condicao_metereologica']},
+        'slide_7': {'tabela': 'acidentes', 'contagens': ['fase_dia']},
+        'slide_8': {'tabela': 'acidentes', 'grupos': {'municipio': ['mortos']}},
+    }
+    
+    def __init__(self, caminho_csv, usar_cache=True, tamanho_bloco=None):
         self.caminho_csv = caminho_csv
         self.df = None
         self.delimitador = None
+        self.formato = None
+        self.usar_cache = usar_cache
+        # Com tamanho_bloco o CSV é lido em blocos e só os acumuladores ficam em memória
+        self.tamanho_bloco = tamanho_bloco
+        self.agregacao = None
         self.data_extracao = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
         
     def detectar_delimitador(self):
-        """Detecta automaticamente o delimitador do CSV"""
+        """Detecta encoding e delimitador a partir de uma amostra do CSV"""
         try:
-            with open(self.caminho_csv, 'r', encoding='utf-8') as f:
-                primeira_linha = f.readline()
-            
-            # Testar delimitadores comuns
-            if ';' in primeira_linha:
-                self.delimitador = ';'
-            elif ',' in primeira_linha:
-                self.delimitador = ','
-            elif '\t' in primeira_linha:
-                self.delimitador = '\t'
-            else:
-                self.delimitador = ','
-            
-            return self.delimitador
+            self.formato = detectar_formato(self.caminho_csv)
         except Exception as e:
             print(f"⚠️  Erro ao detectar delimitador: {e}")
-            self.delimitador = ';'
-            return ';'
+            self.formato = {'encoding': 'utf-8', 'delimitador': ';'}
+        
+        self.delimitador = self.formato['delimitador']
+        return self.delimitador
     
     def carregar_csv(self):
         """Carrega CSV com tratamento robusto de erros"""
         delim = self.detectar_delimitador()
         
-        print(f"\n📂 Carregando CSV com delimitador: '{delim}'")
+        print(f"\n📂 Carregando CSV com delimitador: '{delim}' (encoding: {self.formato['encoding']})")
         print(f"   Caminho: {self.caminho_csv}")
         
-        # Estratégia 1: Pandas com on_bad_lines='skip'
+        if self.tamanho_bloco:
+            return self._carregar_em_blocos()
+        
+        # Cache colunar: pula o parsing se o conteúdo do CSV não mudou
+        cache = chave_cache = None
+        if self.usar_cache:
+            try:
+                cache = CacheColunar.para_csv(self.caminho_csv)
+                chave_cache = cache.chave(self.caminho_csv, {
+                    'formato': self.formato,
+                    'esquema': ESQUEMA_PRF,
+                    'leitor': 'c',
+                    'on_bad_lines': 'skip'
+                })
+                df = cache.carregar(chave_cache)
+                if df is not None:
+                    self.df = df
+                    print(f"✓ Carregado do cache colunar: {len(self.df):,} registros\n")
+                    return True
+            except Exception as e:
+                print(f"⚠️  Cache colunar indisponível: {e}")
+                cache = None
+        
         try:
-            self.df = pd.read_csv(
-                self.caminho_csv,
-                delimiter=delim,
-                encoding='utf-8',
-                on_bad_lines='skip',
-                engine='python'
-            )
+            self.df, _ = ler_csv(self.caminho_csv, self.formato, esquema=ESQUEMA_PRF)
             print(f"✓ Carregado com sucesso: {len(self.df):,} registros\n")
-            return True
-            
-        except UnicodeDecodeError:
-            print("⚠️  Erro de encoding UTF-8, tentando latin-1...")
+        except Exception as e:
+            print(f"❌ Erro ao carregar: {e}\n")
+            return False
+        
+        if cache is not None:
             try:
-                self.df = pd.read_csv(
-                    self.caminho_csv,
-                    delimiter=delim,
-                    encoding='latin-1',
-                    on_bad_lines='skip',
-                    engine='python'
-                )
-                print(f"✓ Carregado com encoding latin-1: {len(self.df):,} registros\n")
-                return True
+                cache.salvar(chave_cache, self.df, origem=Path(self.caminho_csv).resolve())
             except Exception as e:
-                print(f"❌ Erro ao carregar: {e}\n")
-                return False
+                print(f"⚠️  Não foi possível gravar o cache colunar: {e}")
         
+        return True
+    
+    def _carregar_em_blocos(self):
+        """Modo streaming: memória constante, independente do tamanho do CSV"""
+        try:
+            cabecalho, _ = ler_csv(self.caminho_csv, self.formato, nrows=0)
+            colunas = list(cabecalho.columns)
+            
+            self.agregacao = AgregacaoEsquema(self.AGREGACOES_SLIDES, colunas)
+            usecols = [col for col in self.agregacao.colunas_necessarias() if col in colunas]
+            leitor, _ = ler_csv(self.caminho_csv, self.formato, esquema=ESQUEMA_PRF,
+                                usecols=usecols, chunksize=self.tamanho_bloco)
+            
+            # As linhas de um acidente são contíguas no CSV da PRF; o último
+            # acidente de cada bloco fica pendente até o bloco seguinte
+            pendente = None
+            with leitor:
+                for bloco in leitor:
+                    if pendente is not None:
+                        bloco = pd.concat([pendente, bloco], ignore_index=True)
+                    corte = (bloco['id'] == bloco['id'].iloc[-1]).fillna(False).astype(bool)
+                    pendente = bloco[corte]
+                    if not corte.all():
+                        self.agregacao.atualizar(construir_esquema(bloco[~corte]))
+            if pendente is not None and len(pendente):
+                self.agregacao.atualizar(construir_esquema(pendente))
+            
+            print(f"✓ Processado em blocos de {self.tamanho_bloco:,}: " +
+                  f"{self.agregacao.total_registros:,} registros, " +
+                  f"{self.agregacao.total('acidentes'):,} acidentes\n")
+            return True
         except Exception as e:
             print(f"❌ Erro ao carregar: {e}\n")
             return False
     
+    def carregar_incremental(self, dir_estado=DIR_ESTADO_PADRAO, arquivos_csv=None):
+        """Incorpora o(s) CSV(s) ao estado persistido, agregando só o que mudou"""
+        try:
+            ingestao = IngestaoIncremental(self.AGREGACOES_SLIDES, dir_estado)
+            resumos = [ingestao.ingerir(caminho) for caminho in arquivos_csv or [self.caminho_csv]]
+            ingestao.salvar()
+        except Exception as e:
+            print(f"❌ Erro na ingestão incremental: {e}\n")
+            return False
+        
+        self.agregacao = ingestao.agregacao
+        for resumo in resumos:
+            print(f"✓ Ingestão incremental de {resumo['arquivo']} ({resumo['modo']}): " +
+                  f"{resumo['novos']:,} acidentes novos, {resumo['alterados']:,} alterados, " +
+                  f"{resumo['removidos']:,} removidos")
+        print(f"   Estado acumulado: {len(ingestao.arquivos)} arquivo(s), " +
+              f"{self.agregacao.total('acidentes'):,} acidentes\n")
+        return True
+    
+    # ==================== ACESSO AOS DADOS ====================
+    # Os analisar_* leem da AgregacaoEsquema, calculada uma única vez sobre o
+    # esquema estrela (do DataFrame completo ou bloco a bloco no streaming).
+    
+    def _agregacao(self):
+        if self.agregacao is None:
+            self.agregacao = AgregacaoEsquema(self.AGREGACOES_SLIDES, self.df.columns)
+            self.agregacao.atualizar(construir_esquema(self.df))
+        return self.agregacao
+    
+    def _colunas(self):
+        return self._agregacao().colunas
+    
+    def _total_registros(self):
+        return self._agregacao().total_registros
+    
+    def _total_acidentes(self):
+        return self._agregacao().total('acidentes')
+    
+    def _tem_coluna(self, col):
+        return col in self._colunas()
+    
+    def _soma(self, col):
+        if not self._tem_coluna(col):
+            return 0
+        return int(self._agregacao().motor(col).soma(col))
+    
+    def _contagem(self, col):
+        return self._agregacao().motor(col).contagem(col)
+    
+    def _agrupamento(self, chave):
+        return self._agregacao().motor(chave).agrupamento(chave)
+    
     def calcular_kpis(self):
         """Calcula indicadores principais (KPIs)"""
         print("=" * 80)
@@ -94,11 +207,11 @@ class CSVtoApresentacao:
         print("=" * 80 + "\n")
         
         kpis = {
-            "total_acidentes": len(self.df),
-            "total_obitos": int(self.df['mortos'].sum()) if 'mortos' in self.df.columns else 0,
-            "feridos_graves": int(self.df['feridos_graves'].sum()) if 'feridos_graves' in self.df.columns else 0,
-            "feridos_leves": int(self.df['feridos_leves'].sum()) if 'feridos_leves' in self.df.columns else 0,
-            "ilesos": int(self.df['ilesos'].sum()) if 'ilesos' in self.df.columns else 0,
+            "total_acidentes": self._total_acidentes(),
+            "total_obitos": self._soma('mortos'),
+            "feridos_graves": self._soma('feridos_graves'),
+            "feridos_leves": self._soma('feridos_leves'),
+            "ilesos": self._soma('ilesos'),
         }
         
         # Calcular taxa de severidade (% de acidentes com morte)
@@ -133,11 +246,11 @@ class CSVtoApresentacao:
         print("🚗 TIPOS DE ACIDENTES")
         print("=" * 80 + "\n")
         
-        if 'tipo_acidente' not in self.df.columns:
+        if not self._tem_coluna('tipo_acidente'):
             print("⚠️  Coluna 'tipo_acidente' não encontrada\n")
             return {}
         
-        tipos = self.df['tipo_acidente'].value_counts().head(5)
+        tipos = self._contagem('tipo_acidente').head(5)
         total = tipos.sum()
         
         resultado = {}
@@ -155,11 +268,11 @@ class CSVtoApresentacao:
         print("⚠️  CAUSAS PRINCIPAIS")
         print("=" * 80 + "\n")
         
-        if 'causa_acidente' not in self.df.columns:
+        if not self._tem_coluna('causa_acidente'):
             print("⚠️  Coluna 'causa_acidente' não encontrada\n")
             return {}
         
-        causas = self.df['causa_acidente'].value_counts().head(5)
+        causas = self._contagem('causa_acidente').head(5)
         total = causas.sum()
         
         resultado = {}
@@ -177,20 +290,16 @@ class CSVtoApresentacao:
         print("🛣️  ESTRADAS CRÍTICAS")
         print("=" * 80 + "\n")
         
-        if 'br' not in self.df.columns:
+        if not self._tem_coluna('br'):
             print("⚠️  Coluna 'br' não encontrada\n")
             return {}
         
         try:
-            estradas_data = self.df.groupby('br').agg({
-                'id': 'count',
-                'mortos': 'sum' if 'mortos' in self.df.columns else lambda x: 0,
-                'feridos_graves': 'sum' if 'feridos_graves' in self.df.columns else lambda x: 0,
-            }).rename(columns={'id': 'acidentes'}).sort_values('acidentes', ascending=False).head(5)
+            estradas_data = self._agrupamento('br').sort_values('acidentes', ascending=False).head(5)
             
             resultado = {}
             for i, (estrada, row) in enumerate(estradas_data.iterrows(), 1):
-                estrada_nome = f"BR-{int(estrada)}" if isinstance(estrada, (int, float)) else str(estrada)
+                estrada_nome = f"BR-{int(estrada)}" if pd.api.types.is_number(estrada) else str(estrada)
                 resultado[estrada_nome] = {
                     "acidentes": int(row['acidentes']),
                     "obitos": int(row['mortos']),
@@ -211,11 +320,11 @@ class CSVtoApresentacao:
         print("☀️  CONDIÇÕES METEOROLÓGICAS")
         print("=" * 80 + "\n")
         
-        if 'condicao_metereologica' not in self.df.columns:
+        if not self._tem_coluna('condicao_metereologica'):
             print("⚠️  Coluna 'condicao_metereologica' não encontrada\n")
             return {}
         
-        clima = self.df['condicao_metereologica'].value_counts().head(4)
+        clima = self._contagem('condicao_metereologica').head(4)
         total = clima.sum()
         
         resultado = {}
@@ -233,11 +342,11 @@ class CSVtoApresentacao:
         print("⏰ FASE DO DIA")
         print("=" * 80 + "\n")
         
-        if 'fase_dia' not in self.df.columns:
+        if not self._tem_coluna('fase_dia'):
             print("⚠️  Coluna 'fase_dia' não encontrada\n")
             return {}
         
-        fase = self.df['fase_dia'].value_counts()
+        fase = self._contagem('fase_dia')
         total = fase.sum()
         
         resultado = {}
@@ -255,17 +364,14 @@ class CSVtoApresentacao:
         print("📍 MUNICÍPIOS MAIS AFETADOS")
         print("=" * 80 + "\n")
         
-        if 'municipio' not in self.df.columns:
+        if not self._tem_coluna('municipio'):
             print("⚠️  Coluna 'municipio' não encontrada\n")
             return {}
         
         try:
-            municipios_data = self.df.groupby('municipio').agg({
-                'id': 'count',
-                'mortos': 'sum' if 'mortos' in self.df.columns else lambda x: 0,
-            }).rename(columns={'id': 'acidentes'}).sort_values('acidentes', ascending=False).head(5)
+            municipios_data = self._agrupamento('municipio').sort_values('acidentes', ascending=False).head(5)
             
-            total_geral = len(self.df)
+            total_geral = self._total_acidentes()
             resultado = {}
             for i, (municipio, row) in enumerate(municipios_data.iterrows(), 1):
                 percentual = round((row['acidentes'] / total_geral) * 100, 1)
@@ -292,8 +398,8 @@ class CSVtoApresentacao:
         relatorio = {
             "data_extracao": self.data_extracao,
             "arquivo": str(self.caminho_csv),
-            "total_registros": len(self.df),
-            "colunas": list(self.df.columns),
+            "total_registros": self._total_registros(),
+            "colunas": self._colunas(),
             "slides": {}
         }
         
@@ -350,31 +456,192 @@ class CSVtoApresentacao:
         return relatorio
 
 
+# ==================== MODO MULTI-ARQUIVO ====================
+# Cada CSV (um por ano/UF) é agregado num processo separado; só os
+# acumuladores voltam ao processo principal, onde são combinados.
+
+RECORTES = ('ano', 'uf', 'ano_uf')
+# Exportações da PRF (o mesmo padrão do armazém do backend); não pega o
+# csv_limpo.csv que o script.py grava nesta pasta
+PADRAO_CSV = 'acidentes*.csv'
+
+
+def rotulos_recorte(df, por):
+    """Rótulo de recorte por linha: '2025', 'PR' ou '2025/PR'"""
+    partes = []
+    if por in ('ano', 'ano_uf'):
+        datas = df['data_inversa'].astype('category')
+        # Extrai o ano uma vez por data distinta (dd/mm/aaaa ou aaaa-mm-dd)
+        anos = datas.cat.categories.astype(str).str.extract(r'(\d{4})', expand=False)
+        partes.append(datas.map(dict(zip(datas.cat.categories, anos))).astype(object).fillna('N/D'))
+    if por in ('uf', 'ano_uf'):
+        partes.append(df['uf'].astype(object).fillna('N/D'))
+    
+    rotulos = partes[0].astype(str)
+    for parte in partes[1:]:
+        rotulos = rotulos + '/' + parte.astype(str)
+    return rotulos
+
+
+def agregar_arquivo(caminho_csv, por=None, ignorar_ids=None):
+    """
+    Agrega um CSV inteiro (executado nos processos do pool).
+    
+    Args:
+        ignorar_ids: Ids de acidentes já contados em outro arquivo (linhas puladas)
+    
+    Returns:
+        dict: {'arquivo', 'total': AgregacaoEsquema, 'recortes': {rótulo: AgregacaoEsquema},
+               'ids': ids distintos dos acidentes agregados}
+    """
+    processador = CSVtoApresentacao(caminho_csv)
+    with contextlib.redirect_stdout(io.StringIO()):
+        carregado = processador.carregar_csv()
+    if not carregado:
+        raise RuntimeError(f"não foi possível carregar {caminho_csv}")
+    
+    df = processador.df
+    if ignorar_ids is not None and len(ignorar_ids):
+        df = df[~df['id'].isin(ignorar_ids).to_numpy(dtype=bool, na_value=False)]
+    declaracoes = CSVtoApresentacao.AGREGACOES_SLIDES
+    total = AgregacaoEsquema(declaracoes, df.columns)
+    recortes = {}
+    
+    if por:
+        # O total é a soma dos recortes: cada linha é agregada uma única vez
+        for rotulo, linhas in df.groupby(rotulos_recorte(df, por), sort=False).indices.items():
+            parcial = AgregacaoEsquema(declaracoes, df.columns)
+            parcial.atualizar(construir_esquema(df.iloc[linhas]))
+            total.combinar(parcial)
+            # Linhas sem id (quebradas) contam no total, mas não formam recorte
+            if parcial.total('acidentes'):
+                recortes[rotulo] = parcial
+    else:
+        total.atualizar(construir_esquema(df))
+    
+    ids = df['id'].dropna().unique().to_numpy(dtype=np.int64)
+    return {'arquivo': str(caminho_csv), 'total': total, 'recortes': recortes, 'ids': ids}
+
+
+def processar_arquivos(arquivos_csv, processos=None, por=None):
+    """
+    Agrega vários CSVs em paralelo e combina os resultados. Acidentes (ids)
+    que reaparecem num arquivo posterior contam só no primeiro: o arquivo com
+    repetidos é reagregado sem eles.
+    
+    Args:
+        arquivos_csv (list): Caminhos dos CSVs (ex.: um por ano/UF)
+        processos (int): Tamanho do pool (padrão: núcleos disponíveis)
+        por (str): Recorte opcional ('ano', 'uf' ou 'ano_uf')
+    
+    Returns:
+        tuple: (AgregacaoEsquema total, {rótulo: AgregacaoEsquema})
+    """
+    processos = min(processos or os.cpu_count() or 1, len(arquivos_csv))
+    if processos > 1:
+        with ProcessPoolExecutor(max_workers=processos) as pool:
+            resultados = list(pool.map(agregar_arquivo, arquivos_csv, repeat(por)))
+    else:
+        resultados = [agregar_arquivo(caminho, por) for caminho in arquivos_csv]
+    
+    declaracoes = CSVtoApresentacao.AGREGACOES_SLIDES
+    total = AgregacaoEsquema(declaracoes)
+    recortes = {}
+    vistos = np.zeros(0, dtype=np.int64)
+    for resultado in resultados:
+        repetidos = np.intersect1d(resultado['ids'], vistos, assume_unique=True)
+        if len(repetidos):
+            print(f"   ⚠️  {resultado['arquivo']}: {len(repetidos):,} acidentes já contados em arquivo anterior; ignorados")
+            resultado = agregar_arquivo(resultado['arquivo'], por, ignorar_ids=repetidos)
+        vistos = np.union1d(vistos, resultado['ids'])
+        print(f"   ✓ {resultado['arquivo']}: {resultado['total'].total('acidentes'):,} acidentes")
+        total.combinar(resultado['total'])
+        for rotulo, parcial in resultado['recortes'].items():
+            recortes.setdefault(rotulo, AgregacaoEsquema(declaracoes)).combinar(parcial)
+    
+    return total, dict(sorted(recortes.items()))
+
+
+def gerar_relatorio_recorte(agregacao):
+    """Slides de dados (2 a 8) de um recorte, sem o log detalhado no console"""
+    processador = CSVtoApresentacao('')
+    processador.agregacao = agregacao
+    with contextlib.redirect_stdout(io.StringIO()):
+        relatorio = processador.gerar_relatorio()
+    relatorio["slides"].pop("slide_1", None)
+    return {"total_registros": relatorio["total_registros"], "slides": relatorio["slides"]}
+
+
 def main():
     """Função principal"""
+    parser = argparse.ArgumentParser(description="CSV de acidentes → dados para apresentação")
+    parser.add_argument('--tamanho-bloco', type=int, default=0,
+                        help="Processa o CSV em blocos de N linhas (memória constante)")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Soma o CSV ao estado salvo, agregando só acidentes novos ou alterados")
+    parser.add_argument('--dir-estado', default=DIR_ESTADO_PADRAO,
+                        help="Pasta do estado da ingestão incremental")
+    parser.add_argument('--todos', action='store_true',
+                        help="Processa todos os acidentes*.csv do diretório atual, em paralelo")
+    parser.add_argument('--processos', type=int, default=0,
+                        help="Processos no modo multi-arquivo (padrão: núcleos disponíveis)")
+    parser.add_argument('--por', choices=RECORTES,
+                        help="Acrescenta ao relatório recortes por ano, UF ou ano/UF")
+    parser.add_argument('csv', nargs='*',
+                        help="CSVs a processar (padrão: primeiro acidentes*.csv do diretório atual)")
+    args = parser.parse_args()
+    
     print("\n" + "=" * 80)
     print("🚀 INICIANDO PROCESSAMENTO CSV → APRESENTAÇÃO")
     print("=" * 80)
     
     # Detectar arquivo CSV no diretório atual
-    arquivos_csv = list(Path('.').glob('*.csv'))
+    if args.csv:
+        arquivos_csv = [Path(caminho) for caminho in args.csv]
+    elif args.todos:
+        arquivos_csv = sorted(Path('.').glob(PADRAO_CSV))
+    else:
+        arquivos_csv = sorted(Path('.').glob(PADRAO_CSV))[:1]
     
     if not arquivos_csv:
-        print("\n❌ Nenhum arquivo CSV encontrado no diretório atual")
-        print("📁 Coloque um arquivo .csv na mesma pasta deste script")
+        print("\n❌ Nenhum arquivo acidentes*.csv encontrado no diretório atual")
+        print("📁 Coloque o CSV exportado da PRF (acidentes*.csv) na mesma pasta deste script")
         sys.exit(1)
     
-    caminho_csv = str(arquivos_csv[0])
-    print(f"\n📂 CSV encontrado: {caminho_csv}")
-    
-    # Processar
-    processador = CSVtoApresentacao(caminho_csv)
-    
-    if not processador.carregar_csv():
+    multi_arquivo = (len(arquivos_csv) > 1 or args.por) and not args.incremental
+    if multi_arquivo and args.tamanho_bloco:
+        print("\n❌ --tamanho-bloco processa um único CSV; use-o sem --todos/--por")
         sys.exit(1)
     
-    # Gerar relatório
-    relatorio = processador.gerar_relatorio()
+    if multi_arquivo:
+        print(f"\n📂 {len(arquivos_csv)} CSV(s) encontrados; agregando em paralelo")
+        total, recortes = processar_arquivos(
+            [str(caminho) for caminho in arquivos_csv], args.processos or None, args.por
+        )
+        processador = CSVtoApresentacao(', '.join(str(caminho) for caminho in arquivos_csv))
+        processador.agregacao = total
+        relatorio = processador.gerar_relatorio()
+        relatorio["arquivos"] = [str(caminho) for caminho in arquivos_csv]
+        if recortes:
+            relatorio["recortes"] = {
+                rotulo: gerar_relatorio_recorte(agregacao) for rotulo, agregacao in recortes.items()
+            }
+    else:
+        caminho_csv = str(arquivos_csv[0])
+        print(f"\n📂 CSV encontrado: {caminho_csv}")
+        
+        # Processar
+        processador = CSVtoApresentacao(caminho_csv, tamanho_bloco=args.tamanho_bloco or None)
+        
+        if args.incremental:
+            carregado = processador.carregar_incremental(args.dir_estado, [str(c) for c in arquivos_csv])
+        else:
+            carregado = processador.carregar_csv()
+        if not carregado:
+            sys.exit(1)
+        
+        # Gerar relatório
+        relatorio = processador.gerar_relatorio()
     
     # Exibir resumo
     print("=" * 80)
@@ -384,13 +651,15 @@ def main():
     print(f"Arquivo: {relatorio['arquivo']}")
     print(f"Total de Registros: {relatorio['total_registros']:,}")
     print(f"Slides Gerados: {len(relatorio['slides'])}")
+    if 'recortes' in relatorio:
+        print(f"Recortes ({args.por}): {', '.join(relatorio['recortes'])}")
     print(f"\nColunas Disponíveis ({len(relatorio['colunas'])}):")
     for i, col in enumerate(relatorio['colunas'], 1):
         print(f"  {i}. {col}")
     
     # Salvar JSON
     arquivo_json = 'relatorio_acidentes.json'
-    with open(arquivo_json, 'w', encoding='utf-8') as f:
+    with gravar_atomico(arquivo_json) as f:
         json.dump(relatorio, f, ensure_ascii=False, indent=2)
     
     print(f"\n✓ Relatório salvo em: {arquivo_json}")
@@ -5,10 +5,12 @@
 
 import pandas as pd
 import json
+import sys
 from pathlib import Path
 from datetime import datetime
-import csv
-import io
+
+from gravacao_atomica import gravar_atomico
+from leitor_csv import ESQUEMA_PRF, detectar_formato, ler_csv
 
 class CSVtoLLMOptimizerRobusto:
     """Converte CSV bruto (com problemas) em dados otimizados para LLM"""
@@ -18,39 +20,28 @@ class CSVtoLLMOptimizerRobusto:
         self.df_raw = None
         self.data_extracao = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
         self.delimitador_detectado = None
+        self.encoding_detectado = None
         
     # ========================================================================
     # 1. DETECTAR DELIMITADOR
     # ========================================================================
     
     def detectar_delimitador(self):
-        """Detecta automaticamente o delimitador do CSV"""
+        """Detecta encoding e delimitador a partir de uma amostra do CSV"""
         try:
-            with open(self.caminho_csv, 'r', encoding='utf-8') as f:
-                primeira_linha = f.readline()
-            
-            # Testar delimitadores comuns
-            delimitadores = [',', ';', '\t', '|', ' ']
-            
-            for delim in delimitadores:
-                contagem = primeira_linha.count(delim)
-                if contagem > 0:
-                    print(f"  • Testando '{delim}': encontrados {contagem} delimitadores")
-            
-            # Usar Sniffer do CSV
-            with open(self.caminho_csv, 'r', encoding='utf-8') as f:
-                amostra = f.read(4096)
-            
-            sniffer = csv.Sniffer()
-            delim = sniffer.sniff(amostra).delimiter
+            formato = detectar_formato(self.caminho_csv)
+            delim = formato['delimitador']
             
+            self.encoding_detectado = formato['encoding']
             self.delimitador_detectado = delim
-            print(f"\n✓ Delimitador detectado: '{delim}' (código: {ord(delim)})\n")
+            print(f"✓ Encoding detectado: {formato['encoding']}")
+            print(f"✓ Delimitador detectado: '{delim}' (código: {ord(delim)})\n")
             return delim
         
         except Exception as e:
             print(f"⚠️ Erro ao detectar delimitador: {e}")
             print("Tentando ';' como padrão...\n")
+            self.encoding_detectado = 'utf-8'
             self.delimitador_detectado = ';'
             return ';'
     
@@ -59,85 +50,24 @@ class CSVtoLLMOptimizerRobusto:
     # ========================================================================
     
     def carregar_csv(self):
-        """Carrega CSV com múltiplas estratégias de tratamento"""
+        """Carrega CSV em uma única passada (encoding reparado na decodificação)"""
         
         print("=" * 80)
         print("📂 CARREGANDO CSV")
         print("=" * 80 + "\n")
         
         delim = self.detectar_delimitador()
+        formato = {'encoding': self.encoding_detectado, 'delimitador': delim}
         
-        # Estratégia 1: Carregar com delimitador detectado
         try:
-            print(f"Tentativa 1: Usando delimitador '{delim}'...")
-            self.df_raw = pd.read_csv(
-                self.caminho_csv,
-                delimiter=delim,
-                encoding='utf-8',
-                on_bad_lines='skip',  # Pula linhas com problemas
-                engine='python'
-            )
+            self.df_raw, _ = ler_csv(self.caminho_csv, formato, esquema=ESQUEMA_PRF)
             print(f"✓ Sucesso! {len(self.df_raw)} registros carregados\n")
             return True
         
         except Exception as e:
             print(f"❌ Falha: {e}\n")
         
-        # Estratégia 2: Tentar com diferentes encodings
-        encodings = ['utf-8', 'latin-1', 'iso-8859-1', 'cp1252']
-        
-        for encoding in encodings:
-            try:
-                print(f"Tentativa 2: Usando encoding '{encoding}'...")
-                self.df_raw = pd.read_csv(
-                    self.caminho_csv,
-                    delimiter=delim,
-                    encoding=encoding,
-                    on_bad_lines='skip',
-                    engine='python'
-                )
-                print(f"✓ Sucesso com {encoding}! {len(self.df_raw)} registros\n")
-                return True
-            except:
-                continue
-        
-        # Estratégia 3: Ler manualmente e corrigir
-        try:
-            print("Tentativa 3: Leitura manual com tratamento de linhas...")
-            linhas_validas = []
-            
-            with open(self.caminho_csv, 'r', encoding='utf-8') as f:
-                leitor = csv.reader(f, delimiter=delim)
-                cabecalho = None
-                num_colunas = None
-                
-                for idx, linha in enumerate(leitor):
-                    # Primeira linha é cabeçalho
-                    if idx == 0:
-                        cabecalho = linha
-                        num_colunas = len(cabecalho)
-                        linhas_validas.append(linha)
-                        continue
-                    
-                    # Ajustar linhas com número incorreto de colunas
-                    if len(linha) < num_colunas:
-                        # Preencher com valores vazios
-                        linha = linha + [''] * (num_colunas - len(linha))
-                    elif len(linha) > num_colunas:
-                        # Truncar ou mesclar últimas colunas
-                        linha = linha[:num_colunas]
-                    
-                    linhas_validas.append(linha)
-            
-            # Converter para DataFrame
-            self.df_raw = pd.DataFrame(linhas_validas[1:], columns=linhas_validas[0])
-            print(f"✓ Sucesso na leitura manual! {len(self.df_raw)} registros\n")
-            return True
-        
-        except Exception as e:
-            print(f"❌ Falha na leitura manual: {e}\n")
-        
-        print("❌ Não foi possível carregar o CSV com nenhuma estratégia")
+        print("❌ Não foi possível carregar o CSV")
         return False
     
     # ========================================================================
@@ -187,6 +117,16 @@ class CSVtoLLMOptimizerRobusto:
         for col in df.select_dtypes(include=['object']).columns:
             df[col] = df[col].str.strip()
         
+        # Em colunas categóricas basta limpar o dicionário, não cada linha
+        for col in df.select_dtypes(include=['category']).columns:
+            categorias = df[col].cat.categories
+            if pd.api.types.is_string_dtype(categorias):
+                limpas = categorias.str.strip()
+                if limpas.is_unique:
+                    df[col] = df[col].cat.rename_categories(limpas)
+                else:
+                    df[col] = df[col].astype('string').str.strip().astype('category')
+        
         print("✓ Espaços em branco removidos")
         
         # Remover duplicatas
@@ -201,6 +141,10 @@ class CSVtoLLMOptimizerRobusto:
         depois = len(df)
         print(f"✓ Linhas vazias removidas: {antes - depois} linhas")
         
+        # Categorias sem nenhuma linha restante não entram nas contagens
+        for col in df.select_dtypes(include=['category']).columns:
+            df[col] = df[col].cat.remove_unused_categories()
+        
         return df
     
     # ========================================================================
@@ -323,7 +267,7 @@ class CSVtoLLMOptimizerRobusto:
         print("=" * 80 + "\n")
         
         # Salvar prompt
-        with open('prompt_llm_otimizado.md', 'w', encoding='utf-8') as f:
+        with gravar_atomico('prompt_llm_otimizado.md') as f:
             f.write(prompt_llm)
         print("✓ Exportado: prompt_llm_otimizado.md")
         
@@ -340,12 +284,13 @@ class CSVtoLLMOptimizerRobusto:
             'prompt_preview': prompt_llm[:500] + "..."
         }
         
-        with open('dados_estruturados.json', 'w', encoding='utf-8') as f:
+        with gravar_atomico('dados_estruturados.json') as f:
             json.dump(saida_json, f, ensure_ascii=False, indent=2)
         print("✓ Exportado: dados_estruturados.json")
         
         # Salvar CSV limpo
-        self.df_raw.to_csv('csv_limpo.csv', index=False, encoding='utf-8')
+        with gravar_atomico('csv_limpo.csv', newline='') as f:
+            self.df_raw.to_csv(f, index=False)
         print("✓ Exportado: csv_limpo.csv (versão limpa)\n")
     
     # ========================================================================
@@ -406,7 +351,8 @@ class CSVtoLLMOptimizerRobusto:
 
 if __name__ == "__main__":
     
-    caminho_csv = "acidentes2025_todas_causas_tipos.csv"
+    # CSV opcional na linha de comando (o pipeline.py sempre informa)
+    caminho_csv = sys.argv[1] if len(sys.argv) > 1 else "acidentes2025_todas_causas_tipos.csv"
     
     if not Path(caminho_csv).exists():
         print(f"\n❌ Arquivo não encontrado: {caminho_csv}\n")